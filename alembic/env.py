@@ -29,10 +29,13 @@ from app.core.database import Base
 from app.modules.users.models import User
 from app.modules.courses.models import Course
 from app.modules.enrollments.models import Enrollment
-from app.modules.reviews.models import Review
+from app.modules.reviews.models import Review, CourseRatingSummary
 from app.modules.progress.models import UserLessonProgress
 from app.modules.instructors.models import InstructorProfile
 from app.modules.categories.models import Category
+from app.modules.certificates.models import IssuedCertificate
+from app.modules.media.models import UploadSession, MediaFile, MediaFileUploader
+from app.modules.analytics.models import CourseDailySales
 from app.modules.certificates.router import * # Solo para asegurar que se carguen dependencias si las hay
 
 target_metadata = Base.metadata
@@ -0,0 +1,36 @@
+"""media_files
+
+Revision ID: 0a6d2c8e4b17
+Revises: f19c5d2e7a84
+Create Date: 2026-10-19 20:03:55.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6d2c8e4b17'
+down_revision: Union[str, Sequence[str], None] = 'f19c5d2e7a84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('media_files',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('stored_name', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.PrimaryKeyConstraint('sha256'),
+    sa.UniqueConstraint('stored_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_files')
@@ -0,0 +1,30 @@
+"""media_file_metadata
+
+Revision ID: 1b7e3f9a5c62
+Revises: 0a6d2c8e4b17
+Create Date: 2026-10-19 20:41:07.392615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '1b7e3f9a5c62'
+down_revision: Union[str, Sequence[str], None] = '0a6d2c8e4b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Se completan con: python -m app.modules.media.tasks probe-media
+    op.add_column('media_files', sa.Column('mime_type', sa.String(length=100), nullable=True))
+    op.add_column('media_files', sa.Column('duration_seconds', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('media_files', 'duration_seconds')
+    op.drop_column('media_files', 'mime_type')
@@ -0,0 +1,30 @@
+"""review_listing_indexes
+
+Revision ID: 2c8f4a6e9d31
+Revises: 1b7e3f9a5c62
+Create Date: 2026-10-19 22:14:36.508127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f4a6e9d31'
+down_revision: Union[str, Sequence[str], None] = '1b7e3f9a5c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Paginación por cursor de las reseñas de un curso (ver app/modules/reviews/service.py)
+    op.create_index('ix_reviews_course_created', 'reviews', ['course_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_course_rating', 'reviews', ['course_id', 'rating', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_course_rating', table_name='reviews')
+    op.drop_index('ix_reviews_course_created', table_name='reviews')
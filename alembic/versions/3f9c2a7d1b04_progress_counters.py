@@ -0,0 +1,56 @@
+"""progress_counters
+
+Revision ID: 3f9c2a7d1b04
+Revises: 65477c26ba36
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b04'
+down_revision: Union[str, Sequence[str], None] = '65477c26ba36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('courses', sa.Column('lessons_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.create_table('course_progress_summaries',
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('completed_lessons', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('last_completed_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'course_id')
+    )
+
+    # Backfill de los contadores a partir de los datos existentes
+    op.execute("""
+        UPDATE courses c SET lessons_count = x.total
+        FROM (
+            SELECT s.course_id, COUNT(l.id) AS total
+            FROM sections s JOIN lessons l ON l.section_id = s.id
+            GROUP BY s.course_id
+        ) x
+        WHERE x.course_id = c.id
+    """)
+    op.execute("""
+        INSERT INTO course_progress_summaries (user_id, course_id, completed_lessons, last_completed_at)
+        SELECT user_id, course_id, COUNT(*), MAX(completed_at)
+        FROM user_lesson_progress
+        GROUP BY user_id, course_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('course_progress_summaries')
+    op.drop_column('courses', 'lessons_count')
@@ -0,0 +1,59 @@
+"""course_rating_summaries
+
+Revision ID: 4d1a9e7c3b58
+Revises: 2c8f4a6e9d31
+Create Date: 2026-10-19 23:02:17.845310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '4d1a9e7c3b58'
+down_revision: Union[str, Sequence[str], None] = '2c8f4a6e9d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_rating_summaries',
+    sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('reviews_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('stars_1', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('stars_2', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('stars_3', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('stars_4', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('stars_5', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('average_rating', sa.Numeric(3, 2), sa.Computed("CASE WHEN reviews_count > 0 THEN round(rating_sum::numeric / reviews_count, 2) ELSE 0 END", persisted=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id')
+    )
+    op.create_index('ix_course_rating_summaries_ranking', 'course_rating_summaries', ['average_rating', 'reviews_count', 'course_id'], unique=False)
+
+    # Backfill: una fila por curso, con las reseñas existentes
+    op.execute("""
+        INSERT INTO course_rating_summaries
+            (course_id, reviews_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+        SELECT c.id,
+               COUNT(r.id),
+               COALESCE(SUM(r.rating), 0),
+               COUNT(*) FILTER (WHERE r.rating = 1),
+               COUNT(*) FILTER (WHERE r.rating = 2),
+               COUNT(*) FILTER (WHERE r.rating = 3),
+               COUNT(*) FILTER (WHERE r.rating = 4),
+               COUNT(*) FILTER (WHERE r.rating = 5)
+        FROM courses c LEFT JOIN reviews r ON r.course_id = c.id
+        GROUP BY c.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_course_rating_summaries_ranking', table_name='course_rating_summaries')
+    op.drop_table('course_rating_summaries')
@@ -0,0 +1,58 @@
+"""instructor_counters
+
+Revision ID: 5e2b8c4f1a67
+Revises: 4d1a9e7c3b58
+Create Date: 2026-10-19 23:41:52.307614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8c4f1a67'
+down_revision: Union[str, Sequence[str], None] = '4d1a9e7c3b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_enrollments_user_course', 'enrollments', ['user_id', 'course_id'], unique=False)
+
+    # Backfill de los contadores a partir de los datos existentes
+    op.execute("""
+        UPDATE instructor_profiles p SET
+            total_students = COALESCE((
+                SELECT COUNT(DISTINCT e.user_id)
+                FROM enrollments e JOIN courses c ON c.id = e.course_id
+                WHERE c.user_id = p.user_id
+            ), 0),
+            total_reviews = COALESCE((
+                SELECT COUNT(r.id)
+                FROM reviews r JOIN courses c ON c.id = r.course_id
+                WHERE c.user_id = p.user_id
+            ), 0)
+    """)
+    op.alter_column('instructor_profiles', 'total_students',
+               existing_type=sa.Integer(),
+               server_default=sa.text('0'),
+               nullable=False)
+    op.alter_column('instructor_profiles', 'total_reviews',
+               existing_type=sa.Integer(),
+               server_default=sa.text('0'),
+               nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('instructor_profiles', 'total_reviews',
+               existing_type=sa.Integer(),
+               server_default=None,
+               nullable=True)
+    op.alter_column('instructor_profiles', 'total_students',
+               existing_type=sa.Integer(),
+               server_default=None,
+               nullable=True)
+    op.drop_index('ix_enrollments_user_course', table_name='enrollments')
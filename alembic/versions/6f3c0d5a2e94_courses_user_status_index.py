@@ -0,0 +1,28 @@
+"""courses_user_status_index
+
+Revision ID: 6f3c0d5a2e94
+Revises: 5e2b8c4f1a67
+Create Date: 2026-10-20 00:18:05.662471
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '6f3c0d5a2e94'
+down_revision: Union[str, Sequence[str], None] = '5e2b8c4f1a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Página pública del instructor (ver app/modules/instructors/service.py) y "mis cursos"
+    op.create_index('ix_courses_user_status', 'courses', ['user_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_courses_user_status', table_name='courses')
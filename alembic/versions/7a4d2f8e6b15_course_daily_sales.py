@@ -0,0 +1,48 @@
+"""course_daily_sales
+
+Revision ID: 7a4d2f8e6b15
+Revises: 6f3c0d5a2e94
+Create Date: 2026-10-20 00:52:44.190358
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4d2f8e6b15'
+down_revision: Union[str, Sequence[str], None] = '6f3c0d5a2e94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('course_daily_sales',
+    sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('enrollments_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), server_default=sa.text('0'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'day', 'currency')
+    )
+    op.create_index('ix_enrollments_purchased_at', 'enrollments', ['purchased_at'], unique=False)
+
+    # Backfill de las ventas existentes (para tablas grandes: python -m app.modules.analytics.tasks backfill)
+    op.execute("""
+        INSERT INTO course_daily_sales (course_id, day, currency, enrollments_count, revenue)
+        SELECT course_id, purchased_at::date, COALESCE(currency, 'USD'), COUNT(*), COALESCE(SUM(amount_paid), 0)
+        FROM enrollments
+        WHERE purchased_at IS NOT NULL
+        GROUP BY course_id, purchased_at::date, COALESCE(currency, 'USD')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_enrollments_purchased_at', table_name='enrollments')
+    op.drop_table('course_daily_sales')
@@ -0,0 +1,41 @@
+"""user_activity_days
+
+Revision ID: 8c5e1b3d7f20
+Revises: 7a4d2f8e6b15
+Create Date: 2026-10-20 10:05:31.274810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '8c5e1b3d7f20'
+down_revision: Union[str, Sequence[str], None] = '7a4d2f8e6b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_activity_days',
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill con la historia que queda: lecciones completadas y última posición de cada video
+    op.execute("""
+        INSERT INTO user_activity_days (user_id, day)
+        SELECT user_id, completed_at::date FROM user_lesson_progress WHERE completed_at IS NOT NULL
+        UNION
+        SELECT user_id, updated_at::date FROM lesson_watch_positions WHERE updated_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_activity_days')
@@ -0,0 +1,29 @@
+"""drop media_files.ref_count
+
+Revision ID: 9b2f6d4a8c13
+Revises: 8c5e1b3d7f20
+Create Date: 2026-10-20 11:42:08.519344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2f6d4a8c13'
+down_revision: Union[str, Sequence[str], None] = '8c5e1b3d7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nunca se mantuvo bien (solo sumaba al subir) y la limpieza no lo usaba
+    op.drop_column('media_files', 'ref_count')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('media_files', sa.Column('ref_count', sa.Integer(), server_default=sa.text('0'), nullable=False))
@@ -0,0 +1,40 @@
+"""media url name indexes
+
+Revision ID: a3c7e9f1d254
+Revises: 9b2f6d4a8c13
+Create Date: 2026-10-20 12:18:40.067215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e9f1d254'
+down_revision: Union[str, Sequence[str], None] = '9b2f6d4a8c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Misma expresión que app.modules.media.urls.media_url_name (si cambia, el índice no se usa)
+MEDIA_URL_NAME_PATTERN = r"/media/(?:[^/?#]+/)*([^/?#]+)$"
+
+INDEXES = (
+    ('ix_lessons_video_media_name', 'lessons', 'video_resource_id'),
+    ('ix_courses_thumbnail_media_name', 'courses', 'thumbnail_url'),
+    ('ix_courses_promo_media_name', 'courses', 'promotional_video_url'),
+    ('ix_categories_icon_media_name', 'categories', 'icon_url'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, column in INDEXES:
+        op.create_index(name, table, [sa.text(f"substring({column}, '{MEDIA_URL_NAME_PATTERN}')")])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
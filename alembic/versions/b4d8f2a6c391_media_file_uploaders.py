@@ -0,0 +1,68 @@
+"""media file uploaders
+
+Revision ID: b4d8f2a6c391
+Revises: a3c7e9f1d254
+Create Date: 2026-10-21 09:14:52.306118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8f2a6c391'
+down_revision: Union[str, Sequence[str], None] = 'a3c7e9f1d254'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Misma expresión que app.modules.media.urls.media_url_name (usa los índices de a3c7e9f1d254)
+MEDIA_URL_NAME_PATTERN = r"/media/(?:[^/?#]+/)*([^/?#]+)$"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'media_file_uploaders',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+        sa.ForeignKeyConstraint(['sha256'], ['media_files.sha256'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('sha256', 'user_id')
+    )
+
+    # Autores de los archivos ya subidos: quien completó la subida reanudable
+    # y el dueño de cada curso que ya los usa (lecciones, portada, video promocional)
+    op.execute("""
+        INSERT INTO media_file_uploaders (sha256, user_id)
+        SELECT m.sha256, s.user_id
+        FROM upload_sessions s
+        JOIN media_files m ON m.stored_name = s.stored_name
+        WHERE s.status = 'COMPLETED'
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute(f"""
+        INSERT INTO media_file_uploaders (sha256, user_id)
+        SELECT m.sha256, c.user_id
+        FROM lessons l
+        JOIN sections s ON s.id = l.section_id
+        JOIN courses c ON c.id = s.course_id
+        JOIN media_files m ON m.stored_name = substring(l.video_resource_id, '{MEDIA_URL_NAME_PATTERN}')
+        ON CONFLICT DO NOTHING
+    """)
+    for column in ('thumbnail_url', 'promotional_video_url'):
+        op.execute(f"""
+            INSERT INTO media_file_uploaders (sha256, user_id)
+            SELECT m.sha256, c.user_id
+            FROM courses c
+            JOIN media_files m ON m.stored_name = substring(c.{column}, '{MEDIA_URL_NAME_PATTERN}')
+            ON CONFLICT DO NOTHING
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('media_file_uploaders')
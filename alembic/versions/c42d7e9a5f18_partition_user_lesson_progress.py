@@ -0,0 +1,81 @@
+"""partition_user_lesson_progress
+
+Revision ID: c42d7e9a5f18
+Revises: 8b1e4c6f2a93
+Create Date: 2026-10-19 15:02:51.733160
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c42d7e9a5f18'
+down_revision: Union[str, Sequence[str], None] = '8b1e4c6f2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Debe coincidir con PROGRESS_PARTITIONS en app/modules/progress/models.py
+PARTITIONS = 16
+
+
+def _rename_old_table() -> None:
+    op.rename_table('user_lesson_progress', 'user_lesson_progress_old')
+    op.execute("ALTER TABLE user_lesson_progress_old RENAME CONSTRAINT user_lesson_progress_pkey TO user_lesson_progress_old_pkey")
+    op.execute("ALTER TABLE user_lesson_progress_old RENAME CONSTRAINT unique_user_lesson_progress TO unique_user_lesson_progress_old")
+
+
+def _columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('lesson_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id']),
+        sa.ForeignKeyConstraint(['lesson_id'], ['lessons.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.UniqueConstraint('user_id', 'lesson_id', name='unique_user_lesson_progress'),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _rename_old_table()
+
+    op.create_table('user_lesson_progress',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id', 'user_id'),
+    postgresql_partition_by='HASH (user_id)'
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE user_lesson_progress_p{remainder} PARTITION OF user_lesson_progress "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+    op.create_index('ix_user_lesson_progress_user_course', 'user_lesson_progress', ['user_id', 'course_id'])
+    op.create_index('ix_user_lesson_progress_lesson', 'user_lesson_progress', ['lesson_id'])
+
+    op.execute("""
+        INSERT INTO user_lesson_progress (id, user_id, lesson_id, course_id, completed_at)
+        SELECT id, user_id, lesson_id, course_id, completed_at FROM user_lesson_progress_old
+    """)
+    op.drop_table('user_lesson_progress_old')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rename_old_table()
+
+    op.create_table('user_lesson_progress',
+    *_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("""
+        INSERT INTO user_lesson_progress (id, user_id, lesson_id, course_id, completed_at)
+        SELECT id, user_id, lesson_id, course_id, completed_at FROM user_lesson_progress_old
+    """)
+    # Borra también las particiones
+    op.drop_table('user_lesson_progress_old')
@@ -0,0 +1,56 @@
+"""uuid7_primary_keys
+
+Revision ID: d5a08f3b6e21
+Revises: c42d7e9a5f18
+Create Date: 2026-10-19 16:40:12.904551
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a08f3b6e21'
+down_revision: Union[str, Sequence[str], None] = 'c42d7e9a5f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copia de app/core/ids.py (las migraciones no dependen del código de la app)
+UUID7_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+# Tablas con muchas inserciones que pasan a usar claves UUIDv7
+TABLES = ['users', 'courses', 'lessons', 'enrollments', 'reviews', 'user_lesson_progress']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(UUID7_FUNCTION_SQL)
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        # lessons no tenía default en la base de datos (lo generaba Python)
+        default = None if table == 'lessons' else sa.text('gen_random_uuid()')
+        op.alter_column(table, 'id', server_default=default)
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
@@ -0,0 +1,44 @@
+"""issued_certificates
+
+Revision ID: e7b3f1a9c260
+Revises: d5a08f3b6e21
+Create Date: 2026-10-19 18:05:41.217730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f1a9c260'
+down_revision: Union[str, Sequence[str], None] = 'd5a08f3b6e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('issued_certificates',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('code', sa.String(length=16), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('student_name', sa.String(length=150), nullable=False),
+    sa.Column('course_title', sa.String(length=200), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=True),
+    sa.Column('issued_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'course_id', name='unique_issued_certificate')
+    )
+    op.create_index(op.f('ix_issued_certificates_code'), 'issued_certificates', ['code'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_issued_certificates_code'), table_name='issued_certificates')
+    op.drop_table('issued_certificates')
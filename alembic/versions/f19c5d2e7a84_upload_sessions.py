@@ -0,0 +1,43 @@
+"""upload_sessions
+
+Revision ID: f19c5d2e7a84
+Revises: e7b3f1a9c260
+Create Date: 2026-10-19 19:12:26.650183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f19c5d2e7a84'
+down_revision: Union[str, Sequence[str], None] = 'e7b3f1a9c260'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upload_sessions',
+    sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('uuid_generate_v7()'), nullable=False),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('stored_name', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('offset', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('status', sa.String(length=20), server_default=sa.text("'UPLOADING'"), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_upload_sessions_status_expires', 'upload_sessions', ['status', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_upload_sessions_status_expires', table_name='upload_sessions')
+    op.drop_table('upload_sessions')
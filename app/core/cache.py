@@ -0,0 +1,49 @@
+# app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Caché en memoria del proceso, con expiración por tiempo y límite de tamaño (LRU).
+    Segura para usar desde varios hilos (los endpoints sync corren en un threadpool).
+    Cada worker de uvicorn tiene la suya, por eso el TTL acota lo desactualizada
+    que puede quedar una entrada invalidada en otro worker.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,93 @@
+# app/core/config.py
+import os
+from dotenv import load_dotenv
+
+# Cargar variables del archivo .env
+load_dotenv()
+
+# --- Posición de reproducción de videos ---
+# Cada cuántos segundos se guardan en bloque las posiciones recibidas
+WATCH_POSITION_FLUSH_SECONDS = float(os.getenv("WATCH_POSITION_FLUSH_SECONDS", 15))
+# Fracción del video vista a partir de la cual la lección se marca como completada
+WATCH_COMPLETE_FRACTION = float(os.getenv("WATCH_COMPLETE_FRACTION", 0.9))
+# Segundos que se recuerda que un alumno puede reportar la posición de una lección
+WATCH_POSITION_ACCESS_CACHE_SECONDS = float(os.getenv("WATCH_POSITION_ACCESS_CACHE_SECONDS", 3600))
+
+# --- Resumen de progreso (dashboard) ---
+PROGRESS_SUMMARY_CACHE_SECONDS = float(os.getenv("PROGRESS_SUMMARY_CACHE_SECONDS", 60))
+
+# --- Certificados ---
+# Caché en disco de los PDFs ya generados
+CERTIFICATE_CACHE_DIR = os.getenv("CERTIFICATE_CACHE_DIR", "cache/certificates")
+CERTIFICATE_CACHE_MAX_BYTES = int(os.getenv("CERTIFICATE_CACHE_MAX_MB", 512)) * 1024 * 1024
+# Render en procesos aparte: ReportLab es CPU y retiene el GIL
+CERTIFICATE_RENDER_WORKERS = int(os.getenv("CERTIFICATE_RENDER_WORKERS", 2))
+# Certificados que pueden esperar turno además de los que se están generando
+CERTIFICATE_RENDER_QUEUE_LIMIT = int(os.getenv("CERTIFICATE_RENDER_QUEUE_LIMIT", 16))
+CERTIFICATE_RENDER_TIMEOUT_SECONDS = float(os.getenv("CERTIFICATE_RENDER_TIMEOUT_SECONDS", 20))
+# Certificados generándose a la vez durante una exportación masiva (ZIP)
+CERTIFICATE_EXPORT_WINDOW = int(os.getenv("CERTIFICATE_EXPORT_WINDOW", 8))
+# Verificación pública: cuánto se recuerda en memoria un código ya consultado
+CERTIFICATE_VERIFY_CACHE_SECONDS = float(os.getenv("CERTIFICATE_VERIFY_CACHE_SECONDS", 300))
+# Validez de los enlaces firmados de descarga (se abren apenas se piden)
+CERTIFICATE_LINK_SECONDS = int(os.getenv("CERTIFICATE_LINK_SECONDS", 120))
+
+# --- Almacenamiento de archivos ---
+# URL pública de esta API (para armar URLs absolutas)
+API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+# "local" (carpeta uploads/) o "s3" (S3 o compatible, ej. MinIO; requiere boto3: requirements-s3.txt)
+MEDIA_STORAGE_BACKEND = os.getenv("MEDIA_STORAGE_BACKEND", "local")
+# Validez de las URLs prefirmadas que se entregan al reproductor
+MEDIA_PRESIGNED_URL_SECONDS = int(os.getenv("MEDIA_PRESIGNED_URL_SECONDS", 300))
+S3_BUCKET = os.getenv("S3_BUCKET", "apprende-media")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # ej. http://minio:9000 (el que usa la API para subir/borrar)
+# Host del bucket visto desde el navegador, para las URLs prefirmadas (la firma
+# incluye el host). Por defecto el mismo S3_ENDPOINT_URL.
+S3_PUBLIC_ENDPOINT_URL = os.getenv("S3_PUBLIC_ENDPOINT_URL") or S3_ENDPOINT_URL
+S3_REGION = os.getenv("S3_REGION", "us-east-1")
+S3_ACCESS_KEY_ID = os.getenv("S3_ACCESS_KEY_ID")
+S3_SECRET_ACCESS_KEY = os.getenv("S3_SECRET_ACCESS_KEY")
+S3_PREFIX = os.getenv("S3_PREFIX", "")
+
+# --- Streaming de media ---
+# Tamaño de cada bloque leído del disco y enviado al cliente
+MEDIA_STREAM_CHUNK_BYTES = int(os.getenv("MEDIA_STREAM_CHUNK_BYTES", 256 * 1024))
+# Máximo que se entrega ante un rango abierto (`bytes=N-`); el reproductor pide el resto después
+MEDIA_STREAM_MAX_RANGE_BYTES = int(os.getenv("MEDIA_STREAM_MAX_RANGE_BYTES", 8 * 1024 * 1024))
+# Segundos que el proceso recuerda los metadatos de un archivo (tamaño, tipo, duración)
+MEDIA_METADATA_CACHE_SECONDS = float(os.getenv("MEDIA_METADATA_CACHE_SECONDS", 300))
+# Segundos que se recuerda si un usuario puede descargar un archivo de una lección
+MEDIA_ACCESS_CACHE_SECONDS = float(os.getenv("MEDIA_ACCESS_CACHE_SECONDS", 60))
+# Entrega por el proxy (ver deploy/nginx): el proxy anuncia el modo con el header X-Media-Offload.
+# Location interna de nginx que sirve la carpeta uploads/ (X-Accel-Redirect)
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/_protected_media/")
+# Ruta de uploads/ tal como la ve el servidor web (X-Sendfile de Apache/lighttpd)
+MEDIA_SENDFILE_ROOT = os.getenv("MEDIA_SENDFILE_ROOT", os.path.abspath("uploads"))
+
+# --- Subidas reanudables ---
+# Tamaño máximo de un archivo subido
+MEDIA_UPLOAD_MAX_BYTES = int(os.getenv("MEDIA_UPLOAD_MAX_MB", 5 * 1024)) * 1024 * 1024
+# Tamaño máximo de cada bloque (PATCH)
+MEDIA_UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("MEDIA_UPLOAD_CHUNK_MAX_MB", 64)) * 1024 * 1024
+# Horas sin recibir bloques tras las cuales una subida se considera abandonada
+MEDIA_UPLOAD_EXPIRE_HOURS = float(os.getenv("MEDIA_UPLOAD_EXPIRE_HOURS", 24))
+
+# --- Limpieza de archivos huérfanos (ver media/gc.py) ---
+# Antigüedad mínima de un archivo sin uso para borrarlo (un borrador puede tardar en guardarse)
+MEDIA_GC_GRACE_HOURS = float(os.getenv("MEDIA_GC_GRACE_HOURS", 72))
+# Máximo de archivos borrados por segundo (0 = sin límite)
+MEDIA_GC_MAX_DELETES_PER_SECOND = float(os.getenv("MEDIA_GC_MAX_DELETES_PER_SECOND", 50))
+
+# --- Reseñas ---
+# Segundos que se guarda en memoria la primera página de reseñas de cada curso
+REVIEWS_FIRST_PAGE_CACHE_SECONDS = float(os.getenv("REVIEWS_FIRST_PAGE_CACHE_SECONDS", 60))
+
+# --- Perfil público de instructores ---
+# Segundos que se guarda en memoria la página pública de cada instructor (también acota
+# lo desactualizados que pueden verse los contadores y calificaciones)
+INSTRUCTOR_PAGE_CACHE_SECONDS = float(os.getenv("INSTRUCTOR_PAGE_CACHE_SECONDS", 300))
+
+# --- Categorías ---
+# Segundos que se guarda en memoria el árbol de categorías (se invalida al crear categorías
+# o cambiar la categoría de un curso; el TTL acota lo que tarda en verse en otros workers)
+CATEGORY_TREE_CACHE_SECONDS = float(os.getenv("CATEGORY_TREE_CACHE_SECONDS", 3600))
@@ -0,0 +1,72 @@
+# app/core/ids.py
+"""
+Identificadores UUIDv7 (RFC 9562): los primeros 48 bits son el timestamp en
+milisegundos, así que las claves nuevas quedan ordenadas por tiempo y los INSERT
+van siempre al final del índice B-tree en vez de repartirse por todo el árbol
+(como pasa con gen_random_uuid(), que es UUIDv4).
+"""
+import os
+import threading
+import time
+import uuid
+
+from sqlalchemy import DDL, event, text
+
+from app.core.database import Base
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Genera un UUIDv7. Dentro del mismo milisegundo usa un contador de 12 bits
+    (rand_a) para que los IDs generados por este proceso sean monotónicos.
+    """
+    global _last_ms, _counter
+
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            # Arranque aleatorio dejando margen para incrementar dentro del ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Contador agotado: se "toma prestado" el siguiente milisegundo
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b
+    return uuid.UUID(int=value)
+
+
+# Equivalente en SQL, para los INSERT que no pasan por el ORM
+UUID7_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+# server_default para las columnas id
+UUID7_SERVER_DEFAULT = text("uuid_generate_v7()")
+
+# create_all necesita la función antes de crear las tablas que la usan como default
+event.listen(Base.metadata, "before_create", DDL(UUID7_FUNCTION_SQL))
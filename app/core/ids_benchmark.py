@@ -0,0 +1,102 @@
+# app/core/ids_benchmark.py
+"""
+Benchmark de claves primarias UUIDv4 (gen_random_uuid()) vs UUIDv7
+(uuid_generate_v7()) en una tabla que solo recibe INSERT.
+
+Crea dos tablas de prueba iguales salvo por el default del id, inserta N filas
+en lotes de una transacción y compara rendimiento de la carga (global y del
+último lote, cuando el índice ya no cabe en caché), tamaño del índice de la
+clave primaria y WAL generado. Con UUIDv4 cada INSERT cae en una hoja
+aleatoria del B-tree: más páginas partidas a medias, más páginas sucias y
+más full-page writes en el WAL.
+
+Las tablas se borran al terminar salvo con --keep. Con 10M de filas tarda
+varios minutos: conviene probar antes con --rows 100000.
+
+Uso:
+    python -m app.core.ids_benchmark [--rows 10000000] [--batch 10000]
+"""
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+TABLES = {
+    "UUIDv4": ("bench_ids_v4", "gen_random_uuid()"),
+    "UUIDv7": ("bench_ids_v7", "uuid_generate_v7()"),
+}
+
+
+def create_table(conn, table: str, id_default: str) -> None:
+    conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    conn.execute(text(f"""
+        CREATE TABLE {table} (
+            id uuid PRIMARY KEY DEFAULT {id_default},
+            payload integer NOT NULL,
+            created_at timestamp NOT NULL DEFAULT NOW()
+        )
+    """))
+    conn.commit()
+
+
+def load(conn, table: str, rows: int, batch: int) -> tuple:
+    """Inserta las filas por lotes. Devuelve (filas/s global, filas/s del último lote, bytes de WAL)."""
+    wal_start = conn.execute(text("SELECT pg_current_wal_lsn()")).scalar()
+    conn.commit()
+    started = time.perf_counter()
+    last = 0.0
+    for start in range(0, rows, batch):
+        count = min(batch, rows - start)
+        batch_started = time.perf_counter()
+        conn.execute(
+            text(f"INSERT INTO {table} (payload) SELECT g FROM generate_series(1, :n) AS g"),
+            {"n": count}
+        )
+        conn.commit()
+        last = count / (time.perf_counter() - batch_started)
+    total = rows / (time.perf_counter() - started)
+    wal = conn.execute(
+        text("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), CAST(:start AS pg_lsn))"), {"start": wal_start}
+    ).scalar()
+    conn.commit()
+    return total, last, wal
+
+
+def index_size_mb(conn, table: str) -> float:
+    size = conn.execute(
+        text("SELECT pg_relation_size(CAST(:index AS regclass))"), {"index": f"{table}_pkey"}
+    ).scalar()
+    return size / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de claves UUIDv4 vs UUIDv7")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--keep", action="store_true", help="No borrar las tablas al terminar")
+    args = parser.parse_args()
+
+    conn = engine.connect()
+    try:
+        print(f"{args.rows:,} filas en lotes de {args.batch:,}")
+        print(f"{'clave':<8}{'filas/s':>12}{'último lote':>14}{'índice PK MB':>14}{'WAL MB':>10}")
+        for name, (table, id_default) in TABLES.items():
+            create_table(conn, table, id_default)
+            total, last, wal = load(conn, table, args.rows, args.batch)
+            print(
+                f"{name:<8}{total:>12,.0f}{last:>14,.0f}"
+                f"{index_size_mb(conn, table):>14,.0f}{wal / (1024 * 1024):>10,.0f}"
+            )
+    finally:
+        conn.rollback()
+        if not args.keep:
+            for table, _ in TABLES.values():
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,10 @@
 # app/core/security.py
 from datetime import datetime, timedelta
 from typing import Optional, Union
+import base64
+import hashlib
+import hmac
+import time
 from jose import jwt
 from passlib.context import CryptContext
 import os
@@ -12,6 +16,13 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "secret_fallback") # ¡Asegúrate que esto esté en tu .env!
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+# Validez de las URLs firmadas (videos de lecciones, descargas de certificados)
+SIGNED_URL_EXPIRE_SECONDS = int(os.getenv("SIGNED_URL_EXPIRE_SECONDS", 4 * 3600))
+# El vencimiento se redondea hacia arriba: la misma URL durante ese intervalo (caché del navegador)
+SIGNED_URL_ROUND_SECONDS = 300
+
+# Clave propia para las URLs firmadas, derivada de SECRET_KEY
+URL_SIGNING_KEY = hmac.new(SECRET_KEY.encode(), b"apprende-signed-urls", hashlib.sha256).digest()
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -35,4 +46,27 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     
     # Firmamos el token con nuestra clave secreta
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+# --- URLs firmadas ---
+# Autorizan a un usuario a descargar un recurso concreto ("media:<archivo>",
+# "certificate:<curso>") hasta un vencimiento. Se verifican solo con CPU:
+# sin consultar la base de datos ni decodificar un JWT.
+
+def _url_signature(resource: str, user_id: str, expires: int) -> str:
+    message = f"{resource}|{user_id}|{expires}".encode()
+    digest = hmac.new(URL_SIGNING_KEY, message, hashlib.sha256).digest()[:20]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+def sign_resource(resource: str, user_id, expires_in: int = SIGNED_URL_EXPIRE_SECONDS) -> dict:
+    """Parámetros de query (uid, exp, sig) que autorizan a `user_id` a descargar `resource`."""
+    expires = int(time.time()) + expires_in
+    expires += -expires % SIGNED_URL_ROUND_SECONDS
+    return {"uid": str(user_id), "exp": expires, "sig": _url_signature(resource, str(user_id), expires)}
+
+def verify_resource_signature(resource: str, user_id: str, expires: int, signature: str) -> bool:
+    """True si la firma corresponde a (resource, user_id, expires) y no venció."""
+    if not (user_id and expires and signature) or expires < time.time():
+        return False
+    return hmac.compare_digest(_url_signature(resource, user_id, expires), signature)
@@ -1,9 +1,9 @@
 # Ubicación: app/main.py
 from fastapi import FastAPI, Depends, UploadFile, File
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from contextlib import asynccontextmanager
 from app.core.database import get_db, Base, engine
 import shutil
 import os
@@ -17,23 +17,38 @@ from app.modules.enrollments.router import router as enrollments_router
 from app.modules.categories.router import router as categories_router
 from app.modules.instructors.router import router as instructors_router
 from app.modules.reviews.router import router as reviews_router
-from app.modules.media.router import router as media_router
+from app.modules.media.router import router as media_router, public_router as media_public_router
 from app.modules.progress.router import router as progress_router
 
 # Importamos el modelo para que SQLAlchemy lo detecte antes del create_all
 from app.modules.progress.models import UserLessonProgress 
+from app.modules.certificates.models import IssuedCertificate
+from app.modules.media.models import UploadSession, MediaFile
+from app.modules.analytics.models import CourseDailySales
+from app.modules.progress.positions import start_position_flusher, stop_position_flusher
+from app.modules.certificates.renderer import certificate_render_pool
 
 # --- CREAR TABLAS EN LA BASE DE DATOS ---
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Apprende API", version="1.0.0", description="Plataforma LMS para creadores de contenido educativo")
+# --- TAREAS EN SEGUNDO PLANO ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Guarda en bloque las posiciones de reproducción de los videos
+    start_position_flusher()
+    yield
+    stop_position_flusher()
+    certificate_render_pool.shutdown()
+
+app = FastAPI(title="Apprende API", version="1.0.0", description="Plataforma LMS para creadores de contenido educativo", lifespan=lifespan)
 
 # --- 1. CONFIGURACIÓN DE ARCHIVOS (MEDIA) ---
 # Creamos la carpeta física 'uploads'
 os.makedirs("uploads", exist_ok=True) 
 
-# Le decimos a FastAPI: "Cuando alguien pida /media/..., busca en la carpeta 'uploads'"
-app.mount("/media", StaticFiles(directory="uploads"), name="media")
+# Cuando alguien pida /media/..., se comprueba si puede verlo y se entrega desde
+# 'uploads' (o desde el proxy / el bucket S3, ver app.modules.media.delivery)
+app.include_router(media_public_router)
 
 # --- 2. CONFIGURACIÓN DE CORS ---
 app.add_middleware(
@@ -42,11 +57,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"], 
     allow_headers=["*"], 
+    # Subidas reanudables: el cliente necesita leer el offset confirmado
+    expose_headers=["Upload-Offset", "Upload-Length", "Location"],
 )
 
 # --- 3. REGISTRO DE RUTAS ---
 from app.modules.progress.router import router as progress_router
 from app.modules.certificates.router import router as certificates_router
+from app.modules.analytics.router import router as analytics_router
 
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -58,6 +76,7 @@ app.include_router(instructors_router)
 app.include_router(reviews_router)
 app.include_router(progress_router)
 app.include_router(certificates_router)
+app.include_router(analytics_router)
 
 # --- 4. ENDPOINT DE SUBIDA DE ARCHIVOS ---
 # (Eliminado: Usamos /files/upload del media router)
@@ -0,0 +1,20 @@
+# app/modules/analytics/models.py
+from sqlalchemy import Column, String, Integer, Date, DECIMAL, DateTime, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class CourseDailySales(Base):
+    """
+    Ventas de un curso por día y moneda (inscripciones e ingresos).
+    Se suma en la misma transacción que la inscripción (ver analytics/service.py);
+    los paneles del instructor leen de aquí y nunca recorren `enrollments`.
+    """
+    __tablename__ = "course_daily_sales"
+
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    currency = Column(String(3), primary_key=True)
+    enrollments_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    revenue = Column(DECIMAL(12, 2), nullable=False, default=0, server_default=text("0"))
+    updated_at = Column(DateTime, server_default=text("NOW()"), onupdate=text("NOW()"))
@@ -0,0 +1,98 @@
+# app/modules/analytics/router.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Literal, Optional
+from datetime import date, timedelta
+from uuid import UUID
+
+from app.core.database import get_db
+from app.modules.auth.dependencies import get_current_user
+from app.modules.users.models import User
+from app.modules.analytics.schemas import SalesSeries, TopCourse, PeriodComparisonResponse
+from app.modules.analytics import service as analytics_service
+
+router = APIRouter(prefix="/analytics", tags=["Analíticas"])
+
+# Rango por defecto: últimos 30 días (incluido hoy)
+DEFAULT_RANGE_DAYS = 30
+# Rango máximo por consulta
+MAX_RANGE_DAYS = 366 * 3
+
+
+def _instructor_id(current_user: User, instructor_id: Optional[UUID]) -> UUID:
+    """Cada instructor ve sus ventas; un admin puede consultar las de cualquiera."""
+    if current_user.role == "ADMIN" and instructor_id is not None:
+        return instructor_id
+    if current_user.role != "INSTRUCTOR":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Solo los instructores pueden ver sus ventas"
+        )
+    return current_user.id
+
+
+def _date_range(start: Optional[date], end: Optional[date]):
+    end = end or date.today()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="La fecha inicial es posterior a la final")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"El rango no puede superar {MAX_RANGE_DAYS} días")
+    return start, end
+
+
+@router.get("/sales", response_model=SalesSeries)
+def get_sales_series(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: Literal["day", "week", "month"] = "day",
+    course_id: Optional[UUID] = None,
+    instructor_id: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Inscripciones e ingresos por día, semana o mes (y moneda) de los cursos
+    del instructor, o de uno solo con `course_id`. Los períodos sin ventas no aparecen.
+    """
+    owner_id = _instructor_id(current_user, instructor_id)
+    start, end = _date_range(start, end)
+    points = analytics_service.sales_series(db, owner_id, start, end, granularity, course_id)
+    return SalesSeries(start=start, end=end, granularity=granularity, points=points)
+
+
+@router.get("/top-courses", response_model=List[TopCourse])
+def get_top_courses(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    metric: Literal["revenue", "enrollments"] = "revenue",
+    limit: int = Query(5, ge=1, le=50),
+    instructor_id: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cursos del instructor con más ingresos o inscripciones en el rango."""
+    owner_id = _instructor_id(current_user, instructor_id)
+    start, end = _date_range(start, end)
+    return analytics_service.top_courses(db, owner_id, start, end, limit, metric)
+
+
+@router.get("/comparison", response_model=PeriodComparisonResponse)
+def get_period_comparison(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    instructor_id: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Totales del rango contra el período anterior de la misma duración."""
+    owner_id = _instructor_id(current_user, instructor_id)
+    start, end = _date_range(start, end)
+    previous_start, previous_end, items = analytics_service.compare_periods(db, owner_id, start, end)
+    return PeriodComparisonResponse(
+        start=start,
+        end=end,
+        previous_start=previous_start,
+        previous_end=previous_end,
+        items=items
+    )
@@ -0,0 +1,47 @@
+# app/modules/analytics/schemas.py
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+from uuid import UUID
+
+
+class SalesPoint(BaseModel):
+    """Ventas de un período (día, semana o mes que empieza en `period`) en una moneda"""
+    period: date
+    currency: str
+    enrollments: int
+    revenue: float
+
+
+class SalesSeries(BaseModel):
+    start: date
+    end: date
+    granularity: str
+    points: List[SalesPoint]
+
+
+class TopCourse(BaseModel):
+    course_id: UUID
+    title: str
+    currency: str
+    enrollments: int
+    revenue: float
+
+
+class PeriodComparison(BaseModel):
+    """Totales de un período contra el período anterior de la misma duración, por moneda"""
+    currency: str
+    enrollments: int
+    previous_enrollments: int
+    revenue: float
+    previous_revenue: float
+    # None si el período anterior no tuvo ingresos
+    revenue_change_percent: Optional[float] = None
+
+
+class PeriodComparisonResponse(BaseModel):
+    start: date
+    end: date
+    previous_start: date
+    previous_end: date
+    items: List[PeriodComparison]
@@ -0,0 +1,202 @@
+# app/modules/analytics/service.py
+"""
+Ventas diarias por (curso, día, moneda).
+
+- `register_sale`: suma una inscripción al día de hoy con un upsert atómico,
+  en la sesión del endpoint que inscribe (el commit lo hace el endpoint).
+- `backfill_daily_sales`: recalcula los días de un rango desde `enrollments`,
+  por bloques de días. Reemplaza lo que hubiera, así que se puede repetir.
+  El bloque que incluye hoy bloquea la tabla hasta su commit: las ventas que
+  lleguen mientras tanto esperan y se suman después sobre el día recalculado.
+- Consultas de los paneles: serie temporal, cursos más vendidos y
+  comparación con el período anterior. Solo leen `course_daily_sales` de los
+  cursos del instructor (clave primaria course_id, day).
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, cast, Date, and_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.modules.courses.models import Course
+from app.modules.enrollments.models import Enrollment
+from app.modules.analytics.models import CourseDailySales
+from app.modules.analytics.schemas import SalesPoint, TopCourse, PeriodComparison
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def register_sale(db: Session, course_id: UUID, amount: Decimal, currency: str) -> None:
+    """Suma una inscripción de `amount` al día de hoy del curso."""
+    stmt = pg_insert(CourseDailySales).values(
+        course_id=course_id,
+        day=func.current_date(),
+        currency=currency,
+        enrollments_count=1,
+        revenue=amount
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CourseDailySales.course_id, CourseDailySales.day, CourseDailySales.currency],
+        set_={
+            "enrollments_count": CourseDailySales.enrollments_count + 1,
+            "revenue": CourseDailySales.revenue + amount,
+            "updated_at": func.now(),
+        }
+    )
+    db.execute(stmt)
+
+
+def backfill_daily_sales(db: Session, since: date = None, until: date = None, days_per_batch: int = 31) -> dict:
+    """
+    Recalcula las ventas diarias entre `since` y `until` (por defecto, desde la
+    primera inscripción hasta hoy), un bloque de `days_per_batch` días por
+    transacción. Hace commit por bloque.
+    """
+    if since is None:
+        first = db.query(func.min(Enrollment.purchased_at)).scalar()
+        if first is None:
+            return {"days": 0, "rows": 0}
+        since = first.date()
+    if until is None:
+        until = db.query(func.current_date()).scalar()
+
+    report = {"days": 0, "rows": 0}
+    batch_start = since
+    while batch_start <= until:
+        batch_end = min(batch_start + timedelta(days=days_per_batch - 1), until)
+        report["rows"] += _rebuild_days(db, batch_start, batch_end)
+        db.commit()
+        report["days"] += (batch_end - batch_start).days + 1
+        batch_start = batch_end + timedelta(days=1)
+    return report
+
+
+def _rebuild_days(db: Session, start: date, end: date) -> int:
+    # Hoy register_sale sigue sumando: sin el bloqueo, una venta entre el DELETE
+    # y el INSERT se perdería o chocaría con la clave primaria. El modo SHARE ROW
+    # EXCLUSIVE espera a las ventas en curso y frena las nuevas hasta el commit.
+    if end >= db.query(func.current_date()).scalar():
+        db.execute(text(f"LOCK TABLE {CourseDailySales.__tablename__} IN SHARE ROW EXCLUSIVE MODE"))
+
+    in_range = and_(CourseDailySales.day >= start, CourseDailySales.day <= end)
+    db.execute(delete(CourseDailySales).where(in_range))
+
+    purchase_day = cast(Enrollment.purchased_at, Date)
+    actual = select(
+        Enrollment.course_id,
+        purchase_day,
+        func.coalesce(Enrollment.currency, "USD"),
+        func.count(),
+        func.coalesce(func.sum(Enrollment.amount_paid), 0)
+    ).where(
+        # Rango sobre la columna (no sobre el cast) para usar el índice de purchased_at
+        Enrollment.purchased_at >= start,
+        Enrollment.purchased_at < end + timedelta(days=1)
+    ).group_by(Enrollment.course_id, purchase_day, func.coalesce(Enrollment.currency, "USD"))
+
+    insert = pg_insert(CourseDailySales).from_select(
+        ["course_id", "day", "currency", "enrollments_count", "revenue"], actual
+    )
+    # Por si otra reconstrucción del mismo rango corre a la vez: gana el recálculo
+    insert = insert.on_conflict_do_update(
+        index_elements=[CourseDailySales.course_id, CourseDailySales.day, CourseDailySales.currency],
+        set_={
+            "enrollments_count": insert.excluded.enrollments_count,
+            "revenue": insert.excluded.revenue,
+            "updated_at": func.now(),
+        }
+    )
+    return db.execute(insert).rowcount
+
+
+def _instructor_sales(instructor_id: UUID, start: date, end: date, course_id: UUID = None):
+    """Condiciones: ventas de cursos del instructor dentro del rango."""
+    conditions = [
+        Course.id == CourseDailySales.course_id,
+        Course.user_id == instructor_id,
+        CourseDailySales.day >= start,
+        CourseDailySales.day <= end,
+    ]
+    if course_id is not None:
+        conditions.append(CourseDailySales.course_id == course_id)
+    return conditions
+
+
+def sales_series(db: Session, instructor_id: UUID, start: date, end: date, granularity: str = "day", course_id: UUID = None):
+    """Inscripciones e ingresos por período y moneda, en orden cronológico."""
+    period = cast(func.date_trunc(granularity, CourseDailySales.day), Date).label("period")
+    rows = db.query(
+        period,
+        CourseDailySales.currency,
+        func.sum(CourseDailySales.enrollments_count).label("enrollments"),
+        func.sum(CourseDailySales.revenue).label("revenue")
+    ).filter(
+        *_instructor_sales(instructor_id, start, end, course_id)
+    ).group_by(period, CourseDailySales.currency).order_by(period, CourseDailySales.currency).all()
+
+    return [
+        SalesPoint(period=row.period, currency=row.currency, enrollments=row.enrollments, revenue=row.revenue)
+        for row in rows
+    ]
+
+
+def top_courses(db: Session, instructor_id: UUID, start: date, end: date, limit: int = 5, metric: str = "revenue"):
+    """Cursos con más ingresos (o inscripciones) en el rango, por moneda."""
+    enrollments = func.sum(CourseDailySales.enrollments_count).label("enrollments")
+    revenue = func.sum(CourseDailySales.revenue).label("revenue")
+    ranking = (revenue, enrollments) if metric == "revenue" else (enrollments, revenue)
+
+    rows = db.query(
+        Course.id.label("course_id"),
+        Course.title,
+        CourseDailySales.currency,
+        enrollments,
+        revenue
+    ).filter(
+        *_instructor_sales(instructor_id, start, end)
+    ).group_by(Course.id, Course.title, CourseDailySales.currency).order_by(
+        *[column.desc() for column in ranking], Course.id
+    ).limit(limit).all()
+
+    return [
+        TopCourse(course_id=row.course_id, title=row.title, currency=row.currency,
+                  enrollments=row.enrollments, revenue=row.revenue)
+        for row in rows
+    ]
+
+
+def compare_periods(db: Session, instructor_id: UUID, start: date, end: date):
+    """
+    Totales de [start, end] y del período anterior de la misma duración, en una
+    sola consulta. Devuelve (previous_start, previous_end, items).
+    """
+    length = end - start + timedelta(days=1)
+    previous_start, previous_end = start - length, start - timedelta(days=1)
+
+    is_current = CourseDailySales.day >= start
+    rows = db.query(
+        CourseDailySales.currency,
+        func.coalesce(func.sum(CourseDailySales.enrollments_count).filter(is_current), 0).label("enrollments"),
+        func.coalesce(func.sum(CourseDailySales.enrollments_count).filter(~is_current), 0).label("previous_enrollments"),
+        func.coalesce(func.sum(CourseDailySales.revenue).filter(is_current), 0).label("revenue"),
+        func.coalesce(func.sum(CourseDailySales.revenue).filter(~is_current), 0).label("previous_revenue")
+    ).filter(
+        *_instructor_sales(instructor_id, previous_start, end)
+    ).group_by(CourseDailySales.currency).order_by(CourseDailySales.currency).all()
+
+    items = []
+    for row in rows:
+        change = None
+        if row.previous_revenue:
+            change = round(float((row.revenue - row.previous_revenue) / row.previous_revenue * 100), 2)
+        items.append(PeriodComparison(
+            currency=row.currency,
+            enrollments=row.enrollments,
+            previous_enrollments=row.previous_enrollments,
+            revenue=row.revenue,
+            previous_revenue=row.previous_revenue,
+            revenue_change_percent=change
+        ))
+    return previous_start, previous_end, items
@@ -0,0 +1,41 @@
+# app/modules/analytics/tasks.py
+"""
+Tareas de mantenimiento de las analíticas de ventas.
+
+Uso:
+    python -m app.modules.analytics.tasks backfill [--since AAAA-MM-DD] [--until AAAA-MM-DD] [--days-per-batch N]
+"""
+import argparse
+from datetime import date
+
+from app.core.database import SessionLocal
+# Modelos relacionados con Course/Enrollment: necesarios para configurar los mappers fuera de la API
+from app.modules.users.models import User  # noqa: F401
+from app.modules.reviews.models import Review  # noqa: F401
+from app.modules.instructors.models import InstructorProfile  # noqa: F401
+from app.modules.categories.models import Category  # noqa: F401
+from app.modules.analytics.service import backfill_daily_sales
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de analíticas de ventas")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backfill = subparsers.add_parser("backfill", help="Recalcula las ventas diarias desde las inscripciones")
+    backfill.add_argument("--since", type=date.fromisoformat, default=None, help="Primer día (por defecto, la primera venta)")
+    backfill.add_argument("--until", type=date.fromisoformat, default=None, help="Último día (por defecto, hoy)")
+    backfill.add_argument("--days-per-batch", type=int, default=31)
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "backfill":
+            result = backfill_daily_sales(db, since=args.since, until=args.until, days_per_batch=args.days_per_batch)
+            print(f"Días recalculados: {result['days']} | Filas: {result['rows']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 # app/modules/auth/dependencies.py
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import SECRET_KEY, ALGORITHM
+from app.core.security import SECRET_KEY, ALGORITHM, verify_resource_signature
 from app.modules.users.models import User
 
 # Esto le dice a Swagger que el login está en "/auth/login"
@@ -33,27 +35,40 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         
     return user
 
-def get_current_user_from_query(token: str, db: Session = Depends(get_db)):
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
+
+def get_optional_user(token: Optional[str] = Depends(oauth2_scheme_optional), db: Session = Depends(get_db)):
+    """Usuario del header Authorization, o None si la petición es anónima."""
+    if not token:
+        return None
+    return get_current_user(token, db)
+
+def get_signed_user(resource_template: str):
     """
-    Dependency para obtener el usuario desde un token pasado por query parameter.
-    Útil para descargas de archivos donde no se pueden enviar headers.
+    Dependency para descargas abiertas sin headers (window.open, <video>).
+    Solo acepta una URL firmada para el recurso `resource_template` (formateado
+    con los parámetros de la ruta, ver app.core.security.sign_resource): el JWT
+    nunca viaja en la URL, así no queda en historiales ni logs de acceso.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="No se pudieron validar las credenciales (Token inválido)",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    def dependency(
+        request: Request,
+        uid: Optional[str] = Query(None),
+        exp: Optional[int] = Query(None),
+        sig: Optional[str] = Query(None),
+        db: Session = Depends(get_db)
+    ):
+        if sig is None or uid is None or exp is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Falta la firma de la URL",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-        
-    return user
\ No newline at end of file
+        resource = resource_template.format(**request.path_params)
+        if not verify_resource_signature(resource, uid, exp, sig):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="El enlace no es válido o ya venció")
+        user = db.get(User, UUID(uid))
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="El enlace no es válido o ya venció")
+        return user
+    return dependency
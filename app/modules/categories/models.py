@@ -1,7 +1,8 @@
 # app/modules/categories/models.py
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.modules.media.urls import media_url_name
 
 
 class Category(Base):
@@ -22,3 +23,7 @@ class Category(Base):
     
     # Relación con cursos (se definirá back_populates en Course)
     courses = relationship("Course", back_populates="category")
+
+
+# Búsqueda de categorías por archivo subido (ver app.modules.media.urls)
+Index('ix_categories_icon_media_name', media_url_name(Category.icon_url))
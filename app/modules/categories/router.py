@@ -1,11 +1,12 @@
 # app/modules/categories/router.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.core.database import get_db
 from app.modules.categories.models import Category
-from app.modules.categories.schemas import CategoryResponse, CategoryCreate, CategoryWithChildren
+from app.modules.categories.schemas import CategoryResponse, CategoryCreate, CategoryWithChildren, CategoryTreeNode
+from app.modules.categories import service as category_service
 
 router = APIRouter(prefix="/categories", tags=["Categorías"])
 
@@ -18,33 +19,54 @@ def list_categories(
     db: Session = Depends(get_db)
 ):
     """
-    Lista todas las categorías.
+    Lista todas las categorías (desde el árbol en memoria).
     - Si parent_id es None, devuelve categorías raíz.
     - Si parent_id tiene valor, devuelve subcategorías de ese padre.
     """
-    query = db.query(Category)
-    
-    if parent_id is not None:
-        query = query.filter(Category.parent_id == parent_id)
-    else:
-        query = query.filter(Category.parent_id.is_(None))  # Solo raíces
-    
-    return query.offset(skip).limit(limit).all()
+    tree = category_service.get_category_tree(db)
+    categories = [node for node in tree.nodes.values() if node.parent_id == parent_id]
+    return categories[skip:skip + limit]
 
 
 @router.get("/all", response_model=List[CategoryResponse])
 def list_all_categories(db: Session = Depends(get_db)):
     """Lista TODAS las categorías sin filtro de jerarquía."""
-    return db.query(Category).all()
+    return list(category_service.get_category_tree(db).nodes.values())
+
+
+@router.get(
+    "/tree",
+    response_model=List[CategoryTreeNode],
+    responses={304: {"description": "El árbol no cambió desde el ETag enviado"}}
+)
+def get_category_tree(request: Request, db: Session = Depends(get_db)):
+    """
+    Árbol completo de categorías con la cantidad de cursos publicados de cada
+    una y de su subárbol. Se sirve desde memoria con ETag: si el cliente
+    envía `If-None-Match` y el árbol no cambió, responde 304 sin cuerpo.
+    """
+    tree = category_service.get_category_tree(db)
+    headers = {"ETag": tree.etag, "Cache-Control": "public, no-cache"}
+
+    if tree.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=tree.body, media_type="application/json", headers=headers)
 
 
 @router.get("/{category_id}", response_model=CategoryWithChildren)
 def get_category(category_id: int, db: Session = Depends(get_db)):
     """Obtiene una categoría con sus subcategorías."""
-    category = db.query(Category).filter(Category.id == category_id).first()
-    if not category:
+    node = category_service.get_category_tree(db).nodes.get(category_id)
+    if node is None:
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
-    return category
+    return CategoryWithChildren(
+        id=node.id,
+        parent_id=node.parent_id,
+        name=node.name,
+        slug=node.slug,
+        icon_url=node.icon_url,
+        subcategories=node.children
+    )
 
 
 @router.post("/", response_model=CategoryResponse, status_code=201)
@@ -62,4 +84,5 @@ def create_category(
     db.add(new_category)
     db.commit()
     db.refresh(new_category)
+    category_service.invalidate_category_tree()
     return new_category
@@ -27,3 +27,10 @@ class CategoryWithChildren(CategoryResponse):
 
     class Config:
         from_attributes = True
+
+
+class CategoryTreeNode(CategoryResponse):
+    """Nodo del árbol de categorías con la cantidad de cursos publicados"""
+    course_count: int = 0  # Cursos asignados directamente a la categoría
+    total_course_count: int = 0  # Incluye los de todas sus subcategorías
+    children: List["CategoryTreeNode"] = []
@@ -0,0 +1,107 @@
+# app/modules/categories/service.py
+"""
+Árbol de categorías en memoria.
+
+Se arma con una sola consulta (categorías + cursos publicados por categoría)
+y se guarda en el proceso ya serializado, con su ETag. Los listados de
+categorías se responden desde aquí sin ir a la base de datos. Se invalida al
+crear una categoría o al cambiar la categoría de un curso.
+"""
+import hashlib
+import json
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import CATEGORY_TREE_CACHE_SECONDS
+from app.modules.courses.models import Course, CourseStatus
+from app.modules.categories.models import Category
+from app.modules.categories.schemas import CategoryTreeNode
+
+TREE_CACHE_KEY = "tree"
+category_tree_cache = TTLCache(ttl_seconds=CATEGORY_TREE_CACHE_SECONDS, maxsize=1)
+
+
+class CategoryTree:
+    """Árbol armado: raíces, índice por id, y el JSON con su ETag listos para responder."""
+
+    def __init__(self, roots, nodes):
+        self.roots = roots
+        self.nodes = nodes
+        self.body = json.dumps(
+            [root.model_dump(mode="json") for root in roots],
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+
+def get_category_tree(db: Session) -> CategoryTree:
+    tree = category_tree_cache.get(TREE_CACHE_KEY)
+    if tree is None:
+        tree = _build_category_tree(db)
+        category_tree_cache.set(TREE_CACHE_KEY, tree)
+    return tree
+
+
+def invalidate_category_tree() -> None:
+    """Llamar después del commit al crear/editar categorías o cambiar la categoría de un curso."""
+    category_tree_cache.delete(TREE_CACHE_KEY)
+
+
+def _build_category_tree(db: Session) -> CategoryTree:
+    course_counts = db.query(
+        Course.category_id,
+        func.count().label("total")
+    ).filter(
+        Course.status == CourseStatus.PUBLISHED,
+        Course.category_id.isnot(None)
+    ).group_by(Course.category_id).subquery()
+
+    rows = db.query(
+        Category.id,
+        Category.parent_id,
+        Category.name,
+        Category.slug,
+        Category.icon_url,
+        func.coalesce(course_counts.c.total, 0).label("course_count")
+    ).outerjoin(
+        course_counts, course_counts.c.category_id == Category.id
+    ).order_by(Category.name, Category.id).all()
+
+    nodes = {
+        row.id: CategoryTreeNode(
+            id=row.id,
+            parent_id=row.parent_id,
+            name=row.name,
+            slug=row.slug,
+            icon_url=row.icon_url,
+            course_count=row.course_count
+        )
+        for row in rows
+    }
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node.parent_id)
+        if parent is None or node.parent_id == node.id:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+
+    visited = set()
+    for root in roots:
+        _roll_up_course_counts(root, visited)
+    return CategoryTree(roots, nodes)
+
+
+def _roll_up_course_counts(node: CategoryTreeNode, visited: set) -> int:
+    """Suma los cursos del subárbol (los ciclos en parent_id se cortan en el nodo repetido)."""
+    if node.id in visited:
+        return 0
+    visited.add(node.id)
+    node.total_course_count = node.course_count + sum(
+        _roll_up_course_counts(child, visited) for child in node.children
+    )
+    return node.total_course_count
@@ -0,0 +1,78 @@
+# app/modules/certificates/benchmark.py
+"""
+Benchmark del render de certificados: dibujar la página completa en cada
+certificado vs. usar la plantilla precompilada.
+
+Uso:
+    python -m app.modules.certificates.benchmark [-n 500]
+"""
+import argparse
+import time
+from datetime import datetime
+from io import BytesIO
+
+from reportlab.pdfgen import canvas
+
+from app.modules.certificates.service import (
+    PAGE_SIZE,
+    draw_static_layout,
+    draw_student_fields,
+    get_certificate_template,
+)
+
+
+def render_full_page(
+    student_name: str,
+    course_title: str,
+    completion_date: datetime,
+    verification_code: str
+) -> BytesIO:
+    """Camino anterior: todo el diseño se dibuja desde cero en cada certificado."""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=PAGE_SIZE, invariant=1)
+    draw_static_layout(c)
+    draw_student_fields(c, student_name, course_title, completion_date, verification_code)
+    c.showPage()
+    c.save()
+    buffer.seek(0)
+    return buffer
+
+
+def measure(render, iterations: int) -> dict:
+    completion_date = datetime(2026, 1, 15)
+    total_bytes = 0
+
+    started = time.perf_counter()
+    for i in range(iterations):
+        pdf = render(f"Alumno Número {i}", "Curso de Prueba de Rendimiento", completion_date, f"{i:05d}-BENCH")
+        total_bytes += len(pdf.getvalue())
+    elapsed = time.perf_counter() - started
+
+    return {
+        "certificates_per_sec": iterations / elapsed,
+        "bytes_per_pdf": total_bytes / iterations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del render de certificados")
+    parser.add_argument("-n", "--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    template = get_certificate_template()
+    # Calentamiento (carga de fuentes, compilación de la plantilla)
+    render_full_page("x", "x", datetime.now(), "x")
+    template.render("x", "x", datetime.now(), "x")
+
+    results = {
+        "página completa": measure(render_full_page, args.iterations),
+        "plantilla": measure(template.render, args.iterations),
+    }
+
+    print(f"{'camino':<18}{'cert/s':>12}{'bytes/PDF':>12}")
+    for name, result in results.items():
+        print(f"{name:<18}{result['certificates_per_sec']:>12.1f}{result['bytes_per_pdf']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# app/modules/certificates/cache.py
+"""
+Caché en disco de certificados PDF ya generados.
+
+Cada PDF se guarda con un nombre derivado de todo lo que lo define (usuario,
+curso, nombre del alumno, título del curso, fecha de finalización, código de
+verificación y versión de la plantilla). Si cambia cualquiera de esos datos
+cambia la clave, así que la entrada vieja simplemente deja de usarse y la
+expulsa el límite de tamaño.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from datetime import datetime
+from uuid import UUID
+
+from app.core.config import CERTIFICATE_CACHE_DIR, CERTIFICATE_CACHE_MAX_BYTES
+from app.modules.certificates.service import CERTIFICATE_TEMPLATE_VERSION
+
+# Al expulsar, se borra hasta bajar a esta fracción del máximo (evita expulsar en cada escritura)
+EVICTION_TARGET = 0.9
+
+
+def certificate_cache_key(
+    user_id: UUID,
+    course_id: UUID,
+    student_name: str,
+    course_title: str,
+    completion_date: datetime,
+    verification_code: str
+) -> str:
+    raw = "|".join([
+        str(user_id),
+        str(course_id),
+        student_name,
+        course_title,
+        completion_date.date().isoformat(),
+        verification_code,
+        CERTIFICATE_TEMPLATE_VERSION,
+    ])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CertificateCache:
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None  # se calcula la primera vez que hace falta
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def get(self, key: str):
+        """Devuelve la ruta del PDF cacheado o None."""
+        path = self._path(key)
+        try:
+            # Marca de uso para la expulsión LRU
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """Guarda el PDF de forma atómica y devuelve su ruta."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as shards:
+            for shard in shards:
+                if not shard.is_dir():
+                    continue
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        if entry.name.endswith(".pdf"):
+                            yield entry
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self, keep: str) -> None:
+        """Borra los PDFs usados hace más tiempo hasta quedar bajo EVICTION_TARGET."""
+        entries = sorted(
+            ((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in self._entries()),
+        )
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICTION_TARGET
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        self._total_bytes = total
+
+
+certificate_cache = CertificateCache(CERTIFICATE_CACHE_DIR, CERTIFICATE_CACHE_MAX_BYTES)
@@ -0,0 +1,135 @@
+# app/modules/certificates/export.py
+"""
+Exportación de todos los certificados de un curso en un ZIP.
+
+El ZIP se arma mientras se va enviando: cada certificado se comprime y se
+entrega al cliente apenas está listo, así la memoria se mantiene constante
+(solo la ventana de certificados en render) sin importar el tamaño del grupo.
+"""
+import logging
+import re
+import zipfile
+from collections import deque
+
+from app.core.config import CERTIFICATE_EXPORT_WINDOW
+from app.core.database import SessionLocal
+from app.modules.certificates.cache import certificate_cache, certificate_cache_key
+from app.modules.certificates.renderer import certificate_render_pool
+from app.modules.certificates.verification import content_hash, record_content_hashes
+
+logger = logging.getLogger(__name__)
+
+
+class _ZipSink:
+    """
+    Destino de escritura para ZipFile que solo acumula lo escrito hasta que se
+    vacía. No tiene seek/tell, así ZipFile escribe en modo streaming (data descriptors).
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _entry_name(user_id, full_name: str) -> str:
+    safe_name = re.sub(r"[^\w\-]+", "_", full_name, flags=re.UNICODE).strip("_") or "Alumno"
+    # Últimos caracteres del UUID (los primeros de un UUIDv7 son el timestamp)
+    return f"Certificado_{safe_name}_{user_id.hex[-8:]}.pdf"
+
+
+def _render_in_order(certificates):
+    """
+    Genera los certificados en paralelo (pool de procesos) manteniendo como
+    máximo CERTIFICATE_EXPORT_WINDOW en curso, y los entrega en orden.
+    Reutiliza los que ya estén en la caché de disco.
+    """
+    pending = deque()
+
+    def next_ready():
+        certificate, cache_key, result = pending.popleft()
+        if isinstance(result, bytes):
+            return certificate, result
+        pdf_bytes = result.result()
+        certificate_cache.put(cache_key, pdf_bytes)
+        return certificate, pdf_bytes
+
+    for certificate in certificates:
+        cache_key = certificate_cache_key(
+            certificate.user_id,
+            certificate.course_id,
+            certificate.student_name,
+            certificate.course_title,
+            certificate.completed_at,
+            certificate.code
+        )
+        cached_path = certificate_cache.get(cache_key)
+        if cached_path is not None:
+            with open(cached_path, "rb") as f:
+                pending.append((certificate, cache_key, f.read()))
+        else:
+            future = certificate_render_pool.submit(
+                certificate.student_name,
+                certificate.course_title,
+                certificate.completed_at,
+                certificate.code,
+                block=True
+            )
+            pending.append((certificate, cache_key, future))
+
+        while len(pending) >= CERTIFICATE_EXPORT_WINDOW:
+            yield next_ready()
+
+    while pending:
+        yield next_ready()
+
+
+def _save_content_hashes(hashes: dict) -> None:
+    db = SessionLocal()
+    try:
+        record_content_hashes(db, hashes)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("No se pudieron guardar los hashes de los certificados exportados")
+    finally:
+        db.close()
+
+
+def stream_course_certificates_zip(certificates):
+    """
+    Generador de bytes del ZIP. `certificates` son las filas de los certificados
+    emitidos (ver verification.issue_certificates), ya cargadas: el generador
+    corre después de cerrar la sesión de DB.
+    """
+    new_hashes = {}
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for certificate, pdf_bytes in _render_in_order(certificates):
+            info = zipfile.ZipInfo(
+                _entry_name(certificate.user_id, certificate.student_name),
+                date_time=certificate.completed_at.timetuple()[:6]
+            )
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, pdf_bytes)
+
+            pdf_hash = content_hash(pdf_bytes)
+            if pdf_hash != certificate.content_hash:
+                new_hashes[certificate.code] = pdf_hash
+            yield sink.drain()
+
+    # Directorio central del ZIP
+    yield sink.drain()
+
+    # Los hashes se guardan al final, en una sola sentencia
+    _save_content_hashes(new_hashes)
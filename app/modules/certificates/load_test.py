@@ -0,0 +1,188 @@
+# app/modules/certificates/load_test.py
+"""
+Prueba de carga: el catálogo (GET /courses/) debe mantener su p99 mientras se
+generan muchos certificados a la vez.
+
+Contra una API en marcha:
+1. Crea un instructor, un curso con una lección y N alumnos que lo completan
+   (cada alumno es un certificado distinto, así ninguno sale de la caché).
+2. Mide el catálogo durante --duration segundos sin otra carga.
+3. Repite la medición lanzando a la vez las N descargas de certificado. Los
+   clientes respetan Retry-After cuando el pool responde 503, como haría el
+   navegador reintentando.
+
+Solo usa la biblioteca estándar (urllib), no hace falta instalar nada más.
+
+Uso:
+    python -m app.modules.certificates.load_test [--api http://localhost:8000] [--renders 200]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlencode, urlsplit
+from urllib.request import Request, urlopen
+
+PASSWORD = "load-test-1234"
+
+
+class Api:
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def call(self, method: str, path: str, body=None, token: str = None, form: bool = False):
+        """Devuelve (status, headers, cuerpo en bytes) sin lanzar excepción por códigos HTTP."""
+        headers = {}
+        data = None
+        if body is not None:
+            if form:
+                data = urlencode(body).encode()
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            else:
+                data = json.dumps(body).encode()
+                headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        request = Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urlopen(request, timeout=120) as response:
+                return response.status, response.headers, response.read()
+        except HTTPError as error:
+            return error.code, error.headers, error.read()
+
+    def json(self, method: str, path: str, body=None, token: str = None, form: bool = False, expected=(200, 201)):
+        status, _, payload = self.call(method, path, body, token, form)
+        if status not in expected:
+            raise RuntimeError(f"{method} {path} -> {status}: {payload[:200]!r}")
+        return json.loads(payload) if payload else None
+
+    def user(self, email: str, name: str) -> str:
+        self.json("POST", "/auth/register", {"full_name": name, "email": email, "password": PASSWORD})
+        return self.json("POST", "/auth/login", {"username": email, "password": PASSWORD}, form=True)["access_token"]
+
+
+def seed(api: Api, renders: int, workers: int) -> list:
+    """Curso con una lección y `renders` alumnos que lo completan. Devuelve las rutas firmadas."""
+    run = uuid.uuid4().hex[:8]
+    instructor = api.user(f"load-{run}-instructor@example.com", "Instructor de carga")
+    api.json("POST", "/instructors/become-instructor", token=instructor)
+    course = api.json("POST", "/courses/", {"title": f"Curso de carga {run}", "price": 0}, token=instructor)
+    section = api.json(
+        "POST", f"/courses/{course['id']}/sections", {"title": "Única", "order_index": 0}, token=instructor
+    )
+    # URL externa: un archivo /media/... tendría que haberlo subido el instructor
+    lesson = api.json(
+        "POST", f"/courses/{section['id']}/lessons",
+        {"title": "Única", "video_resource_id": "https://example.com/load-test.mp4"}, token=instructor
+    )
+
+    def student(i: int) -> str:
+        token = api.user(f"load-{run}-{i}@example.com", f"Alumno de carga {i}")
+        api.json("POST", "/enrollments/", {"course_id": course["id"]}, token=token)
+        api.json("POST", "/progress/toggle", {"lesson_id": lesson["id"], "course_id": course["id"]}, token=token)
+        link = api.json("GET", f"/certificates/{course['id']}/download-url", token=token)
+        # El enlace lleva API_BASE_URL del servidor: se usa solo ruta + firma
+        parts = urlsplit(link["url"])
+        return f"{parts.path}?{parts.query}"
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(student, range(renders)))
+
+
+def catalog_load(api: Api, clients: int, stop: threading.Event) -> list:
+    """`clients` hilos pidiendo el catálogo en bucle hasta `stop`. Devuelve latencias en ms."""
+    latencies = []
+    lock = threading.Lock()
+
+    def loop():
+        while not stop.is_set():
+            started = time.perf_counter()
+            status, _, _ = api.call("GET", "/courses/")
+            elapsed = (time.perf_counter() - started) * 1000
+            if status == 200:
+                with lock:
+                    latencies.append(elapsed)
+
+    threads = [threading.Thread(target=loop) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    stop.wait()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def download(api: Api, path: str, max_wait: float) -> tuple:
+    """Descarga un certificado reintentando tras 503. Devuelve (status final, ms, nº de 503)."""
+    started = time.perf_counter()
+    rejected = 0
+    while True:
+        status, headers, _ = api.call("GET", path)
+        if status != 503 or time.perf_counter() - started > max_wait:
+            return status, (time.perf_counter() - started) * 1000, rejected
+        rejected += 1
+        time.sleep(float(headers.get("Retry-After") or 1))
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga: catálogo con certificados en paralelo")
+    parser.add_argument("--api", default="http://localhost:8000")
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--catalog-clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=15, help="Segundos de la medición sin carga")
+    parser.add_argument("--max-wait", type=float, default=120, help="Espera máxima por certificado")
+    args = parser.parse_args()
+
+    api = Api(args.api)
+    print(f"Preparando {args.renders} alumnos con el curso completado...")
+    paths = seed(api, args.renders + 1, workers=16)
+    # Un certificado previo arranca los procesos del pool antes de medir
+    warmup = paths.pop()
+    download(api, warmup, args.max_wait)
+
+    stop = threading.Event()
+    timer = threading.Timer(args.duration, stop.set)
+    timer.start()
+    baseline = catalog_load(api, args.catalog_clients, stop)
+
+    stop = threading.Event()
+    results = []
+    burst_started = time.perf_counter()
+
+    def burst():
+        with ThreadPoolExecutor(max_workers=args.renders) as pool:
+            results.extend(pool.map(lambda path: download(api, path, args.max_wait), paths))
+        stop.set()
+
+    burst_thread = threading.Thread(target=burst)
+    burst_thread.start()
+    under_load = catalog_load(api, args.catalog_clients, stop)
+    burst_thread.join()
+    burst_seconds = time.perf_counter() - burst_started
+
+    print(f"{'catálogo':<22}{'peticiones':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, latencies in (("sin carga", baseline), (f"{args.renders} certificados", under_load)):
+        print(
+            f"{name:<22}{len(latencies):>12}"
+            f"{statistics.median(latencies):>10.1f}{percentile(latencies, 0.99):>10.1f}"
+        )
+
+    statuses = Counter(status for status, _, _ in results)
+    times = [elapsed for status, elapsed, _ in results if status == 200]
+    print(f"certificados en {burst_seconds:.1f}s: {dict(statuses)}, {sum(r for _, _, r in results)} respuestas 503 reintentadas")
+    if times:
+        print(f"descarga p50 {statistics.median(times):.0f} ms, p99 {percentile(times, 0.99):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# app/modules/certificates/models.py
+from sqlalchemy import Column, String, DateTime, ForeignKey, text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
+
+
+class IssuedCertificate(Base):
+    """
+    Certificado emitido: uno por (usuario, curso).
+    Guarda una copia de los datos impresos en el PDF para que la verificación
+    pública sea una lectura por índice de una sola fila, sin volver a validar
+    el progreso del alumno.
+    """
+    __tablename__ = "issued_certificates"
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'course_id', name='unique_issued_certificate'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
+    # Código corto impreso en el PDF (ej. 7KQ2M-XH9TD)
+    code = Column(String(16), unique=True, index=True, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+
+    # Datos tal como aparecen en el certificado
+    student_name = Column(String(150), nullable=False)
+    course_title = Column(String(200), nullable=False)
+    completed_at = Column(DateTime, nullable=False)
+
+    # SHA-256 del PDF entregado (se completa al generarlo)
+    content_hash = Column(String(64), nullable=True)
+    issued_at = Column(DateTime, server_default=text("NOW()"))
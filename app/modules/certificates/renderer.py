@@ -0,0 +1,151 @@
+# app/modules/certificates/renderer.py
+"""
+Pool de procesos para generar certificados.
+
+ReportLab es CPU puro y retiene el GIL: generado dentro del endpoint, una ráfaga
+de descargas ocupa el threadpool del que dependen todos los endpoints sync.
+Aquí el render corre en procesos aparte, con un límite de certificados en
+curso + en cola. Si se supera, se rechaza al instante (503) en vez de acumular
+hilos esperando.
+"""
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+
+from app.core.config import (
+    CERTIFICATE_RENDER_WORKERS,
+    CERTIFICATE_RENDER_QUEUE_LIMIT,
+    CERTIFICATE_RENDER_TIMEOUT_SECONDS,
+)
+from app.modules.certificates.service import render_certificate_bytes
+
+# Cantidad de latencias recientes que se guardan para los percentiles
+LATENCY_WINDOW = 1000
+
+
+class RenderQueueFull(Exception):
+    """No hay lugar en la cola de render."""
+
+
+class RenderTimeout(Exception):
+    """El certificado no se generó dentro del tiempo límite."""
+
+
+class CertificateRenderPool:
+    def __init__(self, workers: int, queue_limit: int, timeout: float):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Un "slot" por certificado en curso o en cola
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+        self._metrics_lock = threading.Lock()
+        self._in_flight = 0
+        self._rendered = 0
+        self._failed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # spawn: los procesos hijos no heredan hilos ni conexiones del servidor
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(
+        self,
+        student_name: str,
+        course_title: str,
+        completion_date: datetime,
+        verification_code: str,
+        block: bool = False
+    ) -> Future:
+        """
+        Encola un certificado y devuelve el Future con los bytes del PDF.
+        Con block=False lanza RenderQueueFull si no hay lugar; con block=True espera
+        turno (lo usan las exportaciones masivas, que ya limitan su propia ventana).
+        """
+        if not self._slots.acquire(blocking=block):
+            with self._metrics_lock:
+                self._rejected += 1
+            raise RenderQueueFull()
+
+        started = time.monotonic()
+        with self._metrics_lock:
+            self._in_flight += 1
+
+        try:
+            future = self._get_executor().submit(
+                render_certificate_bytes, student_name, course_title, completion_date, verification_code
+            )
+        except Exception:
+            self._finish(started, ok=False)
+            raise
+
+        future.add_done_callback(lambda f: self._finish(started, ok=not f.cancelled() and f.exception() is None))
+        return future
+
+    def _finish(self, started: float, ok: bool) -> None:
+        with self._metrics_lock:
+            self._in_flight -= 1
+            if ok:
+                self._rendered += 1
+                self._latencies.append(time.monotonic() - started)
+            else:
+                self._failed += 1
+        self._slots.release()
+
+    def render(self, student_name: str, course_title: str, completion_date: datetime, verification_code: str) -> bytes:
+        """Genera un certificado esperando como máximo `timeout` segundos."""
+        future = self.submit(student_name, course_title, completion_date, verification_code)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # El slot se libera cuando el proceso termine de verdad
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise RenderTimeout()
+
+    def metrics(self) -> dict:
+        with self._metrics_lock:
+            latencies = sorted(self._latencies)
+            in_flight = self._in_flight
+            data = {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - self.workers),
+                "rendered": self._rendered,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+            }
+
+        for name, pct in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            value = latencies[min(len(latencies) - 1, int(len(latencies) * pct))] if latencies else 0.0
+            data[f"latency_{name}_ms"] = round(value * 1000, 1)
+        return data
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+certificate_render_pool = CertificateRenderPool(
+    workers=CERTIFICATE_RENDER_WORKERS,
+    queue_limit=CERTIFICATE_RENDER_QUEUE_LIMIT,
+    timeout=CERTIFICATE_RENDER_TIMEOUT_SECONDS,
+)
@@ -1,63 +1,222 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from uuid import UUID
+from urllib.parse import urlencode
 from app.core.database import get_db
-from app.modules.auth.dependencies import get_current_user, get_current_user_from_query
+from app.core.config import API_BASE_URL, CERTIFICATE_LINK_SECONDS
+from app.core.security import sign_resource
+from app.modules.auth.dependencies import get_current_user, get_signed_user
 from app.modules.users.models import User
-from app.modules.courses.models import Course, Section, Lesson
-from app.modules.progress.models import UserLessonProgress
-from app.modules.certificates.service import generate_certificate_pdf
+from app.modules.courses.models import Course
+from app.modules.progress.models import CourseProgressSummary
+from app.modules.progress.service import get_course_completion, progress_percentage
+from app.modules.certificates.renderer import certificate_render_pool, RenderQueueFull, RenderTimeout
+from app.modules.certificates.export import stream_course_certificates_zip
+from app.modules.certificates.cache import certificate_cache, certificate_cache_key
+from app.modules.certificates.verification import (
+    issue_certificate,
+    issue_certificates,
+    record_content_hashes,
+    content_hash,
+    get_verification,
+)
+from app.modules.certificates.schemas import CertificateVerification
 from datetime import datetime
 
 router = APIRouter(prefix="/certificates", tags=["Certificados"])
 
+@router.get("/metrics")
+def get_render_metrics(current_user: User = Depends(get_current_user)):
+    """Estado del pool de generación de certificados (solo administradores)."""
+    if current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="Solo los administradores pueden ver estas métricas")
+    return certificate_render_pool.metrics()
+
+@router.get("/verify/{code}", response_model=CertificateVerification)
+def verify_certificate(code: str, db: Session = Depends(get_db)):
+    """
+    Verificación pública (sin login) del código impreso en un certificado.
+    Responde desde la caché o con una lectura por el índice del código.
+    """
+    certificate = get_verification(db, code)
+    if certificate is None:
+        raise HTTPException(status_code=404, detail="No existe un certificado con ese código")
+    return certificate
+
+def _signed_link(path: str, resource: str, user_id) -> dict:
+    params = sign_resource(resource, user_id, expires_in=CERTIFICATE_LINK_SECONDS)
+    return {"url": f"{API_BASE_URL}{path}?{urlencode(params)}", "expires_in_seconds": CERTIFICATE_LINK_SECONDS}
+
+@router.get("/{course_id}/download-url")
+def get_certificate_download_url(course_id: UUID, current_user: User = Depends(get_current_user)):
+    """
+    Enlace firmado y de corta duración para abrir la descarga en otra pestaña
+    (window.open no envía el header Authorization). Reemplaza a ?token=<JWT>.
+    """
+    return _signed_link(f"/certificates/{course_id}/download", f"certificate:{course_id}", current_user.id)
+
 @router.get("/{course_id}/download")
 def download_certificate(
     course_id: UUID,
+    request: Request,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user_from_query) # Cambiado aquí
+    current_user: User = Depends(get_signed_user("certificate:{course_id}"))
 ):
     """
     Descarga el certificado si el usuario ha completado el 100% del curso.
+    El PDF se genera una sola vez y se sirve desde la caché en disco con ETag,
+    así las descargas repetidas responden 304 sin volver a enviarlo.
     """
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise HTTPException(status_code=404, detail="Curso no encontrado")
 
-    # 1. Contar lecciones totales del curso
-    # (Unirse a Section y Lesson)
-    total_lessons = db.query(Lesson).join(Section).filter(Section.course_id == course_id).count()
+    # 1. Leer contadores de progreso (una sola fila, sin contar lecciones)
+    completion = get_course_completion(db, current_user.id, course_id)
 
-    if total_lessons == 0:
+    if completion.total_lessons == 0:
         raise HTTPException(status_code=400, detail="Este curso no tiene contenido.")
 
-    # 2. Contar lecciones completadas por el usuario
-    completed_lessons = db.query(UserLessonProgress).filter(
-        UserLessonProgress.user_id == current_user.id,
-        UserLessonProgress.course_id == course_id
-    ).count()
-
-    # 3. Validar progreso
-    if completed_lessons < total_lessons:
-        progress_pct = int((completed_lessons / total_lessons) * 100)
+    # 2. Validar progreso
+    if completion.completed_lessons < completion.total_lessons:
+        progress_pct = progress_percentage(completion.completed_lessons, completion.total_lessons)
         raise HTTPException(
             status_code=403, 
             detail=f"Aún no has completado el curso. Progreso actual: {progress_pct}%"
         )
 
-    # 4. Generar PDF
-    pdf_buffer = generate_certificate_pdf(
-        student_name=current_user.full_name,
-        course_title=course.title,
-        completion_date=datetime.now()
+    # 3. Emitir el certificado (código de verificación; idempotente). La fecha
+    # solo cuenta la primera vez: un certificado emitido conserva la suya
+    certificate = issue_certificate(
+        db,
+        current_user.id,
+        course.id,
+        current_user.full_name,
+        course.title,
+        completion.last_completed_at or datetime.utcnow()
     )
+    db.commit()
 
-    # 5. Retornar archivo
-    return StreamingResponse(
-        pdf_buffer,
+    # 4. Buscar en caché (la clave identifica el contenido exacto del PDF)
+    cache_key = certificate_cache_key(
+        current_user.id,
+        course.id,
+        certificate.student_name,
+        certificate.course_title,
+        certificate.completed_at,
+        certificate.code
+    )
+    etag = f'"{cache_key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    pdf_path = certificate_cache.get(cache_key)
+    if pdf_path is None:
+        # 5. Generar PDF (en el pool de procesos) y guardarlo
+        try:
+            pdf_bytes = certificate_render_pool.render(
+                student_name=certificate.student_name,
+                course_title=certificate.course_title,
+                completion_date=certificate.completed_at,
+                verification_code=certificate.code
+            )
+        except RenderQueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Hay muchos certificados generándose. Intenta de nuevo en unos segundos.",
+                headers={"Retry-After": "5"}
+            )
+        except RenderTimeout:
+            raise HTTPException(status_code=504, detail="El certificado tardó demasiado en generarse.")
+        pdf_path = certificate_cache.put(cache_key, pdf_bytes)
+        pdf_hash = content_hash(pdf_bytes)
+    elif certificate.content_hash is None:
+        with open(pdf_path, "rb") as f:
+            pdf_hash = content_hash(f.read())
+    else:
+        pdf_hash = certificate.content_hash
+
+    # Hash del PDF entregado, para la verificación pública
+    if pdf_hash != certificate.content_hash:
+        record_content_hashes(db, {certificate.code: pdf_hash})
+        db.commit()
+
+    # 6. Retornar archivo
+    return FileResponse(
+        pdf_path,
         media_type="application/pdf",
+        filename=f"Certificado_{course.title}.pdf",
+        headers=headers
+    )
+
+
+@router.get("/course/{course_id}/export-url")
+def get_certificates_export_url(
+    course_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Enlace firmado para descargar el ZIP del curso (ver /download-url)."""
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Curso no encontrado")
+    if course.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="No tienes permiso para exportar los certificados de este curso")
+    return _signed_link(f"/certificates/course/{course_id}/export", f"certificate-export:{course_id}", current_user.id)
+
+@router.get("/course/{course_id}/export")
+def export_course_certificates(
+    course_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_signed_user("certificate-export:{course_id}"))
+):
+    """
+    Descarga en un ZIP los certificados de todos los alumnos que completaron el curso.
+    Solo para el instructor del curso o un administrador.
+    El ZIP se envía a medida que se generan los certificados.
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise HTTPException(status_code=404, detail="Curso no encontrado")
+
+    if course.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="No tienes permiso para exportar los certificados de este curso")
+
+    if course.lessons_count == 0:
+        raise HTTPException(status_code=400, detail="Este curso no tiene contenido.")
+
+    # Todos los alumnos que completaron el curso, en una sola consulta sobre los contadores
+    students = db.query(
+        User.id.label("user_id"),
+        User.full_name,
+        func.coalesce(CourseProgressSummary.last_completed_at, func.now()).label("completed_at")
+    ).join(
+        CourseProgressSummary, CourseProgressSummary.user_id == User.id
+    ).filter(
+        CourseProgressSummary.course_id == course.id,
+        CourseProgressSummary.completed_lessons >= course.lessons_count
+    ).order_by(User.full_name).all()
+
+    if not students:
+        raise HTTPException(status_code=404, detail="Ningún alumno ha completado este curso todavía")
+
+    # Emitir en bloque los certificados que falten (una sentencia para todo el grupo)
+    issued = issue_certificates(
+        db,
+        course.id,
+        [(student.user_id, student.full_name, course.title, student.completed_at) for student in students]
+    )
+    db.commit()
+    certificates = [issued[student.user_id] for student in students]
+
+    return StreamingResponse(
+        stream_course_certificates_zip(certificates),
+        media_type="application/zip",
         headers={
-            "Content-Disposition": f"attachment; filename=Certificado_{course.title}.pdf"
+            "Content-Disposition": f"attachment; filename=Certificados_{course.slug}.zip"
         }
     )
@@ -0,0 +1,15 @@
+# app/modules/certificates/schemas.py
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class CertificateVerification(BaseModel):
+    """Datos públicos de un certificado emitido"""
+    code: str
+    student_name: str
+    course_title: str
+    completed_at: datetime
+    issued_at: datetime
+    # SHA-256 del PDF: permite comprobar que el archivo recibido no fue alterado
+    content_hash: Optional[str] = None
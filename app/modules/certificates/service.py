@@ -2,26 +2,41 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+import re
+import threading
 from io import BytesIO
 from datetime import datetime
 
-def generate_certificate_pdf(student_name: str, course_title: str, completion_date: datetime) -> BytesIO:
-    """
-    Genera un certificado PDF en memoria.
-    """
-    buffer = BytesIO()
-    
-    # Configuración de página: A4 u Carta en horizontal
-    c = canvas.Canvas(buffer, pagesize=landscape(letter))
-    width, height = landscape(letter)
-
-    # --- Diseño del Certificado ---
-    
+# Subir esta versión al cambiar el diseño: invalida los certificados cacheados
+CERTIFICATE_TEMPLATE_VERSION = "3"
+
+# Configuración de página: Carta en horizontal
+PAGE_SIZE = landscape(letter)
+
+# Fuentes usadas por el certificado, en orden fijo (ver CertificateTemplate)
+TEMPLATE_FONTS = ("Helvetica", "Helvetica-Bold", "Helvetica-Oblique")
+
+
+def _new_canvas(buffer: BytesIO, page_compression=None) -> canvas.Canvas:
+    # invariant=1: mismo contenido -> mismos bytes (sin fecha de creación ni ID aleatorio),
+    # necesario para que el ETag del certificado cacheado sea estable
+    c = canvas.Canvas(buffer, pagesize=PAGE_SIZE, invariant=1, pageCompression=page_compression)
+    # Registrar las fuentes siempre en el mismo orden para que sus nombres
+    # internos (/F1, /F2...) coincidan con los de la plantilla compilada
+    for font_name in TEMPLATE_FONTS:
+        c.setFont(font_name, 12)
+    return c
+
+
+def draw_static_layout(c: canvas.Canvas) -> None:
+    """Parte fija del certificado: igual para todos los alumnos."""
+    width, height = PAGE_SIZE
+
     # Fondo / Borde
     c.setStrokeColor(colors.darkblue)
     c.setLineWidth(5)
     c.rect(0.5 * inch, 0.5 * inch, width - 1 * inch, height - 1 * inch)
-    
+
     c.setStrokeColor(colors.gold)
     c.setLineWidth(2)
     c.rect(0.6 * inch, 0.6 * inch, width - 1.2 * inch, height - 1.2 * inch)
@@ -36,15 +51,32 @@ def generate_certificate_pdf(student_name: str, course_title: str, completion_da
     c.setFillColor(colors.black)
     c.drawCentredString(width / 2, height - 3.2 * inch, "Este certificado se otorga a:")
 
+    # Texto "Por completar satisfactoriamente el curso"
+    c.setFont("Helvetica", 14)
+    c.drawCentredString(width / 2, height - 5 * inch, "Por completar satisfactoriamente el curso:")
+
+    # Firma (Simulada)
+    c.line(width / 2 - 1.5 * inch, 1.5 * inch, width / 2 + 1.5 * inch, 1.5 * inch)
+    c.setFont("Helvetica-Oblique", 10)
+    c.setFillColor(colors.gray)
+    c.drawCentredString(width / 2, 1.2 * inch, "APPRENDE LMS")
+
+
+def draw_student_fields(
+    c: canvas.Canvas,
+    student_name: str,
+    course_title: str,
+    completion_date: datetime,
+    verification_code: str
+) -> None:
+    """Parte variable del certificado: nombre, curso, fecha y código de verificación."""
+    width, height = PAGE_SIZE
+
     # Nombre del Estudiante
     c.setFont("Helvetica-Bold", 30)
     c.setFillColor(colors.black)
     c.drawCentredString(width / 2, height - 4 * inch, student_name)
 
-    # Texto "Por completar satisfactoriamente el curso"
-    c.setFont("Helvetica", 14)
-    c.drawCentredString(width / 2, height - 5 * inch, "Por completar satisfactoriamente el curso:")
-
     # Nombre del Curso
     c.setFont("Helvetica-Bold", 24)
     c.setFillColor(colors.darkblue)
@@ -56,13 +88,138 @@ def generate_certificate_pdf(student_name: str, course_title: str, completion_da
     date_str = completion_date.strftime("%d de %B de %Y")
     c.drawCentredString(width / 2, height - 7 * inch, f"Fecha: {date_str}")
 
-    # Firma (Simulada)
-    c.line(width / 2 - 1.5 * inch, 1.5 * inch, width / 2 + 1.5 * inch, 1.5 * inch)
-    c.setFont("Helvetica-Oblique", 10)
-    c.drawCentredString(width / 2, 1.2 * inch, "APPRENDE LMS")
+    # Código para verificar el certificado en /certificates/verify/{code}
+    c.setFont("Helvetica", 9)
+    c.drawRightString(width - 0.9 * inch, 0.8 * inch, f"Código de verificación: {verification_code}")
+
+
+class CertificateTemplate:
+    """
+    Página base pre-renderada: la parte fija se dibuja y se serializa a PDF una
+    sola vez, dejando una marca en el contenido de la página. Cada certificado
+    solo genera los operadores de los campos variables, los inserta en la marca
+    y corrige /Length y la tabla xref; no vuelve a pasar por ReportLab para el
+    resto del documento.
+    """
+
+    # Comentario PDF que ocupa el lugar de los campos variables en la plantilla
+    FIELDS_MARKER = b"%APPRENDE-CAMPOS"
+
+    def __init__(self):
+        buffer = BytesIO()
+        # Sin compresión: el flujo de la página tiene que quedar en claro para
+        # poder insertar los campos sin recomprimirlo
+        c = _new_canvas(buffer, page_compression=0)
+        draw_static_layout(c)
+        c._code.append(self.FIELDS_MARKER.decode("ascii"))
+        c.showPage()
+        c.save()
+        pdf = buffer.getvalue()
+
+        marker_at = pdf.index(self.FIELDS_MARKER)
+        length_match = list(re.finditer(rb"/Length (\d+)", pdf[:marker_at]))[-1]
+        xref_at = pdf.rindex(b"\nxref\n") + 1
+        startxref_at = pdf.rindex(b"startxref\n")
+
+        self._head = pdf[:length_match.start(1)]
+        self._stream_length = int(length_match.group(1))
+        self._before_fields = pdf[length_match.end(1):marker_at]
+        self._after_fields = pdf[marker_at + len(self.FIELDS_MARKER):xref_at]
+        self._xref_at = xref_at
+
+        # Tabla xref: cabecera "0 N" y un offset de 10 dígitos por objeto
+        xref_lines = pdf[xref_at:pdf.index(b"trailer", xref_at)].split(b"\n")
+        self._xref_header = b"\n".join(xref_lines[:2]) + b"\n"
+        self._xref_entries = [(int(line[:10]), line[10:]) for line in xref_lines[2:] if line]
+        self._marker_at = marker_at
+        self._trailer = pdf[pdf.index(b"trailer", xref_at):startxref_at]
+
+        self._local = threading.local()
+
+    def _fields_code(
+        self,
+        student_name: str,
+        course_title: str,
+        completion_date: datetime,
+        verification_code: str
+    ) -> bytes:
+        # Un canvas de trabajo por hilo: solo se usa para obtener los operadores
+        scratch = getattr(self._local, "canvas", None)
+        if scratch is None:
+            scratch = self._local.canvas = _new_canvas(BytesIO())
+            self._local.start = len(scratch._code)
+
+        start = self._local.start
+        draw_student_fields(scratch, student_name, course_title, completion_date, verification_code)
+        code = "\n".join(scratch._code[start:]).encode("latin-1")
+        del scratch._code[start:]
+        return code
+
+    def render(
+        self,
+        student_name: str,
+        course_title: str,
+        completion_date: datetime,
+        verification_code: str
+    ) -> BytesIO:
+        fields = self._fields_code(student_name, course_title, completion_date, verification_code)
+        delta = len(fields) - len(self.FIELDS_MARKER)
+
+        length = str(self._stream_length + delta).encode("ascii")
+        # Los objetos escritos después de la marca se desplazan; también cambia
+        # el largo del número de /Length
+        delta_after = delta + len(length) - len(str(self._stream_length))
+        xref = b"".join(
+            b"%010d%s\n" % (offset + delta_after if offset > self._marker_at else offset, rest)
+            for offset, rest in self._xref_entries
+        )
 
-    c.showPage()
-    c.save()
-    
-    buffer.seek(0)
-    return buffer
+        buffer = BytesIO()
+        buffer.write(self._head)
+        buffer.write(length)
+        buffer.write(self._before_fields)
+        buffer.write(fields)
+        buffer.write(self._after_fields)
+        buffer.write(self._xref_header)
+        buffer.write(xref)
+        buffer.write(self._trailer)
+        buffer.write(b"startxref\n%d\n%%%%EOF\n" % (self._xref_at + delta_after))
+
+        buffer.seek(0)
+        return buffer
+
+
+_template = None
+
+
+def get_certificate_template() -> CertificateTemplate:
+    # Se compila al primer uso (una vez por proceso del pool)
+    global _template
+    if _template is None:
+        _template = CertificateTemplate()
+    return _template
+
+
+def generate_certificate_pdf(
+    student_name: str,
+    course_title: str,
+    completion_date: datetime,
+    verification_code: str
+) -> BytesIO:
+    """
+    Genera un certificado PDF en memoria.
+    """
+    return get_certificate_template().render(student_name, course_title, completion_date, verification_code)
+
+
+def render_certificate_bytes(
+    student_name: str,
+    course_title: str,
+    completion_date: datetime,
+    verification_code: str
+) -> bytes:
+    """
+    Igual que generate_certificate_pdf pero devuelve bytes.
+    Es la función que se ejecuta dentro del pool de procesos (ver renderer.py).
+    """
+    return generate_certificate_pdf(student_name, course_title, completion_date, verification_code).getvalue()
@@ -0,0 +1,164 @@
+# app/modules/certificates/verification.py
+"""
+Emisión y verificación pública de certificados.
+
+Cada certificado emitido tiene un código corto que se imprime en el PDF. Quien
+lo reciba (por ejemplo, un empleador) puede consultar /certificates/verify/{code}
+sin cuenta: la respuesta sale de la caché en memoria o de una lectura por el
+índice único del código, nunca del progreso del alumno.
+"""
+import hashlib
+import secrets
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import case, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import CERTIFICATE_VERIFY_CACHE_SECONDS
+from app.modules.certificates.models import IssuedCertificate
+
+# Base32 de Crockford: sin I, L, O ni U para que el código se pueda dictar/copiar sin errores
+CODE_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# 10 caracteres = 50 bits aleatorios: una colisión es despreciable
+CODE_LENGTH = 10
+
+# Códigos consultados hace poco (los empleadores suelen verificar varias veces el mismo)
+verification_cache = TTLCache(ttl_seconds=CERTIFICATE_VERIFY_CACHE_SECONDS)
+
+
+def new_verification_code() -> str:
+    raw = "".join(secrets.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+    return f"{raw[:5]}-{raw[5:]}"
+
+
+def normalize_verification_code(code: str) -> str:
+    """Acepta el código en minúsculas, sin guion o con las letras que se confunden con números."""
+    raw = code.strip().upper().replace("-", "").replace(" ", "")
+    raw = raw.translate(str.maketrans("ILO", "110"))
+    if len(raw) != CODE_LENGTH:
+        return raw
+    return f"{raw[:5]}-{raw[5:]}"
+
+
+def content_hash(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def issue_certificates(db: Session, course_id: UUID, students) -> dict:
+    """
+    Emite (o actualiza) los certificados de un curso en bloque.
+    `students` son tuplas (user_id, student_name, course_title, completed_at).
+    Si cambió el nombre del alumno o el título del curso se conserva el código y
+    se borra el hash del PDF anterior. La fecha de finalización queda fija
+    desde la primera emisión: desmarcar y volver a marcar una lección no
+    cambia la fecha de un certificado ya emitido. Devuelve {user_id: fila del
+    certificado}. No hace commit.
+    """
+    if not students:
+        return {}
+
+    rows = [
+        {
+            "code": new_verification_code(),
+            "user_id": user_id,
+            "course_id": course_id,
+            "student_name": student_name,
+            "course_title": course_title,
+            "completed_at": completed_at,
+        }
+        for user_id, student_name, course_title, completed_at in students
+    ]
+
+    stmt = pg_insert(IssuedCertificate).values(rows)
+    changed = or_(
+        IssuedCertificate.student_name != stmt.excluded.student_name,
+        IssuedCertificate.course_title != stmt.excluded.course_title,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="unique_issued_certificate",
+        # completed_at no se toca: es la fecha con la que se emitió
+        set_={
+            "student_name": stmt.excluded.student_name,
+            "course_title": stmt.excluded.course_title,
+            "content_hash": None,
+        },
+        # Solo se reescriben las filas cuyos datos cambiaron
+        where=changed
+    ).returning(IssuedCertificate.code)
+
+    for (code,) in db.execute(stmt):
+        verification_cache.delete(code)
+
+    # Filas simples (no objetos ORM): siguen siendo válidas después del commit
+    user_ids = [row["user_id"] for row in rows]
+    return {
+        certificate.user_id: certificate
+        for certificate in db.query(
+            IssuedCertificate.user_id,
+            IssuedCertificate.course_id,
+            IssuedCertificate.code,
+            IssuedCertificate.student_name,
+            IssuedCertificate.course_title,
+            IssuedCertificate.completed_at,
+            IssuedCertificate.content_hash,
+        ).filter(
+            IssuedCertificate.course_id == course_id,
+            IssuedCertificate.user_id.in_(user_ids)
+        )
+    }
+
+
+def issue_certificate(
+    db: Session,
+    user_id: UUID,
+    course_id: UUID,
+    student_name: str,
+    course_title: str,
+    completed_at: datetime
+):
+    """Emite el certificado de un alumno (ver issue_certificates). No hace commit."""
+    issued = issue_certificates(db, course_id, [(user_id, student_name, course_title, completed_at)])
+    return issued[user_id]
+
+
+def record_content_hashes(db: Session, hashes: dict) -> None:
+    """Guarda el hash de los PDFs generados ({code: hash}). No hace commit."""
+    if not hashes:
+        return
+    db.query(IssuedCertificate).filter(
+        IssuedCertificate.code.in_(list(hashes))
+    ).update(
+        {IssuedCertificate.content_hash: case(hashes, value=IssuedCertificate.code)},
+        synchronize_session=False
+    )
+    for code in hashes:
+        verification_cache.delete(code)
+
+
+def get_verification(db: Session, code: str):
+    """Datos públicos del certificado con ese código, o None si no existe."""
+    code = normalize_verification_code(code)
+    cached = verification_cache.get(code)
+    if cached is not None:
+        return cached
+
+    certificate = db.query(
+        IssuedCertificate.code,
+        IssuedCertificate.student_name,
+        IssuedCertificate.course_title,
+        IssuedCertificate.completed_at,
+        IssuedCertificate.issued_at,
+        IssuedCertificate.content_hash,
+    ).filter(IssuedCertificate.code == code).first()
+
+    if certificate is None:
+        return None
+
+    data = dict(certificate._mapping)
+    # Sin hash todavía (PDF aún no generado) no se cachea, así aparece en cuanto exista
+    if data["content_hash"] is not None:
+        verification_cache.set(code, data)
+    return data
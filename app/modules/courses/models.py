@@ -1,10 +1,11 @@
 # app/modules/courses/models.py
-from sqlalchemy import Column, String, Text, DECIMAL, Integer, ForeignKey, DateTime, Enum, text, Boolean
+from sqlalchemy import Column, String, Text, DECIMAL, Integer, ForeignKey, DateTime, Enum, text, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
+from app.modules.media.urls import media_url_name
 import enum
-import uuid
 
 
 class CourseStatus(str, enum.Enum):
@@ -18,7 +19,12 @@ class CourseStatus(str, enum.Enum):
 class Course(Base):
     __tablename__ = "courses"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    __table_args__ = (
+        # Cursos de un instructor (mis cursos, página pública del instructor)
+        Index('ix_courses_user_status', 'user_id', 'status'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
@@ -41,6 +47,10 @@ class Course(Base):
     promotional_video_url = Column(String(500), nullable=True)
     
     status = Column(Enum(CourseStatus), default=CourseStatus.DRAFT)
+
+    # Contador de lecciones (lo mantiene app.modules.progress.service al crear/borrar lecciones)
+    lessons_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
     created_at = Column(DateTime, server_default=text("NOW()"))
     updated_at = Column(DateTime, server_default=text("NOW()"), onupdate=text("NOW()"))
     
@@ -48,6 +58,7 @@ class Course(Base):
     sections = relationship("Section", back_populates="course", order_by="Section.order_index", cascade="all, delete-orphan")
     category = relationship("Category", back_populates="courses")
     reviews = relationship("Review", back_populates="course", cascade="all, delete-orphan")
+    rating_summary = relationship("CourseRatingSummary", uselist=False, cascade="all, delete-orphan")
     objectives = relationship("CourseObjective", back_populates="course", cascade="all, delete-orphan")
     requirements = relationship("CourseRequirement", back_populates="course", cascade="all, delete-orphan")
 
@@ -99,7 +110,7 @@ class LessonType(str, enum.Enum):
 class Lesson(Base):
     __tablename__ = "lessons"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
     section_id = Column(UUID(as_uuid=True), ForeignKey("sections.id", ondelete="CASCADE"))
     title = Column(String(150))
     
@@ -118,4 +129,10 @@ class Lesson(Base):
     is_free_preview = Column(Boolean, default=False)
     order_index = Column(Integer, default=0)
 
-    section = relationship("Section", back_populates="lessons")
\ No newline at end of file
+    section = relationship("Section", back_populates="lessons")
+
+
+# Búsqueda de lecciones y cursos por archivo subido (ver app.modules.media.urls)
+Index('ix_lessons_video_media_name', media_url_name(Lesson.video_resource_id))
+Index('ix_courses_thumbnail_media_name', media_url_name(Course.thumbnail_url))
+Index('ix_courses_promo_media_name', media_url_name(Course.promotional_video_url))
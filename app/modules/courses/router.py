@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, contains_eager
 # 👇 AQUÍ ESTABAN LOS ERRORES, YA CORREGIDOS:
 from app.core.database import get_db  
 from app.modules.users.models import User 
@@ -7,9 +7,16 @@ from app.modules.users.models import User
 from app.modules.courses.models import Course, Section, Lesson 
 from app.modules.courses.schemas import CourseCreate, CourseResponse, CourseDetailResponse
 from app.modules.courses.schemas import SectionCreate, SectionResponse, LessonCreate, LessonResponse
+from app.modules.courses.schemas import CourseReorderRequest, LessonPlayResponse
 from app.modules.auth.dependencies import get_current_user
 from app.modules.enrollments.models import Enrollment
-from typing import List 
+from app.modules.progress import service as progress_service
+from app.modules.progress.positions import get_last_position, grant_position_updates
+from app.modules.media.blobs import media_duration_seconds, stored_name_from_url, get_media_metadata, uploaded_by
+from app.modules.media.access import signed_media_url, require_media_access
+from app.modules.reviews.models import CourseRatingSummary
+from app.modules.categories.service import invalidate_category_tree
+from typing import List, Literal, Optional
 import uuid
 import re 
 
@@ -36,21 +43,40 @@ def create_course(
         description=course.description,
         level=course.level,
         thumbnail_url=course.thumbnail_url,
-        user_id=current_user.id
+        category_id=course.category_id,
+        user_id=current_user.id,
+        # Calificación agregada en cero desde el inicio (ver reviews/ratings.py)
+        rating_summary=CourseRatingSummary()
     )
     
     db.add(new_course)
     db.commit()
     db.refresh(new_course)
+    if new_course.category_id is not None:
+        # Cantidad de cursos por categoría (ver categories/service.py)
+        invalidate_category_tree()
     return new_course
 
 @router.get("/", response_model=List[CourseResponse])
 def read_courses(
     skip: int = 0, 
     limit: int = 10, 
+    sort: Optional[Literal["top_rated"]] = None,
     db: Session = Depends(get_db)
 ):
-    courses = db.query(Course).offset(skip).limit(limit).all()
+    """
+    Catálogo. `sort=top_rated`: mejor promedio primero (desempata la cantidad
+    de reseñas), recorriendo el índice de course_rating_summaries.
+    """
+    if sort == "top_rated":
+        query = db.query(Course).join(Course.rating_summary).options(contains_eager(Course.rating_summary)).order_by(
+            CourseRatingSummary.average_rating.desc(),
+            CourseRatingSummary.reviews_count.desc(),
+            CourseRatingSummary.course_id.desc()
+        )
+    else:
+        query = db.query(Course).options(joinedload(Course.rating_summary))
+    courses = query.offset(skip).limit(limit).all()
     return courses
 
 @router.get("/my-courses", response_model=List[CourseResponse])
@@ -64,7 +90,7 @@ def read_my_courses(
     if current_user.role != "INSTRUCTOR":
         raise HTTPException(status_code=403, detail="Solo los instructores pueden ver sus cursos creados")
 
-    courses = db.query(Course).filter(Course.user_id == current_user.id).all()
+    courses = db.query(Course).options(joinedload(Course.rating_summary)).filter(Course.user_id == current_user.id).all()
     return courses
 
 @router.post("/{course_id}/sections", response_model=SectionResponse)
@@ -102,13 +128,32 @@ def add_lesson(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user) 
 ):
-    # Aquí deberías verificar permisos también, pero para MVP lo dejamos pasar
+    result = db.query(Section, Course.user_id).join(
+        Course, Section.course_id == Course.id
+    ).filter(Section.id == section_id).first()
+    if not result:
+        raise HTTPException(status_code=404, detail="Sección no encontrada")
+
+    # Solo el dueño del curso (o un admin) agrega lecciones: una lección da
+    # acceso a su archivo a los alumnos del curso (ver media/access.py)
+    section, course_owner_id = result
+    if course_owner_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="No tienes permiso para editar este curso")
+
+    # Y el archivo tiene que ser suyo: si no, bastaría con copiar la URL de
+    # la lección de otro curso para obtener enlaces firmados a su video
+    stored_name = stored_name_from_url(lesson.video_resource_id)
+    if stored_name and current_user.role != "ADMIN" and not uploaded_by(db, stored_name, current_user.id):
+        raise HTTPException(status_code=403, detail="Solo puedes usar archivos que subiste tú")
+
     last_lesson = db.query(Lesson).filter(Lesson.section_id == section_id).order_by(Lesson.order_index.desc()).first()
     new_order_index = (last_lesson.order_index + 1) if last_lesson else 0
     
     new_lesson = Lesson(
         title=lesson.title,
         video_resource_id=lesson.video_resource_id,
+        # Duración leída al subir el video (media_files), sin abrir el archivo
+        duration_seconds=media_duration_seconds(db, lesson.video_resource_id) or 0,
         lesson_type=lesson.lesson_type, 
         is_free_preview=lesson.is_free_preview,
         section_id=section_id,
@@ -117,20 +162,57 @@ def add_lesson(
     )
     
     db.add(new_lesson)
+    progress_service.register_lesson_added(db, section.course_id)
     db.commit()
     db.refresh(new_lesson)
     return new_lesson
 
+@router.delete("/lessons/{lesson_id}", status_code=204)
+def delete_lesson(
+    lesson_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Elimina una lección junto con el progreso de los alumnos en ella.
+    """
+    result = db.query(Lesson, Course).join(Section, Lesson.section_id == Section.id).join(
+        Course, Section.course_id == Course.id
+    ).filter(Lesson.id == lesson_id).first()
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Lección no encontrada")
+
+    lesson, course = result
+    if course.user_id != current_user.id and current_user.role != "ADMIN":
+        raise HTTPException(status_code=403, detail="No tienes permiso para editar este curso")
+
+    progress_service.register_lesson_removed(db, lesson.id, course.id)
+    db.delete(lesson)
+    db.commit()
+    progress_service.invalidate_progress_summary()
+
 @router.get("/{course_id}", response_model=CourseDetailResponse)
 def read_course_detail(course_id: str, db: Session = Depends(get_db)):
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course = db.query(Course).options(joinedload(Course.rating_summary)).filter(Course.id == course_id).first()
     
     if not course:
         raise HTTPException(status_code=404, detail="Curso no encontrado")
-        
-    return course
 
-@router.get("/{course_id}/lessons/{lesson_id}/play")
+    detail = CourseDetailResponse.model_validate(course)
+    # El detalle es público: solo las vistas previas llevan la URL del video,
+    # el resto se reproduce con /play tras comprobar la inscripción
+    for section in detail.sections:
+        for lesson in section.lessons:
+            if not lesson.is_free_preview:
+                lesson.video_resource_id = None
+    # Duración total a partir de las lecciones (duration_seconds se llena al crearlas)
+    detail.total_duration_seconds = sum(
+        lesson.duration_seconds or 0 for section in detail.sections for lesson in section.lessons
+    )
+    return detail
+
+@router.get("/{course_id}/lessons/{lesson_id}/play", response_model=LessonPlayResponse)
 def play_lesson(
     course_id: str,
     lesson_id: str,
@@ -145,25 +227,48 @@ def play_lesson(
     if not enrollment:
         raise HTTPException(status_code=403, detail="No has comprado este curso")
 
-    lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
+    # La lección tiene que ser de este curso: la URL firmada autoriza sin volver a comprobarlo
+    lesson = db.query(Lesson).join(Section, Lesson.section_id == Section.id).filter(
+        Lesson.id == lesson_id,
+        Section.course_id == course_id
+    ).first()
     if not lesson:
         raise HTTPException(status_code=404, detail="Lección no encontrada")
 
+    # Los heartbeats de posición de esta lección ya no necesitan volver a comprobar la inscripción
+    grant_position_updates(current_user.id, lesson.id, enrollment.course_id, lesson.duration_seconds)
+
     video_url = lesson.video_resource_id
-    
-    # Si es video y está guardado localmente (empieza con /media/), usar endpoint de streaming
-    if lesson.lesson_type == "video" and video_url and video_url.startswith("/media/"):
-        filename = video_url.replace("/media/", "")
-        video_url = f"http://localhost:8000/files/stream/{filename}"
+    url_expires_in_seconds = None
+
+    # Si el recurso se subió a la plataforma (/media/...), URL firmada para este
+    # alumno: streaming de la API en local, URL prefirmada del bucket en S3
+    stored_name = stored_name_from_url(video_url)
+    if stored_name:
+        # La inscripción en este curso no basta si el archivo es contenido pagado de otro
+        require_media_access(db, current_user, stored_name)
+        metadata = get_media_metadata(db, stored_name)
+        video_url, url_expires_in_seconds = signed_media_url(
+            stored_name, current_user.id, media_type=metadata["mime_type"] if metadata else None
+        )
+
+    return LessonPlayResponse(
+        lesson_id=lesson.id,
+        lesson_type=lesson.lesson_type,
+        video_url=video_url,
+        duration_seconds=lesson.duration_seconds or 0,
+        last_position_seconds=get_last_position(db, current_user.id, lesson.id),
+        url_expires_in_seconds=url_expires_in_seconds
+    )
 
 @router.put("/{course_id}/reorder")
 def reorder_course_content(
-    course_id: UUID,
-    reorder_data: schemas.CourseReorderRequest,
+    course_id: uuid.UUID,
+    reorder_data: CourseReorderRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    course = db.query(models.Course).filter(models.Course.id == course_id).first()
+    course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
         
@@ -173,18 +278,21 @@ def reorder_course_content(
 
     # Actualizar orden
     for section_data in reorder_data.sections:
-        section = db.query(models.Section).filter(
-            models.Section.id == section_data.id, 
-            models.Section.course_id == course_id
+        section = db.query(Section).filter(
+            Section.id == section_data.id, 
+            Section.course_id == course_id
         ).first()
         
         if section:
             section.order_index = section_data.order_index
             
             for lesson_data in section_data.lessons:
-                lesson = db.query(models.Lesson).filter(models.Lesson.id == lesson_data.id).first()
-                # Verificar que la lección pertenece a la sección (o permitir moverla)
-                # Al moverla, actualizamos su section_id
+                # Solo lecciones de este curso (se pueden mover entre sus secciones);
+                # las de otros cursos se ignoran, igual que las secciones ajenas
+                lesson = db.query(Lesson).join(Section, Lesson.section_id == Section.id).filter(
+                    Lesson.id == lesson_data.id,
+                    Section.course_id == course_id
+                ).first()
                 if lesson:
                     lesson.section_id = section.id
                     lesson.order_index = lesson_data.order_index
@@ -3,6 +3,7 @@ from pydantic import BaseModel, ConfigDict
 from typing import Optional, List 
 from datetime import datetime
 from uuid import UUID
+from app.modules.reviews.schemas import RatingSummary
 
 # 1. Esquemas de LECCIONES
 class LessonCreate(BaseModel):
@@ -14,12 +15,23 @@ class LessonCreate(BaseModel):
 class LessonResponse(BaseModel):
     id: UUID
     title: str
-    video_resource_id: str
+    video_resource_id: Optional[str] = None  # Solo en vistas previas dentro del detalle del curso
     lesson_type: str 
     is_free_preview: bool
+    duration_seconds: Optional[int] = 0
     
     model_config = ConfigDict(from_attributes=True)
 
+class LessonPlayResponse(BaseModel):
+    lesson_id: UUID
+    lesson_type: str
+    video_url: Optional[str] = None
+    duration_seconds: int = 0
+    # Posición donde el alumno dejó el video (para reanudar)
+    last_position_seconds: int = 0
+    # Vigencia de la URL firmada de los archivos subidos (pedir otra al vencer)
+    url_expires_in_seconds: Optional[int] = None
+
 # 2. Esquemas de SECCIONES
 class SectionCreate(BaseModel):
     title: str
@@ -53,12 +65,14 @@ class CourseResponse(BaseModel):
     level: Optional[str] = None
     status: Optional[str] = "DRAFT" 
     updated_at: Optional[datetime] = None
+    rating_summary: Optional[RatingSummary] = None
     
     model_config = ConfigDict(from_attributes=True)
 
 # 4. Esquema DETALLADO
 class CourseDetailResponse(CourseResponse):
     sections: List[SectionResponse] = []
+    total_duration_seconds: int = 0
 
 # 5. Esquemas de REORDER
 class LessonReorder(BaseModel):
@@ -1,13 +1,22 @@
 # app/modules/enrollments/models.py
-from sqlalchemy import Column, ForeignKey, DECIMAL, String, DateTime, text
+from sqlalchemy import Column, ForeignKey, DECIMAL, String, DateTime, text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+
+    __table_args__ = (
+        # Inscripciones de un alumno (¿ya compró este curso?, ¿ya era alumno del instructor?)
+        Index('ix_enrollments_user_course', 'user_id', 'course_id'),
+        # Recálculo de las ventas diarias por rango de fechas (ver analytics/service.py)
+        Index('ix_enrollments_purchased_at', 'purchased_at'),
+    )
+
     # ... (tus columnas id, user_id, course_id, amount_paid...) ...
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
     amount_paid = Column(DECIMAL(10, 2), nullable=False)
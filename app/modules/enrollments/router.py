@@ -7,6 +7,9 @@ from app.modules.users.models import User
 from app.modules.courses.models import Course
 from app.modules.enrollments.models import Enrollment
 from app.modules.enrollments.schemas import EnrollmentCreate, EnrollmentResponse
+from app.modules.progress.service import invalidate_progress_summary
+from app.modules.instructors import service as instructor_service
+from app.modules.analytics import service as analytics_service
 from typing import List # <--- Importar List
 
 router = APIRouter(prefix="/enrollments", tags=["Inscripciones (Ventas)"])
@@ -43,8 +46,13 @@ def enroll_course(
     )
     
     db.add(new_enrollment)
+    db.flush()  # completa los valores por defecto (moneda, fecha de compra)
+    # Contador de alumnos del instructor y ventas del día, en la misma transacción
+    instructor_service.register_enrollment(db, course.user_id, current_user.id, course.id)
+    analytics_service.register_sale(db, course.id, new_enrollment.amount_paid, new_enrollment.currency)
     db.commit()
     db.refresh(new_enrollment)
+    invalidate_progress_summary(current_user.id)
     
     return new_enrollment
 
@@ -1,5 +1,5 @@
 # app/modules/instructors/models.py
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,8 +16,9 @@ class InstructorProfile(Base):
     headline = Column(String(200))  # Ej: "Ingeniero Civil | Especialista en AutoCAD"
     biography = Column(Text)  # Biografía completa (puede tener HTML)
     social_links = Column(JSONB, default={})  # {"youtube": "...", "linkedin": "..."}
-    total_students = Column(Integer, default=0)
-    total_reviews = Column(Integer, default=0)
+    # Contadores (los mantiene app.modules.instructors.service al inscribir y al reseñar)
+    total_students = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    total_reviews = Column(Integer, nullable=False, default=0, server_default=text("0"))
     verified_at = Column(DateTime, nullable=True)  # Fecha de verificación por admin
 
     # Relación con User
@@ -1,11 +1,13 @@
 # app/modules/instructors/router.py
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from uuid import UUID
 
 from app.core.database import get_db
 from app.modules.auth.dependencies import get_current_user
 from app.modules.users.models import User, UserRole
 from app.modules.instructors.models import InstructorProfile
+from app.modules.instructors import service as instructor_service
 from app.modules.instructors.schemas import (
     InstructorProfileResponse,
     InstructorProfileUpdate,
@@ -71,37 +73,27 @@ def update_my_instructor_profile(
     
     db.commit()
     db.refresh(profile)
+    instructor_service.invalidate_instructor_page(current_user.id)
     return profile
 
 
 @router.get("/{user_id}", response_model=InstructorPublicProfile)
 def get_instructor_public_profile(
-    user_id: str,
+    user_id: UUID,
     db: Session = Depends(get_db)
 ):
-    """Obtiene el perfil público de un instructor (visible para todos)."""
-    user = db.query(User).filter(User.id == user_id).first()
-    
-    if not user or user.role != 'INSTRUCTOR':
+    """
+    Perfil público de un instructor (visible para todos): datos del perfil,
+    cursos publicados con su calificación y totales. Una consulta, cacheada
+    por instructor.
+    """
+    page = instructor_service.get_instructor_page(db, user_id)
+    if page is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Instructor no encontrado"
         )
-    
-    profile = db.query(InstructorProfile).filter(
-        InstructorProfile.user_id == user_id
-    ).first()
-    
-    # Combinar datos de User + InstructorProfile
-    return InstructorPublicProfile(
-        user_id=user.id,
-        full_name=user.full_name,
-        headline=profile.headline if profile else None,
-        biography=profile.biography if profile else None,
-        social_links=profile.social_links if profile else {},
-        total_students=profile.total_students if profile else 0,
-        total_reviews=profile.total_reviews if profile else 0
-    )
+    return page
 
 
 @router.post("/become-instructor", status_code=status.HTTP_200_OK)
@@ -133,5 +125,6 @@ def become_instructor(
     db.add(profile)
     
     db.commit()
+    instructor_service.invalidate_instructor_page(current_user.id)
     
     return {"message": "¡Felicidades! Ahora eres instructor 🎓", "new_role": "INSTRUCTOR"}
@@ -1,8 +1,9 @@
 # app/modules/instructors/schemas.py
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 from uuid import UUID
+from app.modules.reviews.schemas import RatingSummary
 
 
 class InstructorProfileBase(BaseModel):
@@ -29,8 +30,19 @@ class InstructorProfileResponse(InstructorProfileBase):
         from_attributes = True
 
 
+class InstructorCourse(BaseModel):
+    """Curso publicado, tal como aparece en la página del instructor"""
+    id: UUID
+    title: str
+    slug: str
+    thumbnail_url: Optional[str] = None
+    price: float
+    level: Optional[str] = None
+    rating_summary: RatingSummary
+
+
 class InstructorPublicProfile(BaseModel):
-    """Perfil público visible para estudiantes"""
+    """Perfil público visible para estudiantes, con sus cursos publicados"""
     user_id: UUID
     full_name: str
     headline: Optional[str] = None
@@ -38,6 +50,10 @@ class InstructorPublicProfile(BaseModel):
     social_links: Optional[Dict[str, str]] = {}
     total_students: int = 0
     total_reviews: int = 0
+    total_courses: int = 0
+    # Promedio de todas las reseñas de sus cursos publicados
+    average_rating: float = 0
+    courses: List[InstructorCourse] = []
 
     class Config:
         from_attributes = True
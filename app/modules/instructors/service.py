@@ -0,0 +1,198 @@
+# app/modules/instructors/service.py
+"""
+Perfil público del instructor.
+
+Contadores mantenidos de forma incremental:
+
+- `InstructorProfile.total_students`: alumnos distintos inscritos en alguno de sus cursos.
+- `InstructorProfile.total_reviews`: reseñas recibidas en todos sus cursos.
+
+Cada función hace un UPDATE atómico (x = x + 1) en la sesión del endpoint
+que la llama; el commit lo hace el endpoint, así el contador se guarda junto
+con la inscripción o la reseña. Los desvíos (carreras, datos cargados a mano)
+los corrige `reconcile_instructor_counters`.
+
+La página pública (perfil, cursos publicados y totales) sale de una sola
+consulta y se guarda en memoria por instructor; se invalida al editar el
+perfil o los cursos del instructor.
+"""
+from uuid import UUID
+
+from sqlalchemy import select, update, func, exists, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.core.cache import TTLCache
+from app.core.config import INSTRUCTOR_PAGE_CACHE_SECONDS
+from app.modules.users.models import User
+from app.modules.courses.models import Course, CourseStatus
+from app.modules.enrollments.models import Enrollment
+from app.modules.reviews.models import Review, CourseRatingSummary
+from app.modules.reviews.schemas import RatingSummary
+from app.modules.instructors.models import InstructorProfile
+from app.modules.instructors.schemas import InstructorPublicProfile, InstructorCourse
+
+# Página pública por instructor: {user_id: InstructorPublicProfile}
+instructor_page_cache = TTLCache(ttl_seconds=INSTRUCTOR_PAGE_CACHE_SECONDS)
+
+
+def register_enrollment(db: Session, instructor_id: UUID, student_id: UUID, course_id: UUID) -> None:
+    """Suma 1 alumno si es su primera inscripción en un curso del instructor."""
+    other_course_of_instructor = exists().where(
+        Enrollment.user_id == student_id,
+        Enrollment.course_id != course_id,
+        Course.id == Enrollment.course_id,
+        Course.user_id == instructor_id
+    )
+    db.execute(
+        update(InstructorProfile)
+        .where(InstructorProfile.user_id == instructor_id, ~other_course_of_instructor)
+        .values(total_students=InstructorProfile.total_students + 1)
+    )
+
+
+def register_review(db: Session, instructor_id: UUID) -> None:
+    """Suma 1 reseña recibida."""
+    db.query(InstructorProfile).filter(InstructorProfile.user_id == instructor_id).update(
+        {InstructorProfile.total_reviews: InstructorProfile.total_reviews + 1},
+        synchronize_session=False
+    )
+
+
+def get_instructor_page(db: Session, instructor_id: UUID):
+    """Perfil público con sus cursos publicados (una consulta, o ninguna si está en caché); None si no es instructor."""
+    page = instructor_page_cache.get(instructor_id)
+    if page is None:
+        page = _load_instructor_page(db, instructor_id)
+        if page is not None:
+            instructor_page_cache.set(instructor_id, page)
+    return page
+
+
+def invalidate_instructor_page(instructor_id: UUID) -> None:
+    """Llamar después del commit al cambiar el perfil o un curso del instructor."""
+    instructor_page_cache.delete(instructor_id)
+
+
+def _load_instructor_page(db: Session, instructor_id: UUID):
+    # Una fila por curso publicado (o una sola, sin curso, si no tiene ninguno)
+    rows = db.query(
+        User.id.label("user_id"),
+        User.full_name,
+        InstructorProfile.headline,
+        InstructorProfile.biography,
+        InstructorProfile.social_links,
+        InstructorProfile.total_students,
+        InstructorProfile.total_reviews,
+        Course.id.label("course_id"),
+        Course.title,
+        Course.slug,
+        Course.thumbnail_url,
+        Course.price,
+        Course.level,
+        CourseRatingSummary.reviews_count,
+        CourseRatingSummary.rating_sum,
+        CourseRatingSummary.average_rating,
+        CourseRatingSummary.stars_1,
+        CourseRatingSummary.stars_2,
+        CourseRatingSummary.stars_3,
+        CourseRatingSummary.stars_4,
+        CourseRatingSummary.stars_5,
+    ).select_from(User).outerjoin(
+        InstructorProfile, InstructorProfile.user_id == User.id
+    ).outerjoin(
+        Course, (Course.user_id == User.id) & (Course.status == CourseStatus.PUBLISHED)
+    ).outerjoin(
+        CourseRatingSummary, CourseRatingSummary.course_id == Course.id
+    ).filter(
+        User.id == instructor_id,
+        User.role == "INSTRUCTOR"
+    ).order_by(Course.created_at.desc()).all()
+
+    if not rows:
+        return None
+
+    first = rows[0]
+    courses = []
+    reviews_count = rating_sum = 0
+    for row in rows:
+        if row.course_id is None:
+            continue
+        courses.append(InstructorCourse(
+            id=row.course_id,
+            title=row.title,
+            slug=row.slug,
+            thumbnail_url=row.thumbnail_url,
+            price=row.price or 0,
+            level=row.level,
+            rating_summary=RatingSummary(
+                average_rating=row.average_rating or 0,
+                reviews_count=row.reviews_count or 0,
+                histogram={stars: getattr(row, f"stars_{stars}") or 0 for stars in range(1, 6)}
+            )
+        ))
+        reviews_count += row.reviews_count or 0
+        rating_sum += row.rating_sum or 0
+
+    return InstructorPublicProfile(
+        user_id=first.user_id,
+        full_name=first.full_name,
+        headline=first.headline,
+        biography=first.biography,
+        social_links=first.social_links or {},
+        total_students=first.total_students or 0,
+        total_reviews=first.total_reviews or 0,
+        total_courses=len(courses),
+        average_rating=round(rating_sum / reviews_count, 2) if reviews_count else 0,
+        courses=courses
+    )
+
+
+def reconcile_instructor_counters(db: Session, instructor_id: UUID = None) -> dict:
+    """
+    Recalcula los contadores desde enrollments y reviews y corrige solo los
+    perfiles que se hayan desviado. Pensado para correr periódicamente (ver tasks.py).
+    """
+    students = (
+        select(Course.user_id.label("instructor_id"), func.count(func.distinct(Enrollment.user_id)).label("total"))
+        .select_from(Enrollment)
+        .join(Course, Course.id == Enrollment.course_id)
+        .group_by(Course.user_id)
+    )
+    reviews = (
+        select(Course.user_id.label("instructor_id"), func.count(Review.id).label("total"))
+        .select_from(Review)
+        .join(Course, Course.id == Review.course_id)
+        .group_by(Course.user_id)
+    )
+    if instructor_id is not None:
+        students = students.where(Course.user_id == instructor_id)
+        reviews = reviews.where(Course.user_id == instructor_id)
+    students = students.subquery()
+    reviews = reviews.subquery()
+
+    # Valor correcto de cada perfil (0 si no tiene alumnos o reseñas)
+    profile = aliased(InstructorProfile)
+    actual = (
+        select(
+            profile.user_id,
+            func.coalesce(students.c.total, 0).label("total_students"),
+            func.coalesce(reviews.c.total, 0).label("total_reviews")
+        )
+        .outerjoin(students, students.c.instructor_id == profile.user_id)
+        .outerjoin(reviews, reviews.c.instructor_id == profile.user_id)
+    )
+    if instructor_id is not None:
+        actual = actual.where(profile.user_id == instructor_id)
+    actual = actual.subquery()
+
+    stmt = update(InstructorProfile).where(
+        InstructorProfile.user_id == actual.c.user_id,
+        or_(
+            InstructorProfile.total_students.is_distinct_from(actual.c.total_students),
+            InstructorProfile.total_reviews.is_distinct_from(actual.c.total_reviews)
+        )
+    ).values(total_students=actual.c.total_students, total_reviews=actual.c.total_reviews)
+
+    profiles_fixed = db.execute(stmt).rowcount
+    db.commit()
+    return {"profiles_fixed": profiles_fixed}
@@ -0,0 +1,37 @@
+# app/modules/instructors/tasks.py
+"""
+Tareas de mantenimiento de los perfiles de instructor.
+
+Uso:
+    python -m app.modules.instructors.tasks reconcile [--instructor-id UUID]
+"""
+import argparse
+from uuid import UUID
+
+from app.core.database import SessionLocal
+# Modelos relacionados con Course/User: necesarios para configurar los mappers fuera de la API
+from app.modules.users.models import User  # noqa: F401
+from app.modules.categories.models import Category  # noqa: F401
+from app.modules.instructors.service import reconcile_instructor_counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de contadores de instructores")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subparsers.add_parser("reconcile", help="Corrige desvíos en total_students y total_reviews")
+    reconcile.add_argument("--instructor-id", type=UUID, default=None)
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "reconcile":
+            result = reconcile_instructor_counters(db, instructor_id=args.instructor_id)
+            print(f"Perfiles corregidos: {result['profiles_fixed']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# app/modules/media/access.py
+"""
+Quién puede descargar cada archivo subido.
+
+Un archivo es protegido si es el recurso de alguna lección que no es vista
+previa gratuita. Lo descargan solo los alumnos inscritos en un curso con una
+de esas lecciones, su instructor o un administrador: que el mismo archivo
+sea además vista previa en otra lección (u otro curso) no lo abre a todos.
+Los archivos sin lecciones (miniaturas, videos promocionales, iconos) o cuyas
+lecciones son todas vista previa son públicos.
+
+Los accesos permitidos se guardan unos segundos por (usuario, archivo): un
+reproductor pide decenas de rangos del mismo video y no tiene sentido repetir
+la consulta. Los rechazos no se guardan, así quien acaba de inscribirse no
+espera a que venza la caché.
+
+El reproductor recibe una URL firmada (ver `signed_media_url`): play_lesson ya
+comprobó la inscripción al emitirla, así que cada petición de rango se
+autoriza verificando la firma, sin base de datos.
+"""
+from urllib.parse import urlencode
+
+from fastapi import HTTPException
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import MEDIA_ACCESS_CACHE_SECONDS, MEDIA_PRESIGNED_URL_SECONDS
+from app.core.security import sign_resource, verify_resource_signature, SIGNED_URL_EXPIRE_SECONDS
+from app.modules.courses.models import Course, Section, Lesson
+from app.modules.enrollments.models import Enrollment
+from app.modules.media.storage import get_storage
+from app.modules.media.urls import media_url_name
+
+# {(user_id | None, stored_name): True}
+media_access = TTLCache(ttl_seconds=MEDIA_ACCESS_CACHE_SECONDS)
+
+
+def can_access_media(db: Session, user, stored_name: str) -> bool:
+    """True si `user` (o un anónimo, con None) puede descargar el archivo."""
+    if user is not None and user.role == "ADMIN":
+        return True
+
+    user_id = user.id if user is not None else None
+    key = (user_id, stored_name)
+    if media_access.get(key):
+        return True
+
+    # Una fila por lección que usa el archivo, con la inscripción del usuario si existe
+    rows = db.query(
+        Lesson.is_free_preview,
+        Course.user_id,
+        Enrollment.id,
+    ).join(Section, Lesson.section_id == Section.id).join(
+        Course, Section.course_id == Course.id
+    ).outerjoin(
+        Enrollment,
+        and_(Enrollment.course_id == Course.id, Enrollment.user_id == user_id)
+    ).filter(
+        media_url_name(Lesson.video_resource_id) == stored_name
+    ).all()
+
+    # Solo dan acceso los cursos donde el archivo es contenido pagado
+    protected = [
+        (instructor_id, enrollment_id)
+        for is_free_preview, instructor_id, enrollment_id in rows
+        if not is_free_preview
+    ]
+    allowed = not protected or any(
+        (user_id is not None and instructor_id == user_id) or enrollment_id is not None
+        for instructor_id, enrollment_id in protected
+    )
+    if allowed:
+        media_access.set(key, True)
+    return allowed
+
+
+def require_media_access(db: Session, user, stored_name: str) -> None:
+    """401 si hace falta iniciar sesión, 403 si el usuario no tiene acceso."""
+    if can_access_media(db, user, stored_name):
+        return
+    if user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Inicia sesión para ver este contenido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    raise HTTPException(status_code=403, detail="No has comprado este curso")
+
+
+def media_resource(stored_name: str) -> str:
+    return f"media:{stored_name}"
+
+
+def signed_media_url(stored_name: str, user_id, media_type: str = None):
+    """
+    URL de descarga para un usuario ya autorizado y su vigencia en segundos:
+    URL firmada de la API en local, URL prefirmada del bucket en S3.
+    """
+    storage = get_storage()
+    if not storage.is_local:
+        return storage.url_for(stored_name, media_type=media_type), MEDIA_PRESIGNED_URL_SECONDS
+    params = sign_resource(media_resource(stored_name), user_id)
+    return f"{storage.url_for(stored_name)}?{urlencode(params)}", SIGNED_URL_EXPIRE_SECONDS
+
+
+def authorize_media(db: Session, user, stored_name: str, uid: str = None, exp: int = None, sig: str = None) -> None:
+    """Autoriza con la URL firmada si la trae (solo CPU) o con las reglas de arriba."""
+    if sig is not None:
+        if not verify_resource_signature(media_resource(stored_name), uid, exp, sig):
+            raise HTTPException(status_code=403, detail="El enlace no es válido o ya venció")
+        return
+    require_media_access(db, user, stored_name)
@@ -0,0 +1,112 @@
+# app/modules/media/benchmark.py
+"""
+Benchmark de la deduplicación de subidas con archivos sintéticos grandes.
+
+Sube K veces el mismo archivo de N MB (y uno distinto al final) con el camino
+anterior (copia a un archivo uuid4) y con el almacenamiento por contenido, y
+compara tiempo y espacio en disco. Necesita la base de datos configurada; todo
+lo que registra se revierte al terminar y los archivos se crean en un
+directorio temporal.
+
+Uso:
+    python -m app.modules.media.benchmark [--size-mb 256] [--copies 5]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from app.core.database import SessionLocal
+from app.modules.media import blobs
+from app.modules.media.storage import find_upload
+
+
+def make_synthetic_file(path: str, size_mb: int) -> None:
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for i in range(size_mb):
+            # Cada MB distinto, para que no se parezca a un archivo comprimible
+            f.write(i.to_bytes(8, "big") + block[8:])
+
+
+def disk_usage(directory: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory)
+        for name in names
+    )
+
+
+def upload_plain(source_path: str, directory: str) -> str:
+    """Camino anterior: cada subida se copia a un archivo nuevo."""
+    target = os.path.join(directory, f"{uuid.uuid4()}.mp4")
+    with open(source_path, "rb") as source, open(target, "wb") as buffer:
+        shutil.copyfileobj(source, buffer)
+    return target
+
+
+def upload_dedup(db, source_path: str) -> str:
+    with open(source_path, "rb") as source:
+        tmp_path, sha256, size = blobs.write_hashed(source)
+    return blobs.register_blob(db, tmp_path, sha256, size, "clase.mp4").stored_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de deduplicación de subidas")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--copies", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="apprende-media-bench-")
+    original_cwd = os.getcwd()
+    db = SessionLocal()
+    try:
+        sources = os.path.join(workdir, "sources")
+        plain_dir = os.path.join(workdir, "plain")
+        os.makedirs(sources)
+        os.makedirs(plain_dir)
+
+        same = os.path.join(sources, "intro.mp4")
+        other = os.path.join(sources, "otra.mp4")
+        make_synthetic_file(same, args.size_mb)
+        make_synthetic_file(other, args.size_mb + 1)
+        uploads = [same] * args.copies + [other]
+
+        started = time.perf_counter()
+        for path in uploads:
+            upload_plain(path, plain_dir)
+        plain_seconds = time.perf_counter() - started
+
+        # blobs escribe en ./uploads: se trabaja dentro del directorio temporal
+        os.chdir(workdir)
+        started = time.perf_counter()
+        names = [upload_dedup(db, path) for path in uploads]
+        dedup_seconds = time.perf_counter() - started
+
+        assert len(set(names[:args.copies])) == 1, "Las copias no resolvieron al mismo archivo"
+        assert names[-1] != names[0], "Contenido distinto resolvió al mismo archivo"
+        with open(same, "rb") as a, open(find_upload(names[0]), "rb") as b:
+            assert a.read() == b.read(), "El archivo guardado no coincide con el original"
+
+        total_mb = sum(os.path.getsize(path) for path in uploads) / (1024 * 1024)
+        print(f"{len(uploads)} subidas, {total_mb:.0f} MB en total")
+        print(f"{'camino':<16}{'segundos':>10}{'MB/s':>10}{'MB en disco':>14}")
+        for name, seconds, directory in (
+            ("copia uuid4", plain_seconds, plain_dir),
+            ("por contenido", dedup_seconds, blobs.UPLOAD_DIR),
+        ):
+            print(
+                f"{name:<16}{seconds:>10.2f}{total_mb / seconds:>10.0f}"
+                f"{disk_usage(directory) / (1024 * 1024):>14.0f}"
+            )
+    finally:
+        db.rollback()
+        db.close()
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
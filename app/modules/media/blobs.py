@@ -0,0 +1,202 @@
+# app/modules/media/blobs.py
+"""
+Almacenamiento direccionado por contenido de los archivos subidos.
+
+Cada archivo se guarda una sola vez con su SHA-256 como nombre
+(<sha256><ext>, en el backend de media/storage.py). El hash se calcula mientras el archivo se escribe,
+sin una segunda lectura. Si ya existe un archivo con el mismo hash, la subida
+nueva se descarta y se devuelve el existente. Qué archivos siguen en uso lo
+decide la limpieza de huérfanos (media/gc.py) mirando las URLs guardadas.
+Las URLs son /media/<aa>/<bb>/<nombre> (la misma
+estructura de carpetas que en disco, ver media/storage.py); las anteriores,
+/media/<nombre>, siguen funcionando: el archivo se identifica por el nombre.
+"""
+import hashlib
+import os
+import tempfile
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import MEDIA_METADATA_CACHE_SECONDS
+from app.modules.media.models import MediaFile, MediaFileUploader
+from app.modules.courses.models import Lesson
+from app.modules.media.probe import probe_media
+from app.modules.media.urls import media_url_name
+from app.modules.media.storage import UPLOAD_DIR, get_storage, shard_path, find_upload
+
+# Tamaño de lectura al copiar una subida al disco
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Metadatos por nombre de archivo para el streaming: {stored_name: dict | False}.
+# False = archivo anterior a media_files (se sirve con os.stat).
+media_metadata = TTLCache(ttl_seconds=MEDIA_METADATA_CACHE_SECONDS)
+
+
+def media_url(stored_name: str) -> str:
+    return f"/media/{shard_path(stored_name)}"
+
+
+def blob_name(sha256: str, filename: str) -> str:
+    extension = os.path.splitext(os.path.basename(filename))[1][:16].lower()
+    return f"{sha256}{extension}"
+
+
+def write_hashed(source, directory: str = UPLOAD_DIR):
+    """
+    Copia `source` (objeto tipo archivo) a un temporal dentro de `directory`
+    calculando el SHA-256 en la misma pasada. Devuelve (ruta temporal, sha256, tamaño).
+    """
+    os.makedirs(directory, exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as target:
+            while True:
+                chunk = source.read(COPY_CHUNK_BYTES)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                target.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, hasher.hexdigest(), size
+
+
+def register_blob(db: Session, path: str, sha256: str, size: int, filename: str, user_id=None) -> MediaFile:
+    """
+    Registra el archivo ya escrito en `path` (temporal o de una subida
+    reanudable) con su hash y, si se indica, a `user_id` como autor. Si el
+    contenido ya existía, borra `path` y devuelve el archivo existente.
+    No hace commit.
+    """
+    existing = db.query(MediaFile).filter(MediaFile.sha256 == sha256).first()
+    if existing is None:
+        # Primero se coloca el archivo y después se registra, así la URL nunca apunta a nada
+        stored_name = blob_name(sha256, filename)
+        mime_type, duration = probe_media(path, filename)
+        get_storage().save(path, stored_name)
+    else:
+        stored_name = existing.stored_name
+        mime_type, duration = existing.mime_type, existing.duration_seconds
+        os.remove(path)
+
+    stmt = pg_insert(MediaFile).values(
+        sha256=sha256,
+        stored_name=stored_name,
+        size=size,
+        mime_type=mime_type,
+        duration_seconds=duration
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MediaFile.sha256],
+        # updated_at: la limpieza de huérfanos respeta el período de gracia desde la última subida
+        set_={"updated_at": func.now()}
+    ).returning(MediaFile.stored_name)
+    registered_name = db.execute(stmt).scalar()
+    media_metadata.delete(registered_name)
+
+    # Otra subida del mismo contenido (con otra extensión) se registró primero
+    if registered_name != stored_name:
+        get_storage().delete(stored_name)
+
+    if user_id is not None:
+        db.execute(
+            pg_insert(MediaFileUploader)
+            .values(sha256=sha256, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=[MediaFileUploader.sha256, MediaFileUploader.user_id])
+        )
+
+    return db.query(MediaFile).filter(MediaFile.sha256 == sha256).populate_existing().one()
+
+
+def store_upload(db: Session, source, filename: str, user_id) -> MediaFile:
+    """Guarda una subida completa (objeto tipo archivo) de `user_id` deduplicando por contenido."""
+    tmp_path, sha256, size = write_hashed(source)
+    media_file = register_blob(db, tmp_path, sha256, size, filename, user_id)
+    db.commit()
+    return media_file
+
+
+def uploaded_by(db: Session, stored_name: str, user_id) -> bool:
+    """True si `user_id` subió el archivo `stored_name`."""
+    return db.query(MediaFileUploader.sha256).join(
+        MediaFile, MediaFile.sha256 == MediaFileUploader.sha256
+    ).filter(
+        MediaFile.stored_name == stored_name,
+        MediaFileUploader.user_id == user_id
+    ).first() is not None
+
+
+def stored_name_from_url(url: str):
+    """Nombre del archivo de una URL /media/... o /media/aa/bb/... (o None si es externa)."""
+    if not url or "/media/" not in url:
+        return None
+    path = url.rsplit("/media/", 1)[1].split("?", 1)[0].split("#", 1)[0]
+    return os.path.basename(path) or None
+
+
+def get_media_metadata(db: Session, stored_name: str):
+    """
+    Metadatos de un archivo subido (size, mime_type, sha256, duration_seconds,
+    created_at) desde la caché del proceso o con una lectura por índice.
+    None si el archivo no está en media_files.
+    """
+    cached = media_metadata.get(stored_name)
+    if cached is not None:
+        return cached or None
+
+    row = db.query(
+        MediaFile.sha256,
+        MediaFile.size,
+        MediaFile.mime_type,
+        MediaFile.duration_seconds,
+        MediaFile.created_at,
+    ).filter(MediaFile.stored_name == stored_name).first()
+
+    metadata = dict(row._mapping) if row else False
+    media_metadata.set(stored_name, metadata)
+    return metadata or None
+
+
+def media_duration_seconds(db: Session, url: str):
+    """Duración del video de esa URL según media_files (None si no se conoce)."""
+    stored_name = stored_name_from_url(url)
+    if stored_name is None:
+        return None
+    metadata = get_media_metadata(db, stored_name)
+    return metadata["duration_seconds"] if metadata else None
+
+
+def backfill_media_metadata(db: Session) -> dict:
+    """
+    Completa los metadatos de archivos registrados sin ellos y la duración de
+    las lecciones que apuntan a esos archivos. Solo analiza archivos en disco
+    local. Hace commit.
+    """
+    probed = 0
+    for media_file in db.query(MediaFile).filter(MediaFile.mime_type.is_(None)).all():
+        path = find_upload(media_file.stored_name)
+        if path is None:
+            continue
+        media_file.mime_type, media_file.duration_seconds = probe_media(path, media_file.stored_name)
+        media_metadata.delete(media_file.stored_name)
+        probed += 1
+    db.flush()
+
+    # Lecciones creadas antes de conocer la duración (por el índice del nombre en la URL)
+    lessons_updated = db.execute(
+        update(Lesson).where(
+            media_url_name(Lesson.video_resource_id) == MediaFile.stored_name,
+            func.coalesce(Lesson.duration_seconds, 0) == 0,
+            MediaFile.duration_seconds.isnot(None)
+        ).values(duration_seconds=MediaFile.duration_seconds)
+    ).rowcount
+    db.commit()
+    return {"media_probed": probed, "lessons_updated": lessons_updated}
@@ -0,0 +1,92 @@
+# app/modules/media/delivery.py
+"""
+Entrega de los bytes de un archivo, una vez que media/access.py autorizó la descarga.
+
+- Detrás de nginx: la API responde solo con `X-Accel-Redirect` y nginx envía
+  el archivo desde el volumen de uploads (sendfile, rangos y conexiones lentas
+  sin ocupar un worker de Python). Apache/lighttpd: `X-Sendfile`.
+- Sin proxy: streaming por rangos en el propio proceso (media/streaming.py).
+- Almacenamiento S3: redirección a una URL prefirmada del bucket.
+
+El proxy anuncia qué soporta con el header `X-Media-Offload` (ver
+deploy/nginx/apprende.conf). Sin ese header la API siempre entrega los bytes
+ella misma, así que acceder directo al puerto 8000 sigue funcionando.
+"""
+import os
+from datetime import timezone
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import MEDIA_ACCEL_PREFIX, MEDIA_SENDFILE_ROOT
+from app.modules.media import blobs
+from app.modules.media.storage import UPLOAD_DIR, get_storage, find_upload
+from app.modules.media.streaming import RangeFileResponse
+
+OFFLOAD_HEADER = "x-media-offload"
+OFFLOAD_MODES = {"x-accel-redirect", "x-sendfile"}
+
+
+def offload_mode(request: Request):
+    """Modo anunciado por el proxy ("x-accel-redirect" / "x-sendfile") o None."""
+    mode = request.headers.get(OFFLOAD_HEADER, "").strip().lower()
+    return mode if mode in OFFLOAD_MODES else None
+
+
+def media_response(request: Request, db: Session, filename: str):
+    """Respuesta con el archivo `filename` de uploads/ (ya autorizado)."""
+    # Tamaño, tipo y hash desde media_files (en caché): sin stat por cada rango.
+    # La ubicación en disco también se recuerda (ver media/storage.py)
+    metadata = blobs.get_media_metadata(db, filename)
+
+    storage = get_storage()
+    if not storage.is_local:
+        # Los bytes los entrega el bucket, no este proceso
+        return redirect_to_storage(storage, filename, metadata)
+
+    # Carpeta de dos niveles (ubicación recordada) o, si es anterior, la raíz de uploads/
+    file_path = find_upload(filename)
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+
+    mode = offload_mode(request)
+    if mode is not None:
+        relative_path = os.path.relpath(file_path, UPLOAD_DIR)
+        return offload_response(mode, relative_path, metadata["mime_type"] if metadata else None)
+
+    if metadata is not None:
+        return RangeFileResponse(
+            file_path,
+            request.headers,
+            media_type=metadata["mime_type"],
+            file_size=metadata["size"],
+            etag=metadata["sha256"],
+            last_modified=metadata["created_at"].replace(tzinfo=timezone.utc).timestamp()
+        )
+
+    # Archivos anteriores a media_files
+    return RangeFileResponse(file_path, request.headers)
+
+
+def offload_response(mode: str, relative_path: str, media_type: str = None) -> Response:
+    """
+    Respuesta vacía: el proxy reemplaza el cuerpo por el archivo (y resuelve
+    Range/HEAD). `relative_path` es la ruta dentro de uploads/.
+    """
+    if mode == "x-accel-redirect":
+        headers = {"X-Accel-Redirect": MEDIA_ACCEL_PREFIX.rstrip("/") + "/" + quote(relative_path)}
+    else:
+        headers = {"X-Sendfile": os.path.join(MEDIA_SENDFILE_ROOT, relative_path)}
+    # Contenido de pago: que ningún caché compartido lo guarde
+    headers["Cache-Control"] = "private, max-age=0"
+    return Response(status_code=200, headers=headers, media_type=media_type)
+
+
+def redirect_to_storage(storage, filename: str, metadata):
+    if metadata is None:
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+    url = storage.url_for(filename, media_type=metadata["mime_type"])
+    # 307: el reproductor repite la misma petición (con Range) contra el bucket
+    return RedirectResponse(url, status_code=307, headers={"Cache-Control": "private, no-store"})
@@ -0,0 +1,101 @@
+# app/modules/media/delivery_benchmark.py
+"""
+Benchmark de entrega de video: streaming en el proceso de Python contra nginx
+con X-Accel-Redirect, usando el stack de docker-compose.
+
+    docker compose --profile proxy up -d
+    python -m app.modules.media.delivery_benchmark --filename <archivo.mp4> --user-id <uuid>
+
+Pide rangos aleatorios del mismo archivo (como un reproductor que adelanta)
+con varias conexiones en paralelo, primero directo a la API (:8000, sin
+proxy: la API envía los bytes) y después a través de nginx (:8080: la API
+solo autoriza y nginx envía los bytes). Las peticiones usan una URL firmada
+como la de play_lesson, generada aquí con el mismo SECRET_KEY que la API.
+"""
+import argparse
+import random
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+
+from app.core.security import sign_resource
+from app.modules.media.access import media_resource
+
+
+def file_size(url: str) -> int:
+    request = urllib.request.Request(url, method="HEAD")
+    with urllib.request.urlopen(request) as response:
+        return int(response.headers["Content-Length"])
+
+
+def fetch_range(url: str, start: int, end: int):
+    """(bytes recibidos, segundos)."""
+    request = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+    started = time.perf_counter()
+    received = 0
+    with urllib.request.urlopen(request) as response:
+        if response.status != 206:
+            raise RuntimeError(f"{url}: se esperaba 206 y llegó {response.status}")
+        while True:
+            chunk = response.read(256 * 1024)
+            if not chunk:
+                break
+            received += len(chunk)
+    return received, time.perf_counter() - started
+
+
+def run(url: str, ranges, concurrency: int):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda r: fetch_range(url, *r), ranges))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(seconds for _, seconds in results)
+    return {
+        "seconds": elapsed,
+        "mb_per_second": sum(received for received, _ in results) / (1024 * 1024) / elapsed,
+        "requests_per_second": len(results) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de entrega de video (API vs nginx)")
+    parser.add_argument("--filename", required=True, help="Nombre del archivo en uploads/")
+    parser.add_argument("--user-id", required=True, help="Usuario para el que se firma la URL")
+    parser.add_argument("--api", default="http://localhost:8000")
+    parser.add_argument("--proxy", default="http://localhost:8080")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--range-mb", type=float, default=2)
+    args = parser.parse_args()
+
+    signature = sign_resource(media_resource(args.filename), args.user_id)
+    path = f"/files/stream/{quote(args.filename)}?{urlencode(signature)}"
+    size = file_size(args.api + path)
+    length = min(int(args.range_mb * 1024 * 1024), size)
+
+    # Los mismos rangos para las dos variantes
+    rng = random.Random(42)
+    ranges = []
+    for _ in range(args.requests):
+        start = rng.randrange(0, size - length + 1)
+        ranges.append((start, start + length - 1))
+
+    print(f"{args.filename}: {size / (1024 * 1024):.0f} MB, {args.requests} rangos de "
+          f"{length / (1024 * 1024):.1f} MB, {args.concurrency} conexiones")
+    print(f"{'entrega':<26}{'MB/s':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, base in (("API (streaming Python)", args.api), ("nginx (X-Accel-Redirect)", args.proxy)):
+        # Una pasada de calentamiento (caché de páginas del sistema operativo)
+        run(base + path, ranges[:args.concurrency], args.concurrency)
+        result = run(base + path, ranges, args.concurrency)
+        print(
+            f"{name:<26}{result['mb_per_second']:>10.0f}{result['requests_per_second']:>10.0f}"
+            f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
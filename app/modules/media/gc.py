@@ -0,0 +1,182 @@
+# app/modules/media/gc.py
+"""
+Limpieza de archivos huérfanos en uploads/.
+
+Un archivo está en uso si alguna de estas columnas apunta a él (URL
+/media/<nombre> o /media/aa/bb/<nombre>):
+
+    lessons.video_resource_id, courses.thumbnail_url,
+    courses.promotional_video_url, categories.icon_url
+
+o si es una subida reanudable en curso. Los demás (borradores de cursos que
+nunca se guardaron, miniaturas reemplazadas, temporales de subidas cortadas)
+se borran o se mueven a cuarentena cuando pasan el período de gracia.
+
+El directorio se recorre con os.scandir sin cargar el listado completo, y
+los nombres se consultan en la base de datos por lotes, por los índices del
+nombre del archivo en cada URL (ver media/urls.py). Los borrados se
+limitan a N por segundo para no saturar el disco del contenedor.
+"""
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.modules.courses.models import Course, Lesson
+from app.modules.categories.models import Category
+from app.modules.media.models import MediaFile, UploadSession
+from app.modules.media.blobs import media_metadata
+from app.modules.media.storage import UPLOAD_DIR, forget_upload
+from app.modules.media.urls import media_url_name
+
+QUARANTINE_DIR_NAME = ".quarantine"
+
+# Columnas con URLs de archivos subidos (cada una con su índice de media_url_name)
+MEDIA_URL_COLUMNS = (
+    Lesson.video_resource_id,
+    Course.thumbnail_url,
+    Course.promotional_video_url,
+    Category.icon_url,
+)
+
+
+class RateLimiter:
+    """Espera lo necesario para no superar `per_second` operaciones por segundo (0 = sin límite)."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1 / per_second if per_second > 0 else 0
+        self.last = 0.0
+
+    def wait(self) -> None:
+        delay = self.last + self.interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.last = time.monotonic()
+
+
+def iter_upload_files(directory: str = UPLOAD_DIR):
+    """Recorre uploads/ (y subcarpetas, salvo la cuarentena) sin cargar el listado entero."""
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != QUARANTINE_DIR_NAME:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def _referenced_names(db: Session, names) -> set:
+    """Cuáles de `names` están en uso (una consulta por índice y tabla para todo el lote)."""
+    referenced = set()
+    for column in MEDIA_URL_COLUMNS:
+        # Nombre del archivo al final de la URL (/media/<nombre>, /media/aa/bb/<nombre>, http://...)
+        stored_name = media_url_name(column)
+        rows = db.query(stored_name).filter(stored_name.in_(names)).distinct().all()
+        referenced.update(row[0] for row in rows)
+
+    rows = db.query(UploadSession.stored_name).filter(
+        UploadSession.status == "UPLOADING",
+        UploadSession.stored_name.in_(names)
+    ).all()
+    referenced.update(row[0] for row in rows)
+    return referenced
+
+
+def _recently_registered(db: Session, names, cutoff: datetime) -> set:
+    """
+    Archivos deduplicados a los que se sumó una subida hace poco: el archivo
+    en disco es viejo, pero la URL se acaba de entregar y aún no se guardó.
+    """
+    rows = db.query(MediaFile.stored_name).filter(
+        MediaFile.stored_name.in_(names),
+        MediaFile.updated_at >= cutoff
+    ).all()
+    return {row[0] for row in rows}
+
+
+def sweep_orphans(
+    db: Session,
+    grace_hours: float,
+    dry_run: bool = True,
+    quarantine: bool = False,
+    batch_size: int = 500,
+    max_deletes_per_second: float = 50,
+    directory: str = UPLOAD_DIR,
+) -> dict:
+    """
+    Busca (y si no es dry_run, borra o pone en cuarentena) los archivos
+    huérfanos con más de `grace_hours` de antigüedad. Devuelve el reporte.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=grace_hours)
+    cutoff_timestamp = time.time() - grace_hours * 3600
+    quarantine_dir = os.path.join(directory, QUARANTINE_DIR_NAME)
+    report = {
+        "scanned": 0,
+        "in_use": 0,
+        "recent": 0,
+        "orphans": [],
+        "orphan_bytes": 0,
+        "removed": 0,
+    }
+    limiter = RateLimiter(max_deletes_per_second)
+
+    def process(batch):
+        names = [entry.name for entry, _ in batch]
+        referenced = _referenced_names(db, names)
+        recent = _recently_registered(db, names, cutoff)
+
+        removed_names = []
+        for entry, stat in batch:
+            if entry.name in referenced:
+                report["in_use"] += 1
+                continue
+            if entry.name in recent:
+                report["recent"] += 1
+                continue
+            report["orphans"].append(entry.path)
+            report["orphan_bytes"] += stat.st_size
+            if dry_run:
+                continue
+
+            limiter.wait()
+            try:
+                if quarantine:
+                    os.makedirs(quarantine_dir, exist_ok=True)
+                    shutil.move(entry.path, os.path.join(quarantine_dir, entry.name))
+                else:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            removed_names.append(entry.name)
+
+        if removed_names:
+            # Sin el registro, una subida futura del mismo contenido no resuelve a un archivo borrado
+            db.query(MediaFile).filter(MediaFile.stored_name.in_(removed_names)).delete(synchronize_session=False)
+            db.commit()
+            for name in removed_names:
+                media_metadata.delete(name)
+                forget_upload(name, directory)
+            report["removed"] += len(removed_names)
+
+    if not os.path.isdir(directory):
+        return report
+
+    batch = []
+    for entry in iter_upload_files(directory):
+        report["scanned"] += 1
+        stat = entry.stat(follow_symlinks=False)
+        if stat.st_mtime >= cutoff_timestamp:
+            report["recent"] += 1
+            continue
+        batch.append((entry, stat))
+        if len(batch) >= batch_size:
+            process(batch)
+            batch = []
+    if batch:
+        process(batch)
+
+    return report
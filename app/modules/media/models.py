@@ -0,0 +1,68 @@
+# app/modules/media/models.py
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime, ForeignKey, text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
+
+
+class UploadSession(Base):
+    """
+    Subida reanudable en curso (protocolo estilo tus).
+    Los bloques se escriben directamente en `stored_name` dentro de la carpeta
+    de uploads; `offset` es cuántos bytes ya están confirmados en disco.
+    """
+    __tablename__ = "upload_sessions"
+
+    __table_args__ = (
+        # Limpieza de subidas abandonadas (ver media/tasks.py)
+        Index('ix_upload_sessions_status_expires', 'status', 'expires_at'),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    filename = Column(String(255), nullable=False)       # Nombre original del archivo
+    stored_name = Column(String(255), nullable=False)    # Nombre en disco (único)
+    size = Column(BigInteger, nullable=False)            # Tamaño total declarado
+    offset = Column(BigInteger, nullable=False, default=0, server_default=text("0"))
+
+    # UPLOADING | COMPLETED
+    status = Column(String(20), nullable=False, default="UPLOADING", server_default=text("'UPLOADING'"))
+
+    created_at = Column(DateTime, server_default=text("NOW()"))
+    updated_at = Column(DateTime, server_default=text("NOW()"), onupdate=text("NOW()"))
+    expires_at = Column(DateTime, nullable=False)
+
+
+class MediaFile(Base):
+    """
+    Archivo subido, guardado una sola vez por contenido (ver media/blobs.py).
+    No lleva contador de referencias: las usan las columnas con URLs /media/...
+    y la limpieza de huérfanos (media/gc.py) las consulta directamente.
+    Los metadatos se calculan al subirlo; el streaming los usa sin tocar el disco.
+    """
+    __tablename__ = "media_files"
+
+    sha256 = Column(String(64), primary_key=True)
+    stored_name = Column(String(255), unique=True, nullable=False)
+    size = Column(BigInteger, nullable=False)
+
+    mime_type = Column(String(100), nullable=True)
+    duration_seconds = Column(Integer, nullable=True)  # Solo videos/audios MP4 (ver media/probe.py)
+
+    created_at = Column(DateTime, server_default=text("NOW()"))
+    updated_at = Column(DateTime, server_default=text("NOW()"), onupdate=text("NOW()"))
+
+
+class MediaFileUploader(Base):
+    """
+    Quién subió cada archivo. Como el contenido se guarda una sola vez, un mismo
+    archivo puede tener varios autores (cada uno lo subió por su cuenta).
+    Solo se puede usar en una lección un archivo que uno mismo haya subido.
+    """
+    __tablename__ = "media_file_uploaders"
+
+    sha256 = Column(String(64), ForeignKey("media_files.sha256", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    created_at = Column(DateTime, server_default=text("NOW()"))
@@ -0,0 +1,85 @@
+# app/modules/media/probe.py
+"""
+Metadatos de los archivos subidos, sin herramientas externas (ffmpeg).
+
+La duración de un MP4/MOV se lee de la caja `moov/mvhd`: solo se leen los
+encabezados de las cajas y se salta su contenido, así que no importa si
+`moov` está al principio o al final del archivo.
+"""
+import os
+import struct
+
+from app.modules.media.streaming import guess_media_type
+
+# Contenedores ISO BMFF (MP4, MOV, M4A...)
+ISO_BMFF_TYPES = {"video/mp4", "video/quicktime", "audio/mp4", "video/3gpp"}
+
+
+def _iter_boxes(f, start: int, end: int):
+    """Recorre las cajas entre `start` y `end`: (tipo, inicio del contenido, fin)."""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        content_start = position + 8
+        if size == 1:
+            # Tamaño de 64 bits a continuación
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            size = struct.unpack(">Q", large)[0]
+            content_start += 8
+        elif size == 0:
+            # La caja llega hasta el final del archivo
+            size = end - position
+        if size < content_start - position:
+            return  # Caja corrupta
+        yield box_type, content_start, min(position + size, end)
+        position += size
+
+
+def mp4_duration_seconds(path: str):
+    """Duración en segundos según moov/mvhd, o None si no es un MP4 válido."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        for box_type, moov_start, moov_end in _iter_boxes(f, 0, file_size):
+            if box_type != b"moov":
+                continue
+            for child_type, start, end in _iter_boxes(f, moov_start, moov_end):
+                if child_type != b"mvhd":
+                    continue
+                f.seek(start)
+                version = f.read(1)
+                if not version:
+                    return None
+                f.read(3)  # flags
+                if version[0] == 1:
+                    data = f.read(28)
+                    if len(data) < 28:
+                        return None
+                    _, _, timescale, duration = struct.unpack(">QQIQ", data)
+                else:
+                    data = f.read(16)
+                    if len(data) < 16:
+                        return None
+                    _, _, timescale, duration = struct.unpack(">IIII", data)
+                if not timescale:
+                    return None
+                return round(duration / timescale)
+            return None
+    return None
+
+
+def probe_media(path: str, filename: str):
+    """(mime_type, duration_seconds) de un archivo; la duración es None si no aplica."""
+    mime_type = guess_media_type(filename)
+    duration = None
+    if mime_type in ISO_BMFF_TYPES:
+        try:
+            duration = mp4_duration_seconds(path)
+        except (OSError, struct.error):
+            duration = None
+    return mime_type, duration
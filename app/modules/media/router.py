@@ -1,18 +1,28 @@
 # app/modules/media/router.py
-from fastapi import APIRouter, UploadFile, File, HTTPException, Request
-from fastapi.responses import StreamingResponse, FileResponse
-import shutil
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Response, Depends, Header, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
+from app.core.database import get_db
+from app.modules.auth.dependencies import get_current_user, get_optional_user
+from app.modules.users.models import User
+from app.modules.media.schemas import UploadSessionCreate, UploadSessionResponse
+from app.modules.media import uploads, blobs, access, delivery
 import os
-import uuid
 
 router = APIRouter(prefix="/files", tags=["Archivos Multimedia"])
 
-UPLOAD_DIR = "uploads"
-
 @router.post("/upload")
-def upload_file(file: UploadFile = File(...)):
+def upload_file(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     """
     Sube un archivo al servidor local y devuelve la URL pública.
+    Queda registrado quién lo subió (solo el autor puede usarlo en sus lecciones).
+    Si el mismo contenido ya se subió antes, devuelve ese archivo (ver media/blobs.py).
     """
     try:
         # 1. Validar extensión (opcional, pero recomendado)
@@ -20,64 +30,149 @@ def upload_file(file: UploadFile = File(...)):
         # if not filename.endswith(('.png', '.jpg', '.jpeg', '.mp4')):
         #    raise HTTPException(status_code=400, detail="Formato no permitido")
 
-        # 2. Generar nombre único (para no sobrescribir archivos con el mismo nombre)
-        # Ej: "foto.jpg" -> "a1b2c3d4-foto.jpg"
-        file_extension = os.path.splitext(file.filename)[1]
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = f"{UPLOAD_DIR}/{unique_filename}"
-
-        # 3. Guardar el archivo físicamente
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # 2. Guardar el archivo con su SHA-256 como nombre (calculado mientras se copia)
+        # Ej: "foto.jpg" -> "9f86d081...b0f00a08.jpg"
+        media_file = blobs.store_upload(db, file.file, file.filename, current_user.id)
+        stored_name = media_file.stored_name
 
-        # 4. Devolver la URL
+        # 3. Devolver la URL
         # En producción, aquí devolverías la URL de tu dominio.
         return {
-            "filename": unique_filename,
-            "url": f"/media/{unique_filename}", # URL relativa
-            "full_url": f"http://localhost:8000/media/{unique_filename}"
+            "filename": stored_name,
+            "url": blobs.media_url(stored_name), # URL relativa
+            "full_url": f"http://localhost:8000{blobs.media_url(stored_name)}"
         }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al subir archivo: {str(e)}")
 
-@router.get("/stream/{filename}")
-def stream_video(filename: str, request: Request = None):
+# --- SUBIDAS REANUDABLES (ver app.modules.media.uploads) ---
+
+def _upload_response(session) -> UploadSessionResponse:
+    response = UploadSessionResponse.model_validate(session)
+    if session.status == "COMPLETED":
+        response.url = blobs.media_url(session.stored_name)
+    return response
+
+def _offset_headers(session) -> dict:
+    return {
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.size),
+        "Cache-Control": "no-store",
+    }
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=201)
+def create_upload(
+    data: UploadSessionCreate,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Crea una subida reanudable. Los datos se envían después con PATCH."""
+    session = uploads.create_upload_session(db, current_user.id, data.filename, data.size)
+    response.headers["Location"] = f"/files/uploads/{session.id}"
+    response.headers.update(_offset_headers(session))
+    return _upload_response(session)
+
+@router.api_route("/uploads/{upload_id}", methods=["GET", "HEAD"], response_model=UploadSessionResponse)
+def get_upload(
+    upload_id: UUID,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Offset confirmado de la subida: desde ahí se reanuda tras un corte."""
+    session = uploads.get_upload_session(db, upload_id, current_user.id)
+    if request.method == "HEAD":
+        return Response(status_code=200, headers=_offset_headers(session))
+    response.headers.update(_offset_headers(session))
+    return _upload_response(session)
+
+@router.patch("/uploads/{upload_id}", status_code=204)
+async def upload_chunk(
+    upload_id: UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    upload_checksum: Optional[str] = Header(None, alias="Upload-Checksum"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recibe un bloque (Content-Type: application/offset+octet-stream) y lo
+    escribe en el archivo final a partir de Upload-Offset.
+    La subida queda bloqueada desde antes de escribir hasta confirmar el bloque.
+    """
+    session = await run_in_threadpool(uploads.get_upload_session, db, upload_id, current_user.id, True)
+    try:
+        written, content_hasher = await uploads.write_chunk(session, request, upload_offset, upload_checksum)
+    except BaseException:
+        # El archivo ya volvió al último offset confirmado: se libera el bloqueo
+        await run_in_threadpool(db.rollback)
+        raise
+    new_offset = await run_in_threadpool(
+        uploads.confirm_chunk, db, session, upload_offset, written, content_hasher
+    )
+    return Response(status_code=204, headers={"Upload-Offset": str(new_offset)})
+
+@router.post("/uploads/{upload_id}/complete", response_model=UploadSessionResponse)
+def complete_upload(
+    upload_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cierra la subida (todos los bytes recibidos) y devuelve la URL del archivo."""
+    session = uploads.get_upload_session(db, upload_id, current_user.id, lock=True)
+    session = uploads.complete_upload_session(db, session)
+    return _upload_response(session)
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+def cancel_upload(
+    upload_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Cancela una subida en curso y borra lo recibido."""
+    session = uploads.get_upload_session(db, upload_id, current_user.id, lock=True)
+    uploads.delete_upload_session(db, session)
+    return Response(status_code=204)
+
+@router.api_route("/stream/{filename:path}", methods=["GET", "HEAD"])
+def stream_video(
+    filename: str,
+    request: Request,
+    uid: Optional[str] = Query(None),
+    exp: Optional[int] = Query(None),
+    sig: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
     """
     Endpoint para streaming de video con soporte de Range Requests.
     Permite avanzar/retroceder (seek) en el video.
+    Los videos de lecciones exigen la URL firmada que entrega play_lesson, o
+    sesión e inscripción en el curso (ver app.modules.media.access). Detrás
+    de nginx los bytes los envía el proxy (ver app.modules.media.delivery).
     """
-    file_path = os.path.join(UPLOAD_DIR, filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Archivo no encontrado")
-
-    file_size = os.path.getsize(file_path)
-    range_header = request.headers.get("range")
-
-    if not range_header:
-        # Si no hay range, devolver todo el archivo
-        return FileResponse(file_path)
-
-    # Parsear Range: bytes=START-END
-    video_range = range_header.strip().split("=")[-1]
-    range_start, range_end = video_range.split("-")
-    range_start = int(range_start)
-    range_end = int(range_end) if range_end else file_size - 1
-    
-    # Calcular longitud del contenido a enviar
-    content_length = (range_end - range_start) + 1
-    
-    def iterfile():
-        with open(file_path, "rb") as video:
-            video.seek(range_start)
-            data = video.read(content_length)
-            yield data
-
-    headers = {
-        "Content-Range": f"bytes {range_start}-{range_end}/{file_size}",
-        "Accept-Ranges": "bytes",
-        "Content-Length": str(content_length),
-        "Content-Type": "video/mp4",
-    }
+    filename = os.path.basename(filename)
+    access.authorize_media(db, current_user, filename, uid, exp, sig)
+    return delivery.media_response(request, db, filename)
+
+
+# /media/... (miniaturas, PDFs, videos): mismas reglas que /files/stream.
+# Reemplaza al StaticFiles que servía uploads/ sin comprobar nada.
+public_router = APIRouter(tags=["Archivos Multimedia"])
 
-    return StreamingResponse(iterfile(), status_code=206, headers=headers)
\ No newline at end of file
+@public_router.api_route("/media/{filename:path}", methods=["GET", "HEAD"])
+def serve_media(
+    filename: str,
+    request: Request,
+    uid: Optional[str] = Query(None),
+    exp: Optional[int] = Query(None),
+    sig: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    filename = os.path.basename(filename)
+    access.authorize_media(db, current_user, filename, uid, exp, sig)
+    return delivery.media_response(request, db, filename)
@@ -0,0 +1,25 @@
+# app/modules/media/schemas.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0, description="Tamaño total del archivo en bytes")
+
+
+class UploadSessionResponse(BaseModel):
+    id: UUID
+    filename: str
+    size: int
+    offset: int
+    status: str
+    expires_at: datetime
+
+    # Solo cuando la subida está completa
+    url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,128 @@
+# app/modules/media/sharding.py
+"""
+Migración de uploads/ plano a la estructura de dos niveles (ver media/storage.py).
+
+1. Mueve cada archivo de la raíz de uploads/ a uploads/<aa>/<bb>/<nombre>.
+2. Reescribe las URLs /media/<nombre> de lecciones, cursos y categorías a
+   /media/<aa>/<bb>/<nombre>.
+
+Se puede correr con la API en marcha: mientras dura, el archivo se busca en
+los dos lugares y las dos formas de URL resuelven al mismo archivo. Es
+reanudable: cada paso solo toma lo que sigue en el formato anterior, así que
+si se corta basta con volver a ejecutarlo. Trabaja por lotes y con un ritmo
+máximo para no saturar el disco ni la base de datos.
+"""
+import os
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.modules.courses.models import Course, Lesson
+from app.modules.categories.models import Category
+from app.modules.media.models import UploadSession
+from app.modules.media.storage import UPLOAD_DIR, upload_path
+from app.modules.media.gc import RateLimiter
+
+# URL con el nombre del archivo directamente bajo /media/ (formato anterior)
+FLAT_URL_PATTERN = r"/media/([^/?#]{2})([^/?#]{2})([^/?#]*)$"
+SHARDED_URL_REPLACEMENT = r"/media/\1/\2/\1\2\3"
+
+# (modelo, columna) con URLs de archivos subidos
+MEDIA_URL_FIELDS = (
+    (Lesson, Lesson.video_resource_id),
+    (Course, Course.thumbnail_url),
+    (Course, Course.promotional_video_url),
+    (Category, Category.icon_url),
+)
+
+
+def _iter_flat_files(directory: str):
+    """Archivos de la raíz de uploads/ que todavía no están en su carpeta."""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # Los temporales de subidas en curso se quedan donde están
+            if entry.is_file(follow_symlinks=False) and not entry.name.endswith(".tmp") and len(entry.name) > 4:
+                yield entry
+
+
+def _move_batch(db: Session, batch, directory: str, dry_run: bool, limiter: RateLimiter, report: dict) -> None:
+    names = [entry.name for entry in batch]
+    # Las subidas reanudables en curso se escriben por ruta en cada PATCH: no se mueven
+    uploading = {
+        row[0] for row in db.query(UploadSession.stored_name).filter(
+            UploadSession.status == "UPLOADING",
+            UploadSession.stored_name.in_(names)
+        ).all()
+    }
+    for entry in batch:
+        if entry.name in uploading:
+            report["files_skipped"] += 1
+            continue
+        if dry_run:
+            report["files_moved"] += 1
+            continue
+        limiter.wait()
+        target = upload_path(entry.name, directory)
+        if os.path.exists(target):
+            # Ya se copió antes (mismo nombre = mismo contenido): sobra la copia de la raíz
+            os.remove(entry.path)
+        else:
+            os.rename(entry.path, target)
+        report["files_moved"] += 1
+
+
+def move_flat_files(
+    db: Session,
+    dry_run: bool = True,
+    batch_size: int = 500,
+    max_moves_per_second: float = 200,
+    directory: str = UPLOAD_DIR,
+) -> dict:
+    """Paso 1: mueve los archivos de la raíz a su carpeta de dos niveles."""
+    report = {"files_moved": 0, "files_skipped": 0}
+    if not os.path.isdir(directory):
+        return report
+
+    limiter = RateLimiter(max_moves_per_second)
+    batch = []
+    for entry in _iter_flat_files(directory):
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            _move_batch(db, batch, directory, dry_run, limiter, report)
+            batch = []
+    if batch:
+        _move_batch(db, batch, directory, dry_run, limiter, report)
+    return report
+
+
+def rewrite_media_urls(
+    db: Session,
+    dry_run: bool = True,
+    batch_size: int = 500,
+    pause_seconds: float = 0.1,
+) -> dict:
+    """Paso 2: reescribe las URLs /media/<nombre> al formato de carpetas, por lotes. Hace commit."""
+    report = {}
+    for model, column in MEDIA_URL_FIELDS:
+        key = f"{model.__tablename__}.{column.key}"
+        flat = column.op("~")(FLAT_URL_PATTERN)
+
+        if dry_run:
+            report[key] = db.query(func.count()).select_from(model).filter(flat).scalar()
+            continue
+
+        updated = 0
+        while True:
+            ids = db.query(model.id).filter(flat).limit(batch_size).subquery()
+            count = db.query(model).filter(model.id.in_(ids.select())).update(
+                {column: func.regexp_replace(column, FLAT_URL_PATTERN, SHARDED_URL_REPLACEMENT)},
+                synchronize_session=False
+            )
+            db.commit()
+            updated += count
+            if count < batch_size:
+                break
+            time.sleep(pause_seconds)
+        report[key] = updated
+    return report
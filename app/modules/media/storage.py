@@ -0,0 +1,219 @@
+# app/modules/media/storage.py
+"""
+Dónde viven los archivos subidos.
+
+- LocalStorage: carpeta `uploads/` servida por la propia API (/files/stream).
+- S3Storage: bucket S3 o compatible (MinIO en desarrollo). La API entrega URLs
+  prefirmadas de corta duración y el cliente descarga directo del bucket, así
+  los bytes de video no pasan por los workers de Python.
+
+Las subidas siempre se escriben primero en disco local (hash, metadatos) y
+después se entregan al backend con `save`.
+
+En disco, cada archivo vive en dos niveles de carpetas tomados del inicio de
+su nombre (hash o uuid): uploads/9f/86/9f86d081...08.mp4. Los archivos
+anteriores siguen en la raíz de uploads/ hasta que `shard-uploads` los mueve
+(ver media/sharding.py); mientras tanto se buscan en los dos lugares.
+
+Configuración (ver app/core/config.py): MEDIA_STORAGE_BACKEND=local|s3 y S3_*.
+El backend s3 necesita boto3 (requirements-s3.txt), que no se instala por defecto.
+"""
+import os
+
+from app.core.cache import TTLCache
+from app.core.config import (
+    MEDIA_STORAGE_BACKEND,
+    MEDIA_PRESIGNED_URL_SECONDS,
+    API_BASE_URL,
+    S3_BUCKET,
+    S3_ENDPOINT_URL,
+    S3_PUBLIC_ENDPOINT_URL,
+    S3_REGION,
+    S3_ACCESS_KEY_ID,
+    S3_SECRET_ACCESS_KEY,
+    S3_PREFIX,
+)
+
+UPLOAD_DIR = "uploads"
+
+# {(carpeta, nombre): ruta en su carpeta de dos niveles}. Un archivo nunca
+# vuelve a la raíz, así que la ubicación se recuerda sin vencimiento.
+_sharded_paths = TTLCache(ttl_seconds=float("inf"), maxsize=100000)
+
+
+def shard_path(name: str) -> str:
+    """Ruta relativa de un archivo en la estructura de dos niveles: "9f/86/9f86...mp4"."""
+    name = os.path.basename(name)
+    return f"{name[:2]}/{name[2:4]}/{name}"
+
+
+def upload_path(name: str, directory: str = UPLOAD_DIR) -> str:
+    """Ruta donde se guarda un archivo nuevo (crea las carpetas)."""
+    path = os.path.join(directory, shard_path(name))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def find_upload(name: str, directory: str = UPLOAD_DIR):
+    """Ruta del archivo en disco (carpetas de dos niveles o, si es anterior, la raíz), o None."""
+    name = os.path.basename(name)
+    cached = _sharded_paths.get((directory, name))
+    if cached is not None:
+        return cached
+    path = os.path.join(directory, shard_path(name))
+    if os.path.isfile(path):
+        _sharded_paths.set((directory, name), path)
+        return path
+    legacy_path = os.path.join(directory, name)
+    if os.path.isfile(legacy_path):
+        return legacy_path
+    return None
+
+
+def forget_upload(name: str, directory: str = UPLOAD_DIR) -> None:
+    """Olvida la ubicación recordada (al borrar el archivo)."""
+    _sharded_paths.delete((directory, os.path.basename(name)))
+
+
+class StorageBackend:
+    """Interfaz común de los backends."""
+
+    # True si los bytes se sirven desde este proceso (/files/stream)
+    is_local = False
+
+    def save(self, local_path: str, name: str) -> None:
+        """Mueve un archivo local ya completo al almacenamiento con el nombre `name`."""
+        raise NotImplementedError
+
+    def delete(self, name: str) -> None:
+        raise NotImplementedError
+
+    def exists(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def url_for(self, name: str, expires_in: int = MEDIA_PRESIGNED_URL_SECONDS, media_type: str = None) -> str:
+        """URL para que el cliente descargue el archivo."""
+        raise NotImplementedError
+
+
+class LocalStorage(StorageBackend):
+    is_local = True
+
+    def __init__(self, directory: str, base_url: str):
+        self.directory = directory
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, name: str):
+        """Ruta del archivo en disco, o None si no existe."""
+        return find_upload(name, self.directory)
+
+    def save(self, local_path: str, name: str) -> None:
+        os.replace(local_path, upload_path(name, self.directory))
+
+    def delete(self, name: str) -> None:
+        forget_upload(name, self.directory)
+        for path in (os.path.join(self.directory, shard_path(name)), os.path.join(self.directory, name)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def exists(self, name: str) -> bool:
+        return self.path(name) is not None
+
+    def url_for(self, name: str, expires_in: int = MEDIA_PRESIGNED_URL_SECONDS, media_type: str = None) -> str:
+        # Los bytes los sirve la API con Range Requests
+        return f"{self.base_url}/files/stream/{name}"
+
+
+class S3Storage(StorageBackend):
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str = None,
+        public_endpoint_url: str = None,
+        region: str = None,
+        access_key_id: str = None,
+        secret_access_key: str = None,
+        prefix: str = ""
+    ):
+        try:
+            # Dependencia opcional: solo hace falta con MEDIA_STORAGE_BACKEND=s3
+            import boto3
+            from botocore.config import Config
+        except ImportError:
+            raise RuntimeError("MEDIA_STORAGE_BACKEND=s3 requiere boto3 (pip install -r requirements-s3.txt)")
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+        def client(endpoint):
+            return boto3.client(
+                "s3",
+                endpoint_url=endpoint or None,
+                region_name=region or None,
+                aws_access_key_id=access_key_id or None,
+                aws_secret_access_key=secret_access_key or None,
+                # Firma v4 y direcciones por ruta: lo que espera MinIO
+                config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+            )
+
+        # Subir y borrar por la red interna (ej. http://minio:9000); las URLs
+        # prefirmadas se firman para el host que ve el navegador. Firmar no
+        # hace peticiones, así que el segundo cliente nunca se conecta.
+        self.client = client(endpoint_url)
+        if public_endpoint_url and public_endpoint_url != endpoint_url:
+            self.presign_client = client(public_endpoint_url)
+        else:
+            self.presign_client = self.client
+
+    def key(self, name: str) -> str:
+        return f"{self.prefix}/{name}" if self.prefix else name
+
+    def save(self, local_path: str, name: str) -> None:
+        # upload_file hace multipart automáticamente en archivos grandes
+        self.client.upload_file(local_path, self.bucket, self.key(name))
+        os.remove(local_path)
+
+    def delete(self, name: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
+
+    def exists(self, name: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(name))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def url_for(self, name: str, expires_in: int = MEDIA_PRESIGNED_URL_SECONDS, media_type: str = None) -> str:
+        params = {"Bucket": self.bucket, "Key": self.key(name)}
+        if media_type:
+            params["ResponseContentType"] = media_type
+        return self.presign_client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+
+_storage = None
+
+
+def get_storage() -> StorageBackend:
+    """Backend configurado (se crea al primer uso)."""
+    global _storage
+    if _storage is None:
+        if MEDIA_STORAGE_BACKEND == "s3":
+            _storage = S3Storage(
+                bucket=S3_BUCKET,
+                endpoint_url=S3_ENDPOINT_URL,
+                public_endpoint_url=S3_PUBLIC_ENDPOINT_URL,
+                region=S3_REGION,
+                access_key_id=S3_ACCESS_KEY_ID,
+                secret_access_key=S3_SECRET_ACCESS_KEY,
+                prefix=S3_PREFIX,
+            )
+        elif MEDIA_STORAGE_BACKEND == "local":
+            _storage = LocalStorage(UPLOAD_DIR, API_BASE_URL)
+        else:
+            raise RuntimeError(f"MEDIA_STORAGE_BACKEND desconocido: {MEDIA_STORAGE_BACKEND}")
+    return _storage
@@ -0,0 +1,259 @@
+# app/modules/media/streaming.py
+"""
+Envío de archivos con soporte de Range Requests (seek en el reproductor).
+
+- Se lee y envía en bloques de MEDIA_STREAM_CHUNK_BYTES: la memoria por
+  petición no depende del tamaño del rango pedido.
+- Los rangos abiertos (`bytes=N-`, lo que piden los navegadores al hacer
+  seek) se recortan a MEDIA_STREAM_MAX_RANGE_BYTES; el reproductor pide el
+  siguiente tramo cuando lo necesita.
+- Rangos sufijo (`bytes=-500`), varios rangos (multipart/byteranges) e If-Range.
+- Si el servidor ASGI ofrece la extensión `http.response.zerocopysend`, el
+  archivo se envía con sendfile sin pasar por Python.
+"""
+import mimetypes
+import os
+import stat
+from email.utils import formatdate
+from secrets import token_hex
+
+import anyio
+from starlette.responses import Response
+
+from app.core.config import MEDIA_STREAM_CHUNK_BYTES, MEDIA_STREAM_MAX_RANGE_BYTES
+
+# Tipos que mimetypes no conoce en todas las plataformas
+mimetypes.add_type("video/mp4", ".mp4")
+mimetypes.add_type("video/mp4", ".m4v")
+mimetypes.add_type("video/webm", ".webm")
+mimetypes.add_type("video/x-matroska", ".mkv")
+mimetypes.add_type("video/quicktime", ".mov")
+mimetypes.add_type("audio/mp4", ".m4a")
+mimetypes.add_type("application/vnd.apple.mpegurl", ".m3u8")
+mimetypes.add_type("video/mp2t", ".ts")
+mimetypes.add_type("text/vtt", ".vtt")
+
+# Más rangos que esto en una sola petición se ignoran (se responde el archivo completo)
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def guess_media_type(path: str) -> str:
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def parse_range_header(range_header: str, file_size: int, max_open_range: int = MEDIA_STREAM_MAX_RANGE_BYTES):
+    """
+    Convierte un header Range en una lista de rangos (inicio, fin) inclusivos,
+    ordenados y sin solapamientos. Devuelve None si el header no es válido o no
+    es de bytes (se ignora y se responde el archivo completo, como indica la RFC 9110).
+    Lanza RangeNotSatisfiable si ningún rango cae dentro del archivo.
+    """
+    units, _, spec = range_header.partition("=")
+    if units.strip().lower() != "bytes" or not spec.strip():
+        return None
+
+    parts = spec.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        start_str, sep, end_str = part.strip().partition("-")
+        start_str, end_str = start_str.strip(), end_str.strip()
+        if not sep or not (start_str.isdigit() or end_str.isdigit()):
+            return None
+        if start_str and end_str and not (start_str.isdigit() and end_str.isdigit()):
+            return None
+
+        if not start_str:
+            # Sufijo: los últimos N bytes
+            suffix = int(end_str)
+            if suffix == 0:
+                continue
+            start, end = max(0, file_size - suffix), file_size - 1
+        else:
+            start = int(start_str)
+            if end_str:
+                end = int(end_str)
+                if end < start:
+                    return None
+                end = min(end, file_size - 1)
+            else:
+                # Rango abierto: se recorta a la ventana configurada
+                end = min(file_size - 1, start + max_open_range - 1)
+
+        if start >= file_size:
+            continue
+        ranges.append((start, end))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    # Unir rangos solapados o contiguos
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class RangeFileResponse(Response):
+    """
+    Respuesta de archivo con Range Requests. Se construye con la ruta y los
+    headers de la petición; decide en el momento de enviar si responde 200,
+    206 (uno o varios rangos) o 416.
+    """
+
+    chunk_size = MEDIA_STREAM_CHUNK_BYTES
+
+    def __init__(
+        self,
+        path: str,
+        request_headers,
+        media_type: str = None,
+        headers: dict = None,
+        file_size: int = None,
+        etag: str = None,
+        last_modified: float = None
+    ):
+        self.path = path
+        self.request_headers = request_headers
+        self.media_type = media_type or guess_media_type(path)
+        self.status_code = 200
+        self.background = None
+        self.init_headers(headers)
+
+        # Con los metadatos ya conocidos (media_files) no se consulta el disco
+        if file_size is None or etag is None or last_modified is None:
+            stat_result = os.stat(path)
+            if not stat.S_ISREG(stat_result.st_mode):
+                raise FileNotFoundError(path)
+            file_size = stat_result.st_size
+            last_modified = stat_result.st_mtime
+            etag = f"{int(stat_result.st_mtime)}-{stat_result.st_size:x}"
+        self.file_size = file_size
+
+        self.headers.setdefault("accept-ranges", "bytes")
+        self.headers.setdefault("last-modified", formatdate(last_modified, usegmt=True))
+        self.headers.setdefault("etag", f'"{etag}"')
+
+    def _wants_range(self) -> bool:
+        if "range" not in self.request_headers:
+            return False
+        # If-Range: solo se respetan los rangos si el archivo no cambió
+        if_range = self.request_headers.get("if-range")
+        if if_range is None:
+            return True
+        return if_range in (self.headers["etag"], self.headers["last-modified"])
+
+    async def __call__(self, scope, receive, send) -> None:
+        header_only = scope["method"].upper() == "HEAD"
+        zerocopy = "http.response.zerocopysend" in scope.get("extensions", {})
+
+        # Si el cliente se desconecta (seek, cerrar pestaña) se deja de leer el archivo
+        async with anyio.create_task_group() as task_group:
+
+            async def watch_disconnect():
+                while (await receive())["type"] != "http.disconnect":
+                    pass
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(watch_disconnect)
+            await self._respond(send, header_only, zerocopy)
+            task_group.cancel_scope.cancel()
+
+    async def _respond(self, send, header_only: bool, zerocopy: bool) -> None:
+        ranges = None
+        if self._wants_range():
+            try:
+                ranges = parse_range_header(self.request_headers["range"], self.file_size)
+            except RangeNotSatisfiable:
+                self.headers["content-range"] = f"bytes */{self.file_size}"
+                self.headers["content-length"] = "0"
+                await self._send_start(send, 416)
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if not ranges:
+            self.headers["content-length"] = str(self.file_size)
+            await self._send_start(send, 200)
+            if not header_only:
+                whole_file = [(0, self.file_size - 1)] if self.file_size else []
+                await self._send_ranges(send, whole_file, zerocopy)
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.file_size}"
+            self.headers["content-length"] = str(end - start + 1)
+            await self._send_start(send, 206)
+            if not header_only:
+                await self._send_ranges(send, ranges, zerocopy)
+        else:
+            await self._send_multipart(send, ranges, header_only, zerocopy)
+
+        if header_only:
+            await send({"type": "http.response.body", "body": b""})
+
+    async def _send_start(self, send, status: int) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": self.raw_headers})
+
+    async def _send_ranges(self, send, ranges, zerocopy: bool, parts=None, closing: bytes = b"") -> None:
+        """
+        Envía los rangos en bloques. `parts` son los encabezados de cada parte
+        (multipart) y `closing` lo que va al final.
+        """
+        async with await anyio.open_file(self.path, "rb") as file:
+            for index, (start, end) in enumerate(ranges):
+                if parts is not None:
+                    await send({"type": "http.response.body", "body": parts[index], "more_body": True})
+
+                if zerocopy:
+                    await send({
+                        "type": "http.response.zerocopysend",
+                        "file": file.wrapped,
+                        "offset": start,
+                        "count": end - start + 1,
+                        "more_body": True,
+                    })
+                    continue
+
+                await file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        raise RuntimeError(f"El archivo {self.path} es más corto de lo esperado")
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        await send({"type": "http.response.body", "body": closing, "more_body": False})
+
+    async def _send_multipart(self, send, ranges, header_only: bool, zerocopy: bool) -> None:
+        boundary = token_hex(13)
+        parts = [
+            (
+                f"--{boundary}\r\n"
+                f"Content-Type: {self.media_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{self.file_size}\r\n\r\n"
+            ).encode("latin-1")
+            for start, end in ranges
+        ]
+        # Cada parte termina en CRLF; el cierre va después de la última
+        parts = [parts[0]] + [b"\r\n" + part for part in parts[1:]]
+        closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+
+        content_length = sum(len(part) for part in parts) + len(closing)
+        content_length += sum(end - start + 1 for start, end in ranges)
+
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(content_length)
+        await self._send_start(send, 206)
+        if not header_only:
+            await self._send_ranges(send, ranges, zerocopy, parts=parts, closing=closing)
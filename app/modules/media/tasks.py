@@ -0,0 +1,98 @@
+# app/modules/media/tasks.py
+"""
+Tareas de mantenimiento de archivos.
+
+Uso:
+    python -m app.modules.media.tasks expire-uploads
+    python -m app.modules.media.tasks probe-media
+    python -m app.modules.media.tasks sweep-orphans [--apply] [--quarantine] [--grace-hours 72]
+    python -m app.modules.media.tasks shard-uploads [--apply] [--max-moves-per-second 200]
+
+sweep-orphans y shard-uploads solo muestran el reporte salvo que se pase --apply.
+"""
+import argparse
+
+from app.core.database import SessionLocal
+# Modelos relacionados con Course/Lesson: necesarios para configurar los mappers fuera de la API
+from app.modules.reviews.models import Review  # noqa: F401
+from app.modules.instructors.models import InstructorProfile  # noqa: F401
+from app.modules.users.models import User  # noqa: F401
+from app.modules.media.uploads import expire_abandoned_uploads
+from app.modules.media.blobs import backfill_media_metadata
+from app.modules.media.gc import sweep_orphans
+from app.modules.media.sharding import move_flat_files, rewrite_media_urls
+from app.modules.media.storage import get_storage
+from app.core.config import MEDIA_GC_GRACE_HOURS, MEDIA_GC_MAX_DELETES_PER_SECOND
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de archivos subidos")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("expire-uploads", help="Borra las subidas reanudables abandonadas")
+    subparsers.add_parser("probe-media", help="Completa tipo y duración de archivos y lecciones sin ellos")
+    sweep = subparsers.add_parser("sweep-orphans", help="Busca y borra archivos de uploads/ que nada usa")
+    sweep.add_argument("--apply", action="store_true", help="Borrar de verdad (por defecto solo reporta)")
+    sweep.add_argument("--quarantine", action="store_true", help="Mover a uploads/.quarantine en vez de borrar")
+    sweep.add_argument("--grace-hours", type=float, default=MEDIA_GC_GRACE_HOURS)
+    sweep.add_argument("--batch-size", type=int, default=500)
+    sweep.add_argument("--max-deletes-per-second", type=float, default=MEDIA_GC_MAX_DELETES_PER_SECOND)
+    sweep.add_argument("--list", action="store_true", help="Mostrar cada archivo huérfano")
+    shard = subparsers.add_parser("shard-uploads", help="Mueve uploads/ a carpetas de dos niveles y reescribe las URLs")
+    shard.add_argument("--apply", action="store_true", help="Mover y reescribir de verdad (por defecto solo reporta)")
+    shard.add_argument("--batch-size", type=int, default=500)
+    shard.add_argument("--max-moves-per-second", type=float, default=200)
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "expire-uploads":
+            expired = expire_abandoned_uploads(db)
+            print(f"Subidas expiradas borradas: {expired}")
+        elif args.command == "probe-media":
+            result = backfill_media_metadata(db)
+            print(f"Archivos analizados: {result['media_probed']} | Lecciones actualizadas: {result['lessons_updated']}")
+        elif args.command == "sweep-orphans":
+            if not get_storage().is_local:
+                print("El almacenamiento no es local: no hay carpeta uploads/ que limpiar")
+                return
+            report = sweep_orphans(
+                db,
+                grace_hours=args.grace_hours,
+                dry_run=not args.apply,
+                quarantine=args.quarantine,
+                batch_size=args.batch_size,
+                max_deletes_per_second=args.max_deletes_per_second,
+            )
+            if args.list:
+                for path in report["orphans"]:
+                    print(path)
+            action = "en cuarentena" if args.quarantine else "borrados"
+            print(
+                f"Revisados: {report['scanned']} | En uso: {report['in_use']} | "
+                f"Recientes: {report['recent']} | Huérfanos: {len(report['orphans'])} "
+                f"({report['orphan_bytes'] / (1024 * 1024):.1f} MB) | "
+                + (f"{action.capitalize()}: {report['removed']}" if args.apply else "Simulación: no se borró nada")
+            )
+        elif args.command == "shard-uploads":
+            if not get_storage().is_local:
+                print("El almacenamiento no es local: no hay carpeta uploads/ que migrar")
+                return
+            files = move_flat_files(
+                db,
+                dry_run=not args.apply,
+                batch_size=args.batch_size,
+                max_moves_per_second=args.max_moves_per_second,
+            )
+            urls = rewrite_media_urls(db, dry_run=not args.apply, batch_size=args.batch_size)
+            verb = "movidos" if args.apply else "por mover"
+            print(f"Archivos {verb}: {files['files_moved']} | Subidas en curso (se dejan): {files['files_skipped']}")
+            verb = "reescritas" if args.apply else "por reescribir"
+            print(f"URLs {verb}: " + " | ".join(f"{field}: {count}" for field, count in urls.items()))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+# app/modules/media/uploads.py
+"""
+Subidas reanudables (estilo tus: https://tus.io/protocols/resumable-upload).
+
+1. POST   /files/uploads                 -> crea la subida (archivo vacío en su ubicación final)
+2. PATCH  /files/uploads/{id}            -> agrega un bloque en Upload-Offset
+3. HEAD   /files/uploads/{id}            -> consulta el offset confirmado (para reanudar)
+4. POST   /files/uploads/{id}/complete   -> cierra la subida y devuelve la URL
+
+Cada bloque se escribe directo en el archivo final, sin pasar por un archivo
+temporal. Si trae Upload-Checksum y no coincide, se descarta y el offset no avanza.
+Mientras se escribe un bloque la fila de la subida queda bloqueada (FOR UPDATE):
+un segundo PATCH, el cierre o la cancelación de esa subida responden 409 en vez
+de escribir a la vez en el mismo archivo.
+
+El SHA-256 del archivo completo se va calculando bloque a bloque (en memoria
+del proceso) para deduplicarlo al cerrar la subida (ver media/blobs.py). Solo
+se deduplica con el hash de lo que realmente se recibió: un hash declarado por
+el cliente revelaría qué contenidos existen y permitiría reclamar archivos
+ajenos sin tenerlos.
+"""
+import base64
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import anyio
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
+
+from app.core.cache import TTLCache
+from app.core.config import (
+    MEDIA_UPLOAD_MAX_BYTES,
+    MEDIA_UPLOAD_CHUNK_MAX_BYTES,
+    MEDIA_UPLOAD_EXPIRE_HOURS,
+)
+from app.modules.media.models import UploadSession
+from app.modules.media.blobs import register_blob
+from app.modules.media import storage
+
+# Hash parcial de cada subida en curso: {upload_id: (offset, hasher)}.
+# Si el proceso se reinicia o el bloque llega a otro worker, se recalcula al cerrar.
+upload_hashers = TTLCache(ttl_seconds=MEDIA_UPLOAD_EXPIRE_HOURS * 3600, maxsize=1000)
+
+# Algoritmos aceptados en Upload-Checksum ("sha256 <base64>")
+CHECKSUM_ALGORITHMS = {"sha1", "sha256", "md5"}
+
+
+def upload_path(stored_name: str) -> str:
+    # Subidas creadas antes de las carpetas de dos niveles siguen en la raíz
+    return storage.find_upload(stored_name) or storage.upload_path(stored_name)
+
+
+def _expires_at() -> datetime:
+    return datetime.utcnow() + timedelta(hours=MEDIA_UPLOAD_EXPIRE_HOURS)
+
+
+def create_upload_session(db: Session, user_id, filename: str, size: int) -> UploadSession:
+    if size > MEDIA_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El archivo supera el máximo permitido ({MEDIA_UPLOAD_MAX_BYTES // (1024 * 1024)} MB)"
+        )
+
+    extension = os.path.splitext(os.path.basename(filename))[1][:16]
+    stored_name = f"{uuid.uuid4()}{extension}"
+
+    # El archivo se crea vacío en su ubicación final
+    open(storage.upload_path(stored_name), "xb").close()
+
+    session = UploadSession(
+        user_id=user_id,
+        filename=os.path.basename(filename),
+        stored_name=stored_name,
+        size=size,
+        expires_at=_expires_at()
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    return session
+
+
+def get_upload_session(db: Session, upload_id, user_id, lock: bool = False) -> UploadSession:
+    """
+    Subida del usuario. Con lock=True bloquea la fila hasta el próximo commit o
+    rollback; si otra petición ya la tiene bloqueada responde 409 sin esperar.
+    """
+    query = db.query(UploadSession).filter(UploadSession.id == upload_id)
+    if lock:
+        query = query.with_for_update(nowait=True)
+    try:
+        session = query.first()
+    except OperationalError as e:
+        db.rollback()
+        if getattr(e.orig, "pgcode", None) != "55P03":  # lock_not_available
+            raise
+        raise HTTPException(status_code=409, detail="Otra petición está modificando esta subida")
+    if not session or session.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Subida no encontrada")
+    if session.status == "UPLOADING" and session.expires_at < datetime.utcnow():
+        raise HTTPException(status_code=410, detail="La subida expiró")
+    return session
+
+
+def parse_checksum(header: str):
+    """'sha256 <base64>' -> (hasher, digest esperado). Lanza 400 si no es válido."""
+    try:
+        algorithm, encoded = header.strip().split(" ", 1)
+        expected = base64.b64decode(encoded.strip(), validate=True)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Upload-Checksum inválido")
+    if algorithm.lower() not in CHECKSUM_ALGORITHMS:
+        raise HTTPException(status_code=400, detail=f"Algoritmo de checksum no soportado: {algorithm}")
+    return hashlib.new(algorithm.lower()), expected
+
+
+async def write_chunk(session: UploadSession, request, offset: int, checksum: str = None):
+    """
+    Escribe el cuerpo de la petición en el archivo a partir de `offset`, a
+    medida que llega. Devuelve (bytes aceptados, hash del archivo hasta el
+    final del bloque o None). Si se descartó el bloque, los bytes son 0.
+    No toca la base de datos: `session` debe venir bloqueada
+    (get_upload_session con lock=True) hasta confirm_chunk o el rollback.
+    """
+    if session.status != "UPLOADING":
+        raise HTTPException(status_code=409, detail="La subida ya está completa")
+    if offset != session.offset:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload-Offset no coincide (esperado {session.offset})",
+            headers={"Upload-Offset": str(session.offset)}
+        )
+
+    limit = min(MEDIA_UPLOAD_CHUNK_MAX_BYTES, session.size - offset)
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail=f"El bloque supera el máximo permitido ({limit} bytes)")
+
+    hasher, expected = parse_checksum(checksum) if checksum else (None, None)
+    content_hasher = _content_hasher(session.id, offset)
+    path = upload_path(session.stored_name)
+    written = 0
+    complete = False
+
+    async with await anyio.open_file(path, "r+b") as file:
+        await file.seek(offset)
+        try:
+            async for data in request.stream():
+                written += len(data)
+                if written > limit:
+                    break
+                if hasher:
+                    hasher.update(data)
+                if content_hasher is not None:
+                    content_hasher.update(data)
+                await file.write(data)
+            else:
+                complete = True
+        except ClientDisconnect:
+            pass
+
+        discard = written > limit or (hasher is not None and (not complete or hasher.digest() != expected))
+        if discard:
+            # Se vuelve al último offset confirmado
+            await file.truncate(offset)
+            await file.flush()
+
+    if written > limit:
+        raise HTTPException(status_code=413, detail=f"El bloque supera el máximo permitido ({limit} bytes)")
+    if discard and complete:
+        raise HTTPException(status_code=460, detail="El checksum del bloque no coincide")
+    if discard:
+        return 0, None
+    return written, content_hasher
+
+
+def _content_hasher(upload_id, offset: int):
+    """Copia del hash acumulado hasta `offset` (None si no se conoce)."""
+    if offset == 0:
+        return hashlib.sha256()
+    entry = upload_hashers.get(upload_id)
+    if entry is None or entry[0] != offset:
+        return None
+    return entry[1].copy()
+
+
+def confirm_chunk(db: Session, session: UploadSession, offset: int, written: int, content_hasher=None) -> int:
+    """
+    Avanza el offset y libera el bloqueo de la subida (commit). El filtro por
+    offset es una segunda barrera por si la fila no venía bloqueada.
+    Devuelve el offset nuevo.
+    """
+    updated = db.query(UploadSession).filter(
+        UploadSession.id == session.id,
+        UploadSession.offset == offset,
+        UploadSession.status == "UPLOADING"
+    ).update(
+        {UploadSession.offset: offset + written, UploadSession.expires_at: _expires_at()},
+        synchronize_session=False
+    )
+    db.commit()
+    if not updated:
+        raise HTTPException(status_code=409, detail="La subida cambió mientras se enviaba el bloque")
+    if content_hasher is not None:
+        upload_hashers.set(session.id, (offset + written, content_hasher))
+    return offset + written
+
+
+def complete_upload_session(db: Session, session: UploadSession) -> UploadSession:
+    """
+    Cierra la subida y la deduplica: si el contenido ya existía, se borra lo
+    subido y la subida apunta al archivo existente.
+    """
+    if session.status == "COMPLETED":
+        return session
+    if session.offset != session.size:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Faltan datos: recibidos {session.offset} de {session.size} bytes"
+        )
+
+    path = upload_path(session.stored_name)
+    entry = upload_hashers.get(session.id)
+    if entry is not None and entry[0] == session.size:
+        sha256 = entry[1].hexdigest()
+    else:
+        # Sin el hash acumulado (reinicio u otro worker): se lee el archivo una vez
+        sha256 = _hash_file(path)
+
+    media_file = register_blob(db, path, sha256, session.size, session.filename, session.user_id)
+    session.stored_name = media_file.stored_name
+    session.status = "COMPLETED"
+    db.commit()
+    upload_hashers.delete(session.id)
+    db.refresh(session)
+    return session
+
+
+def _hash_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def delete_upload_session(db: Session, session: UploadSession) -> None:
+    if session.status != "UPLOADING":
+        raise HTTPException(status_code=409, detail="La subida ya está completa")
+    try:
+        os.remove(upload_path(session.stored_name))
+    except FileNotFoundError:
+        pass
+    db.delete(session)
+    db.commit()
+    upload_hashers.delete(session.id)
+
+
+def expire_abandoned_uploads(db: Session) -> int:
+    """
+    Borra las subidas sin completar que expiraron (archivo y registro).
+    Salta las que tienen un bloque escribiéndose en este momento.
+    """
+    expired = db.query(UploadSession).filter(
+        UploadSession.status == "UPLOADING",
+        UploadSession.expires_at < datetime.utcnow()
+    ).with_for_update(skip_locked=True).all()
+
+    for session in expired:
+        try:
+            os.remove(upload_path(session.stored_name))
+        except FileNotFoundError:
+            pass
+        db.delete(session)
+        upload_hashers.delete(session.id)
+    db.commit()
+    return len(expired)
@@ -0,0 +1,18 @@
+# app/modules/media/urls.py
+"""
+Nombre del archivo al final de una URL /media/... en SQL.
+
+Las columnas con URLs de archivos subidos tienen un índice sobre esta misma
+expresión (ver los modelos de cursos y categorías), así que buscar por nombre
+de archivo es una lectura por índice y no un LIKE '%/<nombre>' que recorre la
+tabla entera. El módulo no importa modelos para poder usarse desde ellos.
+"""
+from sqlalchemy import func
+
+# Expresión regular de PostgreSQL: /media/<nombre>, /media/aa/bb/<nombre>, http://.../media/...
+MEDIA_URL_NAME_PATTERN = r"/media/(?:[^/?#]+/)*([^/?#]+)$"
+
+
+def media_url_name(column):
+    """substring(column, patrón): NULL si la URL no es de un archivo subido."""
+    return func.substring(column, MEDIA_URL_NAME_PATTERN)
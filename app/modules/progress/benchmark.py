@@ -0,0 +1,179 @@
+# app/modules/progress/benchmark.py
+"""
+Benchmark de user_lesson_progress con y sin particionado HASH(user_id).
+
+Crea dos tablas de prueba con las mismas columnas e índices que
+user_lesson_progress (una normal y otra con PROGRESS_PARTITIONS particiones),
+las llena con INSERT ... SELECT generate_series por lotes y compara:
+
+- rendimiento de la carga (filas/s por lote, el último lote es el más lento),
+- latencia del INSERT de una fila (el toggle de progreso) con la tabla llena,
+- latencia de la lectura de GET /progress/{course_id} (usuario + curso),
+- tamaño en disco de tablas e índices.
+
+Los ids son md5 deterministas, así las lecturas eligen usuarios que existen.
+Las tablas no llevan claves foráneas (no hay 100M de usuarios reales) y se
+borran al terminar salvo con --keep. Con 100M de filas la carga tarda horas y
+ocupa decenas de GB: conviene probar antes con --rows 1000000.
+
+Uso:
+    python -m app.modules.progress.benchmark [--rows 100000000] [--batch 1000000] [-n 2000]
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.modules.progress.models import PROGRESS_PARTITIONS
+
+PLAIN_TABLE = "bench_progress_plain"
+PARTITIONED_TABLE = "bench_progress_partitioned"
+
+
+def md5_uuid(prefix: str, value: int) -> uuid.UUID:
+    """Mismo valor que md5(prefix || value)::uuid en Postgres."""
+    return uuid.UUID(hashlib.md5(f"{prefix}{value}".encode()).hexdigest())
+
+
+def create_tables(conn) -> None:
+    for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    columns = """
+        id uuid NOT NULL DEFAULT uuid_generate_v7(),
+        user_id uuid NOT NULL,
+        lesson_id uuid NOT NULL,
+        course_id uuid NOT NULL,
+        completed_at timestamp DEFAULT NOW(),
+        PRIMARY KEY (id, user_id),
+        UNIQUE (user_id, lesson_id)
+    """
+    conn.execute(text(f"CREATE TABLE {PLAIN_TABLE} ({columns})"))
+    conn.execute(text(f"CREATE TABLE {PARTITIONED_TABLE} ({columns}) PARTITION BY HASH (user_id)"))
+    for remainder in range(PROGRESS_PARTITIONS):
+        conn.execute(text(
+            f"CREATE TABLE {PARTITIONED_TABLE}_p{remainder} PARTITION OF {PARTITIONED_TABLE} "
+            f"FOR VALUES WITH (MODULUS {PROGRESS_PARTITIONS}, REMAINDER {remainder})"
+        ))
+    for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+        conn.execute(text(f"CREATE INDEX ON {table} (user_id, course_id)"))
+        conn.execute(text(f"CREATE INDEX ON {table} (lesson_id)"))
+    conn.commit()
+
+
+def seed(conn, table: str, rows: int, users: int, lessons_per_course: int, batch: int) -> list:
+    """
+    Carga las filas g = 0..rows-1: usuario g % users, lección g / users.
+    Cada lote reparte sus filas entre todos los usuarios, como el tráfico real.
+    Devuelve las filas/s de cada lote.
+    """
+    throughput = []
+    for start in range(0, rows, batch):
+        end = min(start + batch, rows) - 1
+        started = time.perf_counter()
+        conn.execute(text(f"""
+            INSERT INTO {table} (user_id, lesson_id, course_id)
+            SELECT md5('u' || (g % :users))::uuid,
+                   md5('l' || (g / :users))::uuid,
+                   md5('c' || ((g / :users) / :per_course))::uuid
+            FROM generate_series(CAST(:start AS bigint), CAST(:end AS bigint)) AS g
+        """), {"users": users, "per_course": lessons_per_course, "start": start, "end": end})
+        conn.commit()
+        throughput.append((end - start + 1) / (time.perf_counter() - started))
+    conn.execute(text(f"ANALYZE {table}"))
+    conn.commit()
+    return throughput
+
+
+def measure_inserts(conn, table: str, users: int, first_lesson: int, samples: int) -> list:
+    """Toggle de progreso: una fila nueva por transacción (lecciones fuera de la carga)."""
+    latencies = []
+    for i in range(samples):
+        user = random.randrange(users)
+        started = time.perf_counter()
+        conn.execute(
+            text(f"INSERT INTO {table} (user_id, lesson_id, course_id) VALUES (:u, :l, :c)"),
+            {"u": md5_uuid("u", user), "l": md5_uuid("l", first_lesson + i), "c": md5_uuid("c", -1)}
+        )
+        conn.commit()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def measure_lookups(conn, table: str, users: int, courses: int, samples: int) -> list:
+    """GET /progress/{course_id}: lecciones completadas de un usuario en un curso."""
+    latencies = []
+    for _ in range(samples):
+        params = {"u": md5_uuid("u", random.randrange(users)), "c": md5_uuid("c", random.randrange(courses))}
+        started = time.perf_counter()
+        conn.execute(
+            text(f"SELECT lesson_id FROM {table} WHERE user_id = :u AND course_id = :c"), params
+        ).fetchall()
+        latencies.append((time.perf_counter() - started) * 1000)
+    conn.rollback()
+    return latencies
+
+
+def total_size_mb(conn, table: str) -> float:
+    """Tabla + índices, sumando todas las particiones si las hay."""
+    size = conn.execute(text("""
+        SELECT coalesce(
+            (SELECT sum(pg_total_relation_size(relid)) FROM pg_partition_tree(CAST(:t AS regclass))),
+            pg_total_relation_size(CAST(:t AS regclass))
+        )
+    """), {"t": table}).scalar()
+    return size / (1024 * 1024)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del particionado de user_lesson_progress")
+    parser.add_argument("--rows", type=int, default=100_000_000)
+    parser.add_argument("--lessons-per-user", type=int, default=50)
+    parser.add_argument("--lessons-per-course", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=1_000_000)
+    parser.add_argument("-n", "--samples", type=int, default=2000)
+    parser.add_argument("--keep", action="store_true", help="No borrar las tablas al terminar")
+    args = parser.parse_args()
+
+    users = max(1, args.rows // args.lessons_per_user)
+    lessons = -(-args.rows // users)
+    courses = max(1, lessons // args.lessons_per_course)
+
+    conn = engine.connect()
+    try:
+        create_tables(conn)
+        print(f"{args.rows:,} filas: {users:,} usuarios x {lessons} lecciones, {PROGRESS_PARTITIONS} particiones")
+        print(
+            f"{'tabla':<16}{'carga filas/s':>15}{'último lote':>13}"
+            f"{'insert p50':>12}{'insert p99':>12}{'lectura p50':>13}{'lectura p99':>13}{'MB':>10}"
+        )
+        for name, table in (("sin particionar", PLAIN_TABLE), ("particionada", PARTITIONED_TABLE)):
+            throughput = seed(conn, table, args.rows, users, args.lessons_per_course, args.batch)
+            inserts = measure_inserts(conn, table, users, lessons, args.samples)
+            lookups = measure_lookups(conn, table, users, courses, args.samples)
+            print(
+                f"{name:<16}{statistics.mean(throughput):>15,.0f}{throughput[-1]:>13,.0f}"
+                f"{percentile(inserts, 0.5):>10.2f}ms{percentile(inserts, 0.99):>10.2f}ms"
+                f"{percentile(lookups, 0.5):>11.2f}ms{percentile(lookups, 0.99):>11.2f}ms"
+                f"{total_size_mb(conn, table):>10,.0f}"
+            )
+    finally:
+        conn.rollback()
+        if not args.keep:
+            for table in (PLAIN_TABLE, PARTITIONED_TABLE):
+                conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
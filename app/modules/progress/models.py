@@ -1,13 +1,23 @@
-from sqlalchemy import Column, ForeignKey, DateTime, text, UniqueConstraint
+from sqlalchemy import Column, ForeignKey, DateTime, Date, Integer, text, UniqueConstraint, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
+
+# Número de particiones hash de user_lesson_progress (cambiarlo requiere migración)
+PROGRESS_PARTITIONS = 16
 
 class UserLessonProgress(Base):
+    """
+    Lecciones completadas por cada usuario.
+    La tabla está particionada por HASH(user_id): todas las consultas filtran por
+    usuario, así Postgres solo toca una partición (partition pruning).
+    Por eso user_id forma parte de la clave primaria.
+    """
     __tablename__ = "user_lesson_progress"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
     lesson_id = Column(UUID(as_uuid=True), ForeignKey("lessons.id"), nullable=False)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
     completed_at = Column(DateTime, server_default=text("NOW()"))
@@ -17,7 +27,65 @@ class UserLessonProgress(Base):
     # lesson = relationship("Lesson")
     # course = relationship("Course")
 
-    # Constraint para evitar duplicados (un usuario no puede completar la misma lección 2 veces)
     __table_args__ = (
+        # Constraint para evitar duplicados (un usuario no puede completar la misma lección 2 veces)
         UniqueConstraint('user_id', 'lesson_id', name='unique_user_lesson_progress'),
+        # Progreso de un curso (GET /progress/{course_id})
+        Index('ix_user_lesson_progress_user_course', 'user_id', 'course_id'),
+        # Borrado de lecciones (recorre todas las particiones, pero por índice)
+        Index('ix_user_lesson_progress_lesson', 'lesson_id'),
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
+
+
+# create_all solo crea la tabla padre; las particiones se crean justo después
+for _remainder in range(PROGRESS_PARTITIONS):
+    event.listen(
+        UserLessonProgress.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS user_lesson_progress_p{_remainder} "
+            f"PARTITION OF user_lesson_progress "
+            f"FOR VALUES WITH (MODULUS {PROGRESS_PARTITIONS}, REMAINDER {_remainder})"
+        )
     )
+
+
+class CourseProgressSummary(Base):
+    """
+    Contador de lecciones completadas por (usuario, curso).
+    Se mantiene en la misma transacción que el toggle de progreso, así que
+    consultar el avance de un curso es una lectura de una sola fila.
+    """
+    __tablename__ = "course_progress_summaries"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    completed_lessons = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    last_completed_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, server_default=text("NOW()"), onupdate=text("NOW()"))
+
+
+class LessonWatchPosition(Base):
+    """
+    Última posición de reproducción de un video por (usuario, lección).
+    Se escribe en bloque desde app.modules.progress.positions, nunca por heartbeat.
+    """
+    __tablename__ = "lesson_watch_positions"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    lesson_id = Column(UUID(as_uuid=True), ForeignKey("lessons.id", ondelete="CASCADE"), primary_key=True)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    position_seconds = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=text("NOW()"))
+
+
+class UserActivityDay(Base):
+    """
+    Días en que cada usuario tuvo actividad (completó una lección o vio un video).
+    Una fila por día, que nunca se reescribe: de aquí sale la racha del resumen.
+    """
+    __tablename__ = "user_activity_days"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
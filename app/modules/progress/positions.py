@@ -0,0 +1,263 @@
+# app/modules/progress/positions.py
+"""
+Posición de reproducción de los videos ("continuar donde lo dejaste").
+
+El reproductor envía la posición cada pocos segundos. En lugar de escribir en la
+base de datos en cada heartbeat, las posiciones se guardan en memoria (solo la
+última por usuario y lección) y un hilo en segundo plano las persiste en bloque
+cada WATCH_POSITION_FLUSH_SECONDS.
+
+Solo se aceptan posiciones de lecciones que el alumno puede ver (inscrito en
+el curso): play_lesson deja el permiso en memoria al entregar el video, así
+los heartbeats no consultan la base de datos. La posición se recorta a la
+duración de la lección.
+"""
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import WATCH_POSITION_FLUSH_SECONDS, WATCH_COMPLETE_FRACTION, WATCH_POSITION_ACCESS_CACHE_SECONDS
+from app.core.database import SessionLocal
+from app.modules.courses.models import Section, Lesson
+from app.modules.enrollments.models import Enrollment
+from app.modules.progress.models import LessonWatchPosition, UserLessonProgress
+from app.modules.progress import service as progress_service
+
+logger = logging.getLogger(__name__)
+
+# Filas por sentencia INSERT al persistir
+FLUSH_BATCH_SIZE = 1000
+
+
+class WatchPositionBuffer:
+    """Buffer en memoria de posiciones pendientes, indexado por (user_id, lesson_id)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def record(self, user_id: UUID, lesson_id: UUID, course_id: UUID, position_seconds: int) -> None:
+        with self._lock:
+            self._pending[(user_id, lesson_id)] = (course_id, position_seconds, datetime.utcnow())
+
+    def peek(self, user_id: UUID, lesson_id: UUID):
+        with self._lock:
+            entry = self._pending.get((user_id, lesson_id))
+        return entry[1] if entry else None
+
+    def drain(self) -> dict:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: dict) -> None:
+        """Devuelve al buffer lo que no se pudo guardar, sin pisar posiciones más nuevas."""
+        with self._lock:
+            for key, entry in pending.items():
+                self._pending.setdefault(key, entry)
+
+    def __len__(self):
+        return len(self._pending)
+
+
+watch_positions = WatchPositionBuffer()
+
+# Lecciones cuya posición puede reportar cada alumno: {(user_id, lesson_id): (course_id, duración)}
+position_access = TTLCache(ttl_seconds=WATCH_POSITION_ACCESS_CACHE_SECONDS)
+
+
+def grant_position_updates(user_id: UUID, lesson_id: UUID, course_id: UUID, duration_seconds: int) -> None:
+    """Llamar cuando ya se comprobó que el alumno puede ver la lección (play_lesson)."""
+    position_access.set((user_id, lesson_id), (course_id, duration_seconds or 0))
+
+
+def authorize_position(db: Session, user_id: UUID, lesson_id: UUID, course_id: UUID) -> int:
+    """
+    Comprueba que el alumno está inscrito en el curso de la lección (en memoria
+    si ya la reprodujo) y devuelve la duración de la lección. 403/404 si no.
+    """
+    granted = position_access.get((user_id, lesson_id))
+    if granted is None:
+        lesson = db.query(Section.course_id, Lesson.duration_seconds).join(
+            Lesson, Lesson.section_id == Section.id
+        ).filter(Lesson.id == lesson_id).first()
+        if lesson is None or lesson.course_id != course_id:
+            raise HTTPException(status_code=404, detail="Lección no encontrada")
+
+        enrolled = db.query(Enrollment.id).filter(
+            Enrollment.user_id == user_id,
+            Enrollment.course_id == course_id
+        ).first()
+        if not enrolled:
+            raise HTTPException(status_code=403, detail="No has comprado este curso")
+
+        granted = (lesson.course_id, lesson.duration_seconds or 0)
+        position_access.set((user_id, lesson_id), granted)
+
+    if granted[0] != course_id:
+        raise HTTPException(status_code=404, detail="Lección no encontrada")
+    return granted[1]
+
+
+def persist_positions(db: Session, pending: dict) -> int:
+    """
+    Guarda en bloque las posiciones y marca como completadas las lecciones vistas
+    por encima de WATCH_COMPLETE_FRACTION. No hace commit.
+    """
+    lesson_ids = {lesson_id for _, lesson_id in pending}
+
+    # Una sola consulta para validar lecciones y obtener su duración y curso
+    lessons = {
+        lesson_id: (course_id, duration)
+        for lesson_id, course_id, duration in db.query(
+            Lesson.id, Section.course_id, Lesson.duration_seconds
+        ).join(Section, Lesson.section_id == Section.id).filter(Lesson.id.in_(lesson_ids)).all()
+    }
+
+    rows = []
+    completions = []
+    for (user_id, lesson_id), (course_id, position, seen_at) in pending.items():
+        lesson = lessons.get(lesson_id)
+        if lesson is None or lesson[0] != course_id:
+            continue  # Lección borrada o curso incorrecto: se descarta
+
+        rows.append({
+            "user_id": user_id,
+            "lesson_id": lesson_id,
+            "course_id": course_id,
+            "position_seconds": position,
+            "updated_at": seen_at,
+        })
+
+        duration = lesson[1] or 0
+        if duration > 0 and position >= duration * WATCH_COMPLETE_FRACTION:
+            completions.append({"user_id": user_id, "lesson_id": lesson_id, "course_id": course_id})
+
+    for start in range(0, len(rows), FLUSH_BATCH_SIZE):
+        stmt = pg_insert(LessonWatchPosition).values(rows[start:start + FLUSH_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LessonWatchPosition.user_id, LessonWatchPosition.lesson_id],
+            set_={
+                "position_seconds": stmt.excluded.position_seconds,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+        db.execute(stmt)
+
+    # Autocompletar: solo cuentan las filas realmente insertadas
+    completed_per_course = defaultdict(int)
+    for start in range(0, len(completions), FLUSH_BATCH_SIZE):
+        stmt = pg_insert(UserLessonProgress).values(completions[start:start + FLUSH_BATCH_SIZE])
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[UserLessonProgress.user_id, UserLessonProgress.lesson_id]
+        ).returning(UserLessonProgress.user_id, UserLessonProgress.course_id)
+        for user_id, course_id in db.execute(stmt):
+            completed_per_course[(user_id, course_id)] += 1
+
+    for (user_id, course_id), count in completed_per_course.items():
+        progress_service.register_lesson_completed(db, user_id, course_id, count=count)
+
+    # Día con actividad (para la racha): la posición se sobrescribe, el día queda
+    progress_service.register_activity(db, [row["user_id"] for row in rows])
+
+    return len(rows)
+
+
+def flush_watch_positions() -> int:
+    """Vacía el buffer a la base de datos. Devuelve cuántas posiciones se guardaron."""
+    pending = watch_positions.drain()
+    if not pending:
+        return 0
+
+    db = SessionLocal()
+    try:
+        try:
+            saved = persist_positions(db, pending)
+            db.commit()
+        except IntegrityError:
+            # Alguna fila no es válida (usuario o lección borrados): se guardan de a una
+            db.rollback()
+            saved = _persist_one_by_one(db, pending)
+    except Exception:
+        # Error de la base de datos (no de los datos): se reintenta en el próximo ciclo
+        db.rollback()
+        watch_positions.restore(pending)
+        raise
+    finally:
+        db.close()
+
+    # El tiempo visto forma parte del resumen global
+    for user_id in {user_id for user_id, _ in pending}:
+        progress_service.invalidate_progress_summary(user_id)
+    return saved
+
+
+def _persist_one_by_one(db: Session, pending: dict) -> int:
+    """Guarda cada posición en su propio savepoint y descarta las que fallan."""
+    saved = 0
+    for key, entry in pending.items():
+        try:
+            with db.begin_nested():
+                saved += persist_positions(db, {key: entry})
+        except IntegrityError:
+            logger.warning("Posición descartada (user_id=%s, lesson_id=%s): no se pudo guardar", *key)
+    db.commit()
+    return saved
+
+
+def get_last_position(db: Session, user_id: UUID, lesson_id: UUID) -> int:
+    """Última posición conocida: primero el buffer, luego la base de datos."""
+    position = watch_positions.peek(user_id, lesson_id)
+    if position is not None:
+        return position
+
+    position = db.query(LessonWatchPosition.position_seconds).filter(
+        LessonWatchPosition.user_id == user_id,
+        LessonWatchPosition.lesson_id == lesson_id
+    ).scalar()
+    return position or 0
+
+
+class _PositionFlusher(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="watch-position-flusher", daemon=True)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                flush_watch_positions()
+            except Exception:
+                logger.exception("No se pudieron guardar las posiciones de reproducción")
+
+
+_flusher = None
+
+
+def start_position_flusher() -> None:
+    global _flusher
+    if _flusher is None:
+        _flusher = _PositionFlusher(WATCH_POSITION_FLUSH_SECONDS)
+        _flusher.start()
+
+
+def stop_position_flusher() -> None:
+    """Detiene el hilo y guarda lo que quede pendiente (al apagar el servidor)."""
+    global _flusher
+    if _flusher is not None:
+        _flusher.stopped.set()
+        _flusher.join()
+        _flusher = None
+    try:
+        flush_watch_positions()
+    except Exception:
+        logger.exception("No se pudieron guardar las posiciones de reproducción")
@@ -3,8 +3,11 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.modules.auth.dependencies import get_current_user
 from app.modules.users.models import User
+from app.modules.courses.models import Section, Lesson
 from app.modules.progress.models import UserLessonProgress
-from app.modules.progress.schemas import ProgressLessonToggle, ProgressResponse
+from app.modules.progress.schemas import ProgressLessonToggle, ProgressResponse, CourseProgressStats, WatchPositionUpdate, ProgressSummary
+from app.modules.progress import service as progress_service
+from app.modules.progress.positions import watch_positions, authorize_position
 from typing import List
 from uuid import UUID
 
@@ -19,7 +22,18 @@ def toggle_lesson_progress(
     """
     Marca o desmarca una lección como completada.
     Si ya existe, la borra (desmarca). Si no existe, la crea (marca).
+    El contador del curso se actualiza en la misma transacción.
     """
+    # La lección debe pertenecer al curso indicado, si no el contador se desvía
+    lesson_course_id = db.query(Section.course_id).join(
+        Lesson, Lesson.section_id == Section.id
+    ).filter(Lesson.id == data.lesson_id).scalar()
+
+    if lesson_course_id is None:
+        raise HTTPException(status_code=404, detail="Lección no encontrada")
+    if lesson_course_id != data.course_id:
+        raise HTTPException(status_code=400, detail="La lección no pertenece a este curso")
+
     existing_progress = db.query(UserLessonProgress).filter(
         UserLessonProgress.user_id == current_user.id,
         UserLessonProgress.lesson_id == data.lesson_id
@@ -28,8 +42,9 @@ def toggle_lesson_progress(
     if existing_progress:
         # Desmarcar
         db.delete(existing_progress)
+        progress_service.register_lesson_uncompleted(db, current_user.id, data.course_id)
         db.commit()
-        return ProgressResponse(lesson_id=data.lesson_id, completed=False)
+        completed_at = None
     else:
         # Marcar
         new_progress = UserLessonProgress(
@@ -38,13 +53,48 @@ def toggle_lesson_progress(
             course_id=data.course_id
         )
         db.add(new_progress)
+        progress_service.register_lesson_completed(db, current_user.id, data.course_id)
+        progress_service.register_activity(db, [current_user.id])
         db.commit()
         db.refresh(new_progress)
-        return ProgressResponse(
-            lesson_id=data.lesson_id, 
-            completed=True,
-            completed_at=new_progress.completed_at
-        )
+        completed_at = new_progress.completed_at
+
+    progress_service.invalidate_progress_summary(current_user.id)
+    completion = progress_service.get_course_completion(db, current_user.id, data.course_id)
+    return ProgressResponse(
+        lesson_id=data.lesson_id,
+        completed=existing_progress is None,
+        completed_at=completed_at,
+        completed_lessons=completion.completed_lessons,
+        total_lessons=completion.total_lessons,
+        progress_percentage=progress_service.progress_percentage(completion.completed_lessons, completion.total_lessons)
+    )
+
+@router.post("/position", status_code=204)
+def update_watch_position(
+    data: WatchPositionUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Heartbeat del reproductor con la posición actual del video.
+    Solo se guarda en memoria; se persiste en bloque cada pocos segundos.
+    Hay que estar inscrito en el curso; la posición se recorta a la duración.
+    """
+    duration = authorize_position(db, current_user.id, data.lesson_id, data.course_id)
+    position = min(data.position_seconds, duration) if duration > 0 else data.position_seconds
+    watch_positions.record(current_user.id, data.lesson_id, data.course_id, position)
+
+@router.get("/summary", response_model=ProgressSummary)
+def get_progress_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Estadísticas globales del usuario: cursos completados, en progreso y sin empezar,
+    tiempo total visto y racha de días con actividad.
+    """
+    return progress_service.get_progress_summary(db, current_user.id)
 
 @router.get("/{course_id}", response_model=List[UUID])
 def get_course_progress(
@@ -63,3 +113,23 @@ def get_course_progress(
     # progress es una lista de tuplas [(uuid,), (uuid,), ...]
     # Lo convertimos a una lista simple [uuid, uuid, ...]
     return [p[0] for p in progress]
+
+@router.get("/{course_id}/stats", response_model=CourseProgressStats)
+def get_course_progress_stats(
+    course_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Devuelve el avance del usuario en el curso (lectura O(1) de los contadores).
+    """
+    completion = progress_service.get_course_completion(db, current_user.id, course_id)
+    if completion is None:
+        raise HTTPException(status_code=404, detail="Curso no encontrado")
+
+    return CourseProgressStats(
+        course_id=course_id,
+        completed_lessons=completion.completed_lessons,
+        total_lessons=completion.total_lessons,
+        progress_percentage=progress_service.progress_percentage(completion.completed_lessons, completion.total_lessons)
+    )
@@ -1,6 +1,6 @@
 from uuid import UUID
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field
+from datetime import datetime, date
 
 class ProgressLessonToggle(BaseModel):
     lesson_id: UUID
@@ -10,3 +10,29 @@ class ProgressResponse(BaseModel):
     lesson_id: UUID
     completed: bool
     completed_at: datetime | None = None
+
+    # Avance del curso después del cambio (evita recalcularlo en el cliente)
+    completed_lessons: int = 0
+    total_lessons: int = 0
+    progress_percentage: int = 0
+
+class CourseProgressStats(BaseModel):
+    course_id: UUID
+    completed_lessons: int
+    total_lessons: int
+    progress_percentage: int
+
+class WatchPositionUpdate(BaseModel):
+    lesson_id: UUID
+    course_id: UUID
+    position_seconds: int = Field(..., ge=0)
+
+class ProgressSummary(BaseModel):
+    """Estadísticas globales del alumno para el dashboard"""
+    courses_enrolled: int = 0
+    courses_completed: int = 0
+    courses_in_progress: int = 0
+    courses_not_started: int = 0
+    total_watched_seconds: int = 0
+    current_streak_days: int = 0
+    last_activity_date: date | None = None
@@ -0,0 +1,273 @@
+# app/modules/progress/service.py
+"""
+Contadores de progreso mantenidos de forma incremental.
+
+- `Course.lessons_count`: total de lecciones del curso.
+- `CourseProgressSummary.completed_lessons`: lecciones completadas por (usuario, curso).
+
+Todas las funciones solo preparan los cambios en la sesión; el commit lo hace
+el endpoint que las llama, así el contador y el dato se guardan juntos.
+"""
+from datetime import timedelta
+from uuid import UUID
+from sqlalchemy import select, update, delete, exists, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import PROGRESS_SUMMARY_CACHE_SECONDS
+from app.modules.courses.models import Course, Section, Lesson
+from app.modules.enrollments.models import Enrollment
+from app.modules.progress.models import UserLessonProgress, CourseProgressSummary, LessonWatchPosition, UserActivityDay
+from app.modules.progress.schemas import ProgressSummary
+
+# Resumen global por usuario (dashboard). Se invalida en cada escritura de progreso.
+summary_cache = TTLCache(ttl_seconds=PROGRESS_SUMMARY_CACHE_SECONDS)
+
+# Días hacia atrás que se revisan para calcular la racha
+STREAK_LOOKBACK_DAYS = 366
+
+
+def register_lesson_completed(db: Session, user_id: UUID, course_id: UUID, count: int = 1) -> None:
+    """Suma `count` al contador del usuario en el curso (crea la fila si no existe)."""
+    stmt = pg_insert(CourseProgressSummary).values(
+        user_id=user_id,
+        course_id=course_id,
+        completed_lessons=count,
+        last_completed_at=func.now()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CourseProgressSummary.user_id, CourseProgressSummary.course_id],
+        set_={
+            "completed_lessons": CourseProgressSummary.completed_lessons + count,
+            "last_completed_at": func.now(),
+            "updated_at": func.now(),
+        }
+    )
+    db.execute(stmt)
+
+
+def register_activity(db: Session, user_ids) -> None:
+    """
+    Registra actividad hoy de `user_ids` (los repetidos se ignoran). El día es
+    current_date de la base de datos, el mismo reloj con el que se calcula la racha.
+    """
+    rows = [{"user_id": user_id, "day": func.current_date()} for user_id in set(user_ids)]
+    if not rows:
+        return
+    stmt = pg_insert(UserActivityDay).values(rows).on_conflict_do_nothing(
+        index_elements=[UserActivityDay.user_id, UserActivityDay.day]
+    )
+    db.execute(stmt)
+
+
+def register_lesson_uncompleted(db: Session, user_id: UUID, course_id: UUID) -> None:
+    """Resta 1 al contador del usuario en el curso."""
+    db.query(CourseProgressSummary).filter(
+        CourseProgressSummary.user_id == user_id,
+        CourseProgressSummary.course_id == course_id
+    ).update(
+        {CourseProgressSummary.completed_lessons: func.greatest(CourseProgressSummary.completed_lessons - 1, 0)},
+        synchronize_session=False
+    )
+
+
+def register_lesson_added(db: Session, course_id: UUID) -> None:
+    """Suma 1 al total de lecciones del curso."""
+    db.query(Course).filter(Course.id == course_id).update(
+        {Course.lessons_count: Course.lessons_count + 1},
+        synchronize_session=False
+    )
+
+
+def register_lesson_removed(db: Session, lesson_id: UUID, course_id: UUID) -> None:
+    """
+    Descuenta una lección borrada: baja el total del curso, el contador de cada
+    alumno que la había completado y elimina esos registros de progreso.
+    """
+    completed_by = select(UserLessonProgress.user_id).where(UserLessonProgress.lesson_id == lesson_id)
+
+    db.execute(
+        update(CourseProgressSummary)
+        .where(
+            CourseProgressSummary.course_id == course_id,
+            CourseProgressSummary.user_id.in_(completed_by)
+        )
+        .values(completed_lessons=func.greatest(CourseProgressSummary.completed_lessons - 1, 0))
+    )
+    db.execute(delete(UserLessonProgress).where(UserLessonProgress.lesson_id == lesson_id))
+
+    db.query(Course).filter(Course.id == course_id).update(
+        {Course.lessons_count: func.greatest(Course.lessons_count - 1, 0)},
+        synchronize_session=False
+    )
+
+
+def get_course_completion(db: Session, user_id: UUID, course_id: UUID):
+    """
+    Devuelve el avance del usuario en el curso con una sola lectura
+    (completed_lessons, total_lessons, last_completed_at), o None si el curso no existe.
+    """
+    return db.query(
+        func.coalesce(CourseProgressSummary.completed_lessons, 0).label("completed_lessons"),
+        Course.lessons_count.label("total_lessons"),
+        CourseProgressSummary.last_completed_at
+    ).select_from(Course).outerjoin(
+        CourseProgressSummary,
+        (CourseProgressSummary.course_id == Course.id) & (CourseProgressSummary.user_id == user_id)
+    ).filter(Course.id == course_id).first()
+
+
+def progress_percentage(completed: int, total: int) -> int:
+    if not total:
+        return 0
+    return min(100, int((completed / total) * 100))
+
+
+def get_progress_summary(db: Session, user_id: UUID) -> ProgressSummary:
+    """Estadísticas globales del usuario en todos sus cursos (cacheadas por usuario)."""
+    summary = summary_cache.get(user_id)
+    if summary is None:
+        summary = _compute_progress_summary(db, user_id)
+        summary_cache.set(user_id, summary)
+    return summary
+
+
+def invalidate_progress_summary(user_id: UUID = None) -> None:
+    """Llamar después del commit de cualquier escritura de progreso."""
+    if user_id is None:
+        summary_cache.clear()
+    else:
+        summary_cache.delete(user_id)
+
+
+def _compute_progress_summary(db: Session, user_id: UUID) -> ProgressSummary:
+    # 1. Estado de cada curso inscrito, agregado en una sola consulta
+    completed = func.coalesce(CourseProgressSummary.completed_lessons, 0)
+    enrolled, finished, in_progress, not_started, today = db.query(
+        func.count(Enrollment.course_id),
+        func.count().filter(and_(Course.lessons_count > 0, completed >= Course.lessons_count)),
+        func.count().filter(and_(completed > 0, completed < Course.lessons_count)),
+        func.count().filter(completed == 0),
+        func.current_date()
+    ).select_from(Enrollment).join(
+        Course, Course.id == Enrollment.course_id
+    ).outerjoin(
+        CourseProgressSummary,
+        (CourseProgressSummary.user_id == Enrollment.user_id) & (CourseProgressSummary.course_id == Enrollment.course_id)
+    ).filter(Enrollment.user_id == user_id).one()
+
+    # 2. Tiempo visto: duración de las lecciones completadas + posición en las que están a medias
+    completed_seconds = select(func.coalesce(func.sum(Lesson.duration_seconds), 0)).select_from(
+        UserLessonProgress
+    ).join(Lesson, Lesson.id == UserLessonProgress.lesson_id).where(
+        UserLessonProgress.user_id == user_id
+    ).scalar_subquery()
+
+    partial_seconds = select(func.coalesce(func.sum(LessonWatchPosition.position_seconds), 0)).where(
+        LessonWatchPosition.user_id == user_id,
+        ~exists().where(
+            UserLessonProgress.user_id == user_id,  # constante: permite el pruning de particiones
+            UserLessonProgress.lesson_id == LessonWatchPosition.lesson_id
+        )
+    ).scalar_subquery()
+
+    total_watched_seconds = db.query(completed_seconds + partial_seconds).scalar()
+
+    # 3. Racha: días consecutivos con actividad (lecciones completadas o videos vistos)
+    since = today - timedelta(days=STREAK_LOOKBACK_DAYS)
+    days = [
+        row[0] for row in db.query(UserActivityDay.day).filter(
+            UserActivityDay.user_id == user_id,
+            UserActivityDay.day >= since
+        ).order_by(UserActivityDay.day.desc())
+    ]
+
+    return ProgressSummary(
+        courses_enrolled=enrolled,
+        courses_completed=finished,
+        courses_in_progress=in_progress,
+        courses_not_started=not_started,
+        total_watched_seconds=int(total_watched_seconds or 0),
+        current_streak_days=_current_streak(days, today),
+        last_activity_date=days[0] if days else None
+    )
+
+
+def _current_streak(days: list, today) -> int:
+    """`days` en orden descendente. La racha sigue viva si la última actividad fue hoy o ayer."""
+    if not days or (today - days[0]).days > 1:
+        return 0
+
+    streak = 1
+    for previous, current in zip(days, days[1:]):
+        if (previous - current).days != 1:
+            break
+        streak += 1
+    return streak
+
+
+def reconcile_progress_counters(db: Session, course_id: UUID = None) -> dict:
+    """
+    Recalcula los contadores desde las tablas de origen y corrige solo las filas
+    que se hayan desviado. Pensado para correr periódicamente (ver tasks.py).
+    """
+    # 1. Total de lecciones por curso
+    lesson_counts = (
+        select(Course.id.label("course_id"), func.count(Lesson.id).label("total"))
+        .select_from(Course)
+        .outerjoin(Section, Section.course_id == Course.id)
+        .outerjoin(Lesson, Lesson.section_id == Section.id)
+        .group_by(Course.id)
+    )
+    if course_id is not None:
+        lesson_counts = lesson_counts.where(Course.id == course_id)
+    lesson_counts = lesson_counts.subquery()
+
+    courses_fixed = db.execute(
+        update(Course)
+        .where(
+            Course.id == lesson_counts.c.course_id,
+            Course.lessons_count.is_distinct_from(lesson_counts.c.total)
+        )
+        .values(lessons_count=lesson_counts.c.total)
+    ).rowcount
+
+    # 2. Lecciones completadas por (usuario, curso)
+    actual = select(
+        UserLessonProgress.user_id,
+        UserLessonProgress.course_id,
+        func.count(),
+        func.max(UserLessonProgress.completed_at)
+    ).group_by(UserLessonProgress.user_id, UserLessonProgress.course_id)
+    if course_id is not None:
+        actual = actual.where(UserLessonProgress.course_id == course_id)
+
+    upsert = pg_insert(CourseProgressSummary).from_select(
+        ["user_id", "course_id", "completed_lessons", "last_completed_at"], actual
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[CourseProgressSummary.user_id, CourseProgressSummary.course_id],
+        set_={
+            "completed_lessons": upsert.excluded.completed_lessons,
+            "last_completed_at": upsert.excluded.last_completed_at,
+            "updated_at": func.now(),
+        },
+        where=CourseProgressSummary.completed_lessons.is_distinct_from(upsert.excluded.completed_lessons)
+    )
+    summaries_fixed = db.execute(upsert).rowcount
+
+    # 3. Resúmenes que ya no tienen ningún progreso detrás
+    orphaned = update(CourseProgressSummary).where(
+        CourseProgressSummary.completed_lessons != 0,
+        ~exists().where(
+            UserLessonProgress.user_id == CourseProgressSummary.user_id,
+            UserLessonProgress.course_id == CourseProgressSummary.course_id
+        )
+    )
+    if course_id is not None:
+        orphaned = orphaned.where(CourseProgressSummary.course_id == course_id)
+    summaries_fixed += db.execute(orphaned.values(completed_lessons=0)).rowcount
+
+    db.commit()
+    return {"courses_fixed": courses_fixed, "summaries_fixed": summaries_fixed}
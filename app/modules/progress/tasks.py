@@ -0,0 +1,39 @@
+# app/modules/progress/tasks.py
+"""
+Tareas de mantenimiento del progreso.
+
+Uso:
+    python -m app.modules.progress.tasks reconcile [--course-id UUID]
+"""
+import argparse
+from uuid import UUID
+
+from app.core.database import SessionLocal
+from app.modules.progress.service import reconcile_progress_counters
+# Modelos relacionados con Course/User: necesarios para configurar los mappers fuera de la API
+from app.modules.users.models import User  # noqa: F401
+from app.modules.reviews.models import Review  # noqa: F401
+from app.modules.instructors.models import InstructorProfile  # noqa: F401
+from app.modules.categories.models import Category  # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de contadores de progreso")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subparsers.add_parser("reconcile", help="Corrige desvíos en los contadores de progreso")
+    reconcile.add_argument("--course-id", type=UUID, default=None)
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "reconcile":
+            result = reconcile_progress_counters(db, course_id=args.course_id)
+            print(f"Cursos corregidos: {result['courses_fixed']} | Resúmenes corregidos: {result['summaries_fixed']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# app/modules/reviews/benchmark.py
+"""
+Comprobación y benchmark del listado de reseñas paginado por cursor.
+
+Crea un curso con N reseñas (dentro de una transacción que se revierte al
+terminar), recorre todas las páginas de cada orden y cuenta las consultas
+SQL con un listener de SQLAlchemy:
+
+- cada página es exactamente una consulta, también la última,
+- la primera página repetida sale de la caché (0 consultas),
+- un cursor mal formado responde 400 sin tocar la base de datos,
+
+y compara el tiempo de la primera y la última página (con keyset deberían
+costar lo mismo). Termina con error si alguna comprobación falla.
+
+Uso:
+    python -m app.modules.reviews.benchmark [-n 5000] [--limit 20]
+"""
+import argparse
+import base64
+import json
+import time
+
+from fastapi import HTTPException
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.modules.reviews.service import SORT_OPTIONS, first_page_cache, list_course_reviews
+# Modelos relacionados con Review: necesarios para configurar los mappers fuera de la API
+from app.modules.users.models import User  # noqa: F401
+from app.modules.courses.models import Course  # noqa: F401
+from app.modules.categories.models import Category  # noqa: F401
+from app.modules.instructors.models import InstructorProfile  # noqa: F401
+
+# Cursores inválidos para "highest" (rating, created_at, id)
+BAD_CURSOR_VALUES = (
+    ["5", "2024-01-01T00:00:00", "00000000-0000-0000-0000-000000000000"],
+    [True, "2024-01-01T00:00:00", "00000000-0000-0000-0000-000000000000"],
+    [5, 1704067200, "00000000-0000-0000-0000-000000000000"],
+    [5, "2024-01-01T00:00:00", 42],
+    [5, "2024-01-01T00:00:00"],
+    {"rating": 5},
+)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def seed(conn, reviews: int):
+    """Un instructor, `reviews` alumnos y una reseña de cada uno. Devuelve el id del curso."""
+    conn.execute(text("""
+        INSERT INTO users (email, password_hash, full_name, role)
+        SELECT 'bench-review-' || g || '@example.com', 'x', 'Alumno ' || g, 'STUDENT'
+        FROM generate_series(0, :n) AS g
+    """), {"n": reviews})
+    course_id = conn.execute(text("""
+        INSERT INTO courses (user_id, title, slug)
+        SELECT id, 'Curso de reseñas', 'bench-reviews-' || md5(random()::text)
+        FROM users WHERE email = 'bench-review-0@example.com'
+        RETURNING id
+    """)).scalar()
+    conn.execute(text("""
+        INSERT INTO reviews (course_id, user_id, rating, comment, instructor_reply, created_at)
+        SELECT :course_id, u.id, 1 + (g % 5), 'Comentario ' || g,
+               CASE WHEN g % 7 = 0 THEN 'Gracias' END,
+               NOW() - make_interval(secs => g / 3)
+        FROM users u
+        JOIN generate_series(1, :n) AS g ON u.email = 'bench-review-' || g || '@example.com'
+    """), {"course_id": course_id, "n": reviews})
+    return course_id
+
+
+def walk(db: Session, counter: QueryCounter, course_id, sort: str, limit: int):
+    """Recorre todas las páginas. Devuelve (filas, consultas por página, ms por página)."""
+    first_page_cache.clear()
+    seen, queries, times = 0, [], []
+    cursor = None
+    while True:
+        before = counter.count
+        started = time.perf_counter()
+        page = list_course_reviews(db, course_id, sort=sort, limit=limit, cursor=cursor)
+        times.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count - before)
+        seen += len(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return seen, queries, times
+
+
+def encode(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).rstrip(b"=").decode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas y tiempos del listado de reseñas")
+    parser.add_argument("-n", "--reviews", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    counter = QueryCounter()
+    conn = engine.connect()
+    transaction = conn.begin()
+    db = Session(bind=conn)
+    failures = []
+    try:
+        course_id = seed(conn, args.reviews)
+        event.listen(engine, "before_cursor_execute", counter)
+
+        print(f"{args.reviews} reseñas, {args.limit} por página")
+        print(f"{'orden':<12}{'páginas':>9}{'consultas/pág':>15}{'1ª pág ms':>11}{'última ms':>11}{'caché':>7}")
+        for sort in SORT_OPTIONS:
+            seen, queries, times = walk(db, counter, course_id, sort, args.limit)
+            before = counter.count
+            list_course_reviews(db, course_id, sort=sort, limit=args.limit)
+            cached_queries = counter.count - before
+            print(
+                f"{sort:<12}{len(queries):>9}{max(queries):>15}"
+                f"{times[0]:>11.2f}{times[-1]:>11.2f}{cached_queries:>7}"
+            )
+            if seen != args.reviews:
+                failures.append(f"{sort}: {seen} reseñas recorridas de {args.reviews}")
+            if set(queries) != {1}:
+                failures.append(f"{sort}: consultas por página {sorted(set(queries))}, se esperaba 1")
+            if cached_queries != 0:
+                failures.append(f"{sort}: la primera página repetida hizo {cached_queries} consultas")
+
+        for values in BAD_CURSOR_VALUES:
+            before = counter.count
+            try:
+                list_course_reviews(db, course_id, sort="highest", limit=args.limit, cursor=encode(values))
+                failures.append(f"cursor {values!r} aceptado")
+            except HTTPException as e:
+                if e.status_code != 400 or counter.count != before:
+                    failures.append(f"cursor {values!r}: {e.status_code}, {counter.count - before} consultas")
+        print(f"{len(BAD_CURSOR_VALUES)} cursores inválidos comprobados")
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+        first_page_cache.clear()
+        db.close()
+        transaction.rollback()
+        conn.close()
+
+    if failures:
+        raise SystemExit("FALLÓ:\n" + "\n".join(failures))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 # app/modules/reviews/models.py
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, text, CheckConstraint
+from sqlalchemy import Column, String, Text, Integer, Numeric, DateTime, ForeignKey, text, CheckConstraint, Index, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
 
 
 class Review(Base):
@@ -14,9 +15,12 @@ class Review(Base):
     
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='rating_range'),
+        # Listado paginado por cursor (ver reviews/service.py): más recientes y por calificación
+        Index('ix_reviews_course_created', 'course_id', 'created_at', 'id'),
+        Index('ix_reviews_course_rating', 'course_id', 'rating', 'created_at', 'id'),
     )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     rating = Column(Integer, nullable=False)  # 1-5 estrellas
@@ -27,3 +31,38 @@ class Review(Base):
     # Relaciones
     course = relationship("Course", back_populates="reviews")
     user = relationship("User")
+
+
+class CourseRatingSummary(Base):
+    """
+    Calificación agregada de un curso: cantidad de reseñas, suma e histograma
+    de estrellas. Se mantiene en la misma transacción que la reseña (ver
+    reviews/ratings.py), así el catálogo no recorre `reviews`. Cada curso
+    tiene su fila desde que se crea, con todo en cero.
+    """
+    __tablename__ = "course_rating_summaries"
+
+    __table_args__ = (
+        # Orden "mejor calificados" del catálogo (se recorre hacia atrás)
+        Index('ix_course_rating_summaries_ranking', 'average_rating', 'reviews_count', 'course_id'),
+    )
+
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    reviews_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    rating_sum = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    stars_1 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    stars_2 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    stars_3 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    stars_4 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    stars_5 = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    # Columna generada por PostgreSQL: siempre coincide con la suma y la cantidad
+    average_rating = Column(
+        Numeric(3, 2),
+        Computed("CASE WHEN reviews_count > 0 THEN round(rating_sum::numeric / reviews_count, 2) ELSE 0 END", persisted=True)
+    )
+    updated_at = Column(DateTime, server_default=text("NOW()"), onupdate=text("NOW()"))
+
+    @property
+    def histogram(self) -> dict:
+        """{estrellas: cantidad de reseñas} de 1 a 5."""
+        return {stars: getattr(self, f"stars_{stars}") or 0 for stars in range(1, 6)}
@@ -0,0 +1,106 @@
+# app/modules/reviews/ratings.py
+"""
+Calificación agregada por curso (`CourseRatingSummary`), mantenida de forma incremental.
+
+Cada alta, baja o cambio de una reseña suma o resta sobre la fila del curso
+con un UPDATE atómico, en la misma sesión que la reseña: el commit lo hace el
+endpoint que llama, así la reseña y el agregado se guardan juntos. El
+promedio es una columna generada, no hace falta recalcularlo.
+"""
+from uuid import UUID
+
+from sqlalchemy import select, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.modules.courses.models import Course
+from app.modules.reviews.models import Review, CourseRatingSummary
+
+SUMMARY_COLUMNS = ("reviews_count", "rating_sum", "stars_1", "stars_2", "stars_3", "stars_4", "stars_5")
+
+
+def _stars_column(rating: int) -> str:
+    return f"stars_{rating}"
+
+
+def register_review_added(db: Session, course_id: UUID, rating: int) -> None:
+    """Suma una reseña de `rating` estrellas al curso (crea la fila si no existe)."""
+    stars = _stars_column(rating)
+    stmt = pg_insert(CourseRatingSummary).values(
+        course_id=course_id,
+        reviews_count=1,
+        rating_sum=rating,
+        **{stars: 1}
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CourseRatingSummary.course_id],
+        set_={
+            "reviews_count": CourseRatingSummary.reviews_count + 1,
+            "rating_sum": CourseRatingSummary.rating_sum + rating,
+            stars: getattr(CourseRatingSummary, stars) + 1,
+            "updated_at": func.now(),
+        }
+    )
+    db.execute(stmt)
+
+
+def register_review_removed(db: Session, course_id: UUID, rating: int) -> None:
+    """Descuenta una reseña borrada de `rating` estrellas."""
+    stars = getattr(CourseRatingSummary, _stars_column(rating))
+    db.query(CourseRatingSummary).filter(CourseRatingSummary.course_id == course_id).update(
+        {
+            CourseRatingSummary.reviews_count: func.greatest(CourseRatingSummary.reviews_count - 1, 0),
+            CourseRatingSummary.rating_sum: func.greatest(CourseRatingSummary.rating_sum - rating, 0),
+            stars: func.greatest(stars - 1, 0),
+        },
+        synchronize_session=False
+    )
+
+
+def register_rating_changed(db: Session, course_id: UUID, old_rating: int, new_rating: int) -> None:
+    """Mueve una reseña editada de `old_rating` a `new_rating` estrellas."""
+    if old_rating == new_rating:
+        return
+    old_stars = getattr(CourseRatingSummary, _stars_column(old_rating))
+    new_stars = getattr(CourseRatingSummary, _stars_column(new_rating))
+    db.query(CourseRatingSummary).filter(CourseRatingSummary.course_id == course_id).update(
+        {
+            CourseRatingSummary.rating_sum: CourseRatingSummary.rating_sum + (new_rating - old_rating),
+            old_stars: func.greatest(old_stars - 1, 0),
+            new_stars: new_stars + 1,
+        },
+        synchronize_session=False
+    )
+
+
+def get_rating_summary(db: Session, course_id: UUID):
+    """Agregado del curso (una lectura por clave primaria), o None si el curso no tiene fila."""
+    return db.query(CourseRatingSummary).filter(CourseRatingSummary.course_id == course_id).first()
+
+
+def rebuild_rating_summaries(db: Session, course_id: UUID = None) -> dict:
+    """
+    Recalcula los agregados desde `reviews` (todos los cursos o uno) y corrige
+    solo las filas que se hayan desviado; crea las que falten. Hace commit.
+    """
+    actual = select(
+        Course.id,
+        func.count(Review.id),
+        func.coalesce(func.sum(Review.rating), 0),
+        *[func.count().filter(Review.rating == stars) for stars in range(1, 6)]
+    ).select_from(Course).outerjoin(Review, Review.course_id == Course.id).group_by(Course.id)
+    if course_id is not None:
+        actual = actual.where(Course.id == course_id)
+
+    upsert = pg_insert(CourseRatingSummary).from_select(["course_id", *SUMMARY_COLUMNS], actual)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[CourseRatingSummary.course_id],
+        set_={**{name: upsert.excluded[name] for name in SUMMARY_COLUMNS}, "updated_at": func.now()},
+        where=or_(*[
+            getattr(CourseRatingSummary, name).is_distinct_from(upsert.excluded[name]) for name in SUMMARY_COLUMNS
+        ])
+    )
+    summaries_fixed = db.execute(upsert).rowcount
+
+    db.commit()
+    return {"summaries_fixed": summaries_fixed}
@@ -1,7 +1,8 @@
 # app/modules/reviews/router.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal, Optional
+from uuid import UUID
 
 from app.core.database import get_db
 from app.modules.auth.dependencies import get_current_user
@@ -9,7 +10,10 @@ from app.modules.users.models import User
 from app.modules.courses.models import Course
 from app.modules.enrollments.models import Enrollment
 from app.modules.reviews.models import Review
-from app.modules.reviews.schemas import ReviewCreate, ReviewResponse, ReviewReply
+from app.modules.reviews.schemas import ReviewCreate, ReviewResponse, ReviewReply, ReviewPage, RatingSummary
+from app.modules.reviews import service as review_service
+from app.modules.reviews import ratings
+from app.modules.instructors import service as instructor_service
 
 router = APIRouter(prefix="/reviews", tags=["Reseñas"])
 
@@ -62,8 +66,12 @@ def create_review(
     )
     
     db.add(new_review)
+    # El agregado del curso y el contador del instructor se guardan en la misma transacción
+    ratings.register_review_added(db, review_data.course_id, review_data.rating)
+    instructor_service.register_review(db, course.user_id)
     db.commit()
     db.refresh(new_review)
+    review_service.first_page_cache.delete(new_review.course_id)
     
     return ReviewResponse(
         id=new_review.id,
@@ -77,71 +85,63 @@ def create_review(
     )
 
 
-@router.get("/course/{course_id}", response_model=List[ReviewResponse])
+@router.get("/course/{course_id}", response_model=ReviewPage)
 def get_course_reviews(
-    course_id: str,
-    skip: int = 0,
-    limit: int = 20,
+    course_id: UUID,
+    sort: Literal["newest", "highest", "lowest", "with_reply"] = "newest",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Lista las reseñas de un curso (público)."""
-    reviews = db.query(Review).filter(
-        Review.course_id == course_id
-    ).offset(skip).limit(limit).all()
-    
-    # Agregar nombre de usuario a cada reseña
-    result = []
-    for review in reviews:
-        user = db.query(User).filter(User.id == review.user_id).first()
-        result.append(ReviewResponse(
-            id=review.id,
-            course_id=review.course_id,
-            user_id=review.user_id,
-            rating=review.rating,
-            comment=review.comment,
-            instructor_reply=review.instructor_reply,
-            created_at=review.created_at,
-            user_name=user.full_name if user else "Usuario"
-        ))
-    
-    return result
+    """
+    Lista las reseñas de un curso (público), en una sola consulta.
+    Orden: más recientes, mejor o peor calificación, o primero las respondidas
+    por el instructor. Para la página siguiente se envía `cursor` = `next_cursor`.
+    """
+    return review_service.list_course_reviews(db, course_id, sort, limit, cursor)
+
+
+@router.get("/course/{course_id}/summary", response_model=RatingSummary)
+def get_course_rating_summary(course_id: UUID, db: Session = Depends(get_db)):
+    """Promedio, cantidad de reseñas e histograma de estrellas del curso (público)."""
+    summary = ratings.get_rating_summary(db, course_id)
+    if summary is not None:
+        return summary
+
+    # Sin fila: curso inexistente o creado antes de los agregados (todo en cero)
+    if not db.query(Course.id).filter(Course.id == course_id).first():
+        raise HTTPException(status_code=404, detail="Curso no encontrado")
+    return RatingSummary()
 
 
 @router.put("/{review_id}/reply", response_model=ReviewResponse)
 def reply_to_review(
-    review_id: str,
+    review_id: UUID,
     reply_data: ReviewReply,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Permite al instructor responder a una reseña de su curso."""
-    review = db.query(Review).filter(Review.id == review_id).first()
-    
+    # Reseña y dueño del curso en una consulta
+    review = db.query(Review.course_id, Course.user_id.label("instructor_id")).join(
+        Course, Course.id == Review.course_id
+    ).filter(Review.id == review_id).first()
+
     if not review:
         raise HTTPException(status_code=404, detail="Reseña no encontrada")
-    
+
     # Verificar que el usuario es el dueño del curso
-    course = db.query(Course).filter(Course.id == review.course_id).first()
-    
-    if course.user_id != current_user.id:
+    if review.instructor_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Solo el instructor del curso puede responder"
         )
-    
-    review.instructor_reply = reply_data.instructor_reply
-    db.commit()
-    db.refresh(review)
-    
-    user = db.query(User).filter(User.id == review.user_id).first()
-    
-    return ReviewResponse(
-        id=review.id,
-        course_id=review.course_id,
-        user_id=review.user_id,
-        rating=review.rating,
-        comment=review.comment,
-        instructor_reply=review.instructor_reply,
-        created_at=review.created_at,
-        user_name=user.full_name if user else "Usuario"
+
+    db.query(Review).filter(Review.id == review_id).update(
+        {Review.instructor_reply: reply_data.instructor_reply},
+        synchronize_session=False
     )
+    db.commit()
+    review_service.first_page_cache.delete(review.course_id)
+
+    return review_service.review_response(review_service.get_review_row(db, review_id))
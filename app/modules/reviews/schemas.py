@@ -1,6 +1,6 @@
 # app/modules/reviews/schemas.py
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -28,6 +28,21 @@ class ReviewResponse(ReviewBase):
         from_attributes = True
 
 
+class ReviewPage(BaseModel):
+    """Página de reseñas; `next_cursor` se envía como `cursor` para pedir la siguiente"""
+    items: List[ReviewResponse]
+    next_cursor: Optional[str] = None
+
+
 class ReviewReply(BaseModel):
     """Schema para que el instructor responda a una reseña"""
     instructor_reply: str
+
+
+class RatingSummary(BaseModel):
+    """Calificación agregada de un curso; `histogram` = {estrellas: cantidad de reseñas}"""
+    average_rating: float = 0
+    reviews_count: int = 0
+    histogram: Dict[int, int] = Field(default_factory=lambda: {stars: 0 for stars in range(1, 6)})
+
+    model_config = ConfigDict(from_attributes=True)
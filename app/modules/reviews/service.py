@@ -0,0 +1,173 @@
+# app/modules/reviews/service.py
+"""
+Listado de reseñas de un curso.
+
+Una sola consulta por página: la reseña y el nombre del autor salen de un
+JOIN con users, solo con las columnas que usa la respuesta. La paginación es
+por cursor (keyset): la página siguiente continúa desde la última fila
+vista, sin OFFSET, así cuesta lo mismo la página 1 que la 500.
+
+La primera página de cada orden se guarda en memoria unos segundos (es la
+que se pide en cada visita a la página del curso) y se invalida al crear o
+responder una reseña de ese curso.
+"""
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import REVIEWS_FIRST_PAGE_CACHE_SECONDS
+from app.modules.users.models import User
+from app.modules.reviews.models import Review
+from app.modules.reviews.schemas import ReviewResponse, ReviewPage
+
+# Primeras páginas por curso: {course_id: {(sort, limit): ReviewPage}}
+first_page_cache = TTLCache(ttl_seconds=REVIEWS_FIRST_PAGE_CACHE_SECONDS)
+
+# Columnas de orden de cada opción: (expresión, descendente). La última es
+# siempre el id, así el orden es total y el cursor no salta ni repite filas.
+HAS_REPLY = Review.instructor_reply.isnot(None)
+SORT_OPTIONS = {
+    "newest": ((Review.created_at, True), (Review.id, True)),
+    "highest": ((Review.rating, True), (Review.created_at, True), (Review.id, True)),
+    "lowest": ((Review.rating, False), (Review.created_at, True), (Review.id, True)),
+    "with_reply": ((HAS_REPLY, True), (Review.created_at, True), (Review.id, True)),
+}
+
+# Columnas de la respuesta (sin cargar la entidad completa)
+REVIEW_COLUMNS = (
+    Review.id,
+    Review.course_id,
+    Review.user_id,
+    Review.rating,
+    Review.comment,
+    Review.instructor_reply,
+    Review.created_at,
+    User.full_name.label("user_name"),
+)
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(values) -> str:
+    """Cursor opaco con los valores de orden de la última fila de la página."""
+    raw = json.dumps([_json_value(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, sort: str):
+    """Valores de la última fila de la página anterior; 400 si el cursor no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        columns = SORT_OPTIONS[sort]
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        decoded = []
+        for (column, _), value in zip(columns, values):
+            if column is Review.created_at or column is Review.id:
+                if not isinstance(value, str):
+                    raise ValueError
+                value = datetime.fromisoformat(value) if column is Review.created_at else UUID(value)
+            elif column is Review.rating:
+                # bool es subclase de int: se compara el tipo exacto
+                if type(value) is not int:
+                    raise ValueError
+            elif column is HAS_REPLY:
+                if not isinstance(value, bool):
+                    raise ValueError
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Cursor de paginación inválido")
+
+
+def _after(columns, values):
+    """Condición "fila posterior a `values`" en el orden de `columns`."""
+    directions = {descending for _, descending in columns}
+    if len(directions) == 1:
+        # Misma dirección en todas: comparación de filas, que PostgreSQL resuelve con el índice
+        row, last = tuple_(*[column for column, _ in columns]), tuple_(*values)
+        return row < last if directions.pop() else row > last
+
+    # Direcciones mixtas: desempate columna por columna, acotando la primera para usar el índice
+    conditions = []
+    for index, (column, descending) in enumerate(columns):
+        previous_equal = [columns[i][0] == values[i] for i in range(index)]
+        beyond = column < values[index] if descending else column > values[index]
+        conditions.append(and_(*previous_equal, beyond))
+    first, first_descending = columns[0]
+    bound = first <= values[0] if first_descending else first >= values[0]
+    return and_(bound, or_(*conditions))
+
+
+def _row_sort_values(row, sort: str):
+    values = []
+    for column, _ in SORT_OPTIONS[sort]:
+        if column is HAS_REPLY:
+            values.append(row.instructor_reply is not None)
+        else:
+            values.append(getattr(row, column.key))
+    return values
+
+
+def list_course_reviews(db: Session, course_id: UUID, sort: str = "newest", limit: int = 20, cursor: str = None) -> ReviewPage:
+    """Una página de reseñas del curso (una consulta, o ninguna si es una primera página en caché)."""
+    if cursor is None:
+        cached = first_page_cache.get(course_id)
+        if cached is not None and (sort, limit) in cached:
+            return cached[(sort, limit)]
+
+    columns = SORT_OPTIONS[sort]
+    query = db.query(*REVIEW_COLUMNS).outerjoin(User, User.id == Review.user_id).filter(
+        Review.course_id == course_id
+    )
+    if cursor is not None:
+        query = query.filter(_after(columns, decode_cursor(cursor, sort)))
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in columns])
+
+    # Una fila de más para saber si hay página siguiente
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    page = ReviewPage(
+        items=[review_response(row) for row in rows],
+        next_cursor=encode_cursor(_row_sort_values(rows[-1], sort)) if has_more else None
+    )
+    if cursor is None:
+        pages = dict(first_page_cache.get(course_id) or {})
+        pages[(sort, limit)] = page
+        first_page_cache.set(course_id, pages)
+    return page
+
+
+def review_response(row) -> ReviewResponse:
+    return ReviewResponse(
+        id=row.id,
+        course_id=row.course_id,
+        user_id=row.user_id,
+        rating=row.rating,
+        comment=row.comment,
+        instructor_reply=row.instructor_reply,
+        created_at=row.created_at,
+        user_name=row.user_name or "Usuario"
+    )
+
+
+def get_review_row(db: Session, review_id):
+    """Reseña con el nombre del autor en una consulta (o None)."""
+    return db.query(*REVIEW_COLUMNS).outerjoin(User, User.id == Review.user_id).filter(
+        Review.id == review_id
+    ).first()
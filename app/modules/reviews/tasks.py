@@ -0,0 +1,38 @@
+# app/modules/reviews/tasks.py
+"""
+Tareas de mantenimiento de reseñas.
+
+Uso:
+    python -m app.modules.reviews.tasks rebuild-ratings [--course-id UUID]
+"""
+import argparse
+from uuid import UUID
+
+from app.core.database import SessionLocal
+# Modelos relacionados con Course/Review: necesarios para configurar los mappers fuera de la API
+from app.modules.users.models import User  # noqa: F401
+from app.modules.instructors.models import InstructorProfile  # noqa: F401
+from app.modules.categories.models import Category  # noqa: F401
+from app.modules.reviews.ratings import rebuild_rating_summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantenimiento de reseñas")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser("rebuild-ratings", help="Recalcula la calificación agregada de los cursos")
+    rebuild.add_argument("--course-id", type=UUID, default=None)
+
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild-ratings":
+            result = rebuild_rating_summaries(db, course_id=args.course_id)
+            print(f"Resúmenes corregidos: {result['summaries_fixed']}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
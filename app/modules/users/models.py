@@ -5,6 +5,7 @@ from sqlalchemy import Column, String, Boolean, DateTime, text, Enum
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ENUM as PG_ENUM
 from sqlalchemy.orm import relationship
 from app.core.database import Base
+from app.core.ids import uuid7, UUID7_SERVER_DEFAULT
 
 # Definimos el Enum igual que en la base de datos
 class UserRole(str, enum.Enum):
@@ -15,8 +16,8 @@ class UserRole(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    # id es UUID y se genera automáticamente en la DB
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    # id es UUID v7 (ordenado por tiempo); si el INSERT no lo trae, lo genera la DB
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=UUID7_SERVER_DEFAULT)
     
     email = Column(String(255), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
@@ -19,6 +19,7 @@ interface Course {
   description: string;
   price: number;
   level: string;
+  rating_summary?: { average_rating: number; reviews_count: number; histogram: Record<string, number> } | null;
   sections?: { id: string; title: string; lessons: { id: string; title: string }[] }[];
 }
 
@@ -58,8 +59,8 @@ export default function CourseDetailPage() {
 
     Promise.all([
       fetch(`http://localhost:8000/courses/${params.id}`).then((r) => r.json()),
-      fetch(`http://localhost:8000/reviews/course/${params.id}`).then((r) =>
-        r.ok ? r.json() : []
+      fetch(`http://localhost:8000/reviews/course/${params.id}?limit=100`).then((r) =>
+        r.ok ? r.json() : { items: [] }
       ),
       token
         ? fetch("http://localhost:8000/enrollments/me", {
@@ -69,7 +70,7 @@ export default function CourseDetailPage() {
     ])
       .then(([c, r, enrollments]) => {
         setCourse(c);
-        setReviews(r);
+        setReviews(r.items ?? []);
         if (enrollments && Array.isArray(enrollments)) {
              // La respuesta del backend es: { id: "...", course: { id: "...", title: "..." } }
              // Por lo tanto, debemos verificar enrollment.course.id
@@ -123,10 +124,9 @@ export default function CourseDetailPage() {
     }
   };
 
-  const avgRating =
-    reviews.length > 0
-      ? (reviews.reduce((a, r) => a + r.rating, 0) / reviews.length).toFixed(1)
-      : "0";
+  // Promedio y cantidad ya calculados en el backend (course.rating_summary)
+  const avgRating = (course?.rating_summary?.average_rating ?? 0).toFixed(1);
+  const reviewsCount = course?.rating_summary?.reviews_count ?? reviews.length;
 
   // Ownership Check
   const isOwner = user && course && user.id === course.user_id;
@@ -168,7 +168,7 @@ export default function CourseDetailPage() {
               <div className="flex items-center gap-1">
                 <span className="text-yellow-500 text-xl">★</span>
                 <span className="font-bold">{avgRating}</span>
-                <span className="text-gray-500">({reviews.length} reseñas)</span>
+                <span className="text-gray-500">({reviewsCount} reseñas)</span>
               </div>
             </div>
           </div>
@@ -53,8 +53,12 @@ export default function CreateCoursePage() {
     uploadData.append("file", file);
 
     try {
+      const token = localStorage.getItem("token");
       const res = await axios.post("http://localhost:8000/files/upload", uploadData, {
-        headers: { "Content-Type": "multipart/form-data" },
+        headers: {
+          "Content-Type": "multipart/form-data",
+          Authorization: `Bearer ${token}`,
+        },
       });
       setFormData({ ...formData, thumbnail_url: res.data.url });
     } catch (error) {
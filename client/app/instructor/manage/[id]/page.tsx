@@ -6,6 +6,10 @@ import axios from "axios";
 import { useParams, useRouter } from "next/navigation";
 import { DragDropContext, Droppable, Draggable, DropResult } from "@hello-pangea/dnd";
 
+// Subidas reanudables: tamaño de cada bloque y reintentos por bloque
+const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const UPLOAD_MAX_RETRIES = 5;
+
 const reorder = (list: any[], startIndex: number, endIndex: number) => {
   const result = Array.from(list);
   const [removed] = result.splice(startIndex, 1);
@@ -53,6 +57,7 @@ export default function ManageCoursePage() {
 
   // Estado para subida de archivo
   const [uploading, setUploading] = useState(false);
+  const [uploadProgress, setUploadProgress] = useState(0);
 
   // 1. Cargar datos del curso
   const fetchCourseData = async () => {
@@ -117,19 +122,51 @@ export default function ManageCoursePage() {
     }
   };
 
-  // 4. Subir ARCHIVO 📤
+  // 4. Subir ARCHIVO 📤 (subida reanudable por bloques)
   const handleFileUpload = async (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
     if (!file) return;
 
     setUploading(true);
-    const formData = new FormData();
-    formData.append("file", file);
+    setUploadProgress(0);
+    const token = localStorage.getItem("token");
+    const auth = { Authorization: `Bearer ${token}` };
 
     try {
-      const res = await axios.post("http://localhost:8000/files/upload", formData, {
-        headers: { "Content-Type": "multipart/form-data" },
-      });
+      // a) Crear la subida
+      const created = await axios.post(
+        "http://localhost:8000/files/uploads",
+        { filename: file.name, size: file.size },
+        { headers: auth }
+      );
+      const uploadUrl = `http://localhost:8000/files/uploads/${created.data.id}`;
+
+      // b) Enviar bloques; si uno falla, se pregunta el offset y se reintenta desde ahí
+      let offset = 0;
+      let retries = 0;
+      while (offset < file.size) {
+        const chunk = file.slice(offset, offset + UPLOAD_CHUNK_SIZE);
+        try {
+          const res = await axios.patch(uploadUrl, chunk, {
+            headers: {
+              ...auth,
+              "Upload-Offset": String(offset),
+              "Content-Type": "application/offset+octet-stream",
+            },
+          });
+          offset = Number(res.headers["upload-offset"]);
+          retries = 0;
+          setUploadProgress(Math.round((offset / file.size) * 100));
+        } catch (error) {
+          if (++retries > UPLOAD_MAX_RETRIES) throw error;
+          await new Promise((resolve) => setTimeout(resolve, 1000 * retries));
+          const status = await axios.head(uploadUrl, { headers: auth });
+          offset = Number(status.headers["upload-offset"]);
+        }
+      }
+
+      // c) Cerrar la subida
+      const res = await axios.post(`${uploadUrl}/complete`, null, { headers: auth });
 
       // Guardamos la URL que devolvió el backend
       setNewLessonData({ ...newLessonData, url: "http://localhost:8000" + res.data.url });
@@ -348,7 +385,7 @@ export default function ManageCoursePage() {
                                     />
 
                                     {uploading && (
-                                      <p className="text-sm text-blue-600">Subiendo archivo... ⏳</p>
+                                      <p className="text-sm text-blue-600">Subiendo archivo... {uploadProgress}% ⏳</p>
                                     )}
 
                                     {/* URL Generada (Solo lectura) */}
@@ -1,7 +1,7 @@
 // client/app/player/[courseId]/page.tsx
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import axios from "axios";
 import { useParams, useRouter } from "next/navigation";
 
@@ -9,7 +9,7 @@ import { useParams, useRouter } from "next/navigation";
 interface Lesson {
   id: string;
   title: string;
-  video_resource_id: string;
+  video_resource_id: string | null;
   lesson_type: "video" | "pdf" | "image" | "quiz";
 }
 
@@ -32,6 +32,9 @@ export default function PlayerPage() {
   const [course, setCourse] = useState<CourseData | null>(null);
   const [currentLesson, setCurrentLesson] = useState<Lesson | null>(null);
   const [resourceUrl, setResourceUrl] = useState<string>("");
+  // Posición guardada del video (para continuar donde se dejó)
+  const [startPosition, setStartPosition] = useState(0);
+  const lastSentPosition = useRef(0);
   const [loading, setLoading] = useState(true);
 
   // ✨ Nuevo Estado: Controla qué secciones están abiertas
@@ -88,6 +91,8 @@ export default function PlayerPage() {
           `http://localhost:8000/courses/${params.courseId}/lessons/${currentLesson.id}/play`,
           { headers: { Authorization: `Bearer ${token}` } }
         );
+        setStartPosition(response.data.last_position_seconds || 0);
+        lastSentPosition.current = 0;
         setResourceUrl(response.data.video_url);
       } catch (err) {
         console.error("Error cargando recurso", err);
@@ -151,6 +156,21 @@ export default function PlayerPage() {
       }
   };
 
+  // ✨ Heartbeat de posición del video (el backend lo guarda en bloque)
+  const sendWatchPosition = (seconds: number, force = false) => {
+      if (!currentLesson || !params.courseId) return;
+      const position = Math.floor(seconds);
+      if (!force && Math.abs(position - lastSentPosition.current) < 10) return;
+      lastSentPosition.current = position;
+
+      const token = localStorage.getItem("token");
+      axios.post(
+          `http://localhost:8000/progress/position`,
+          { lesson_id: currentLesson.id, course_id: params.courseId, position_seconds: position },
+          { headers: { Authorization: `Bearer ${token}` } }
+      ).catch((err) => console.error("Error guardando posición", err));
+  };
+
   // ✨ Función para abrir/cerrar acordeón
   const toggleSection = (sectionId: string) => {
     const newExpanded = new Set(expandedSections);
@@ -177,6 +197,11 @@ export default function PlayerPage() {
           // 🔒 SEGURIDAD VIDEO:
           controlsList="nodownload" // Oculta botón descargar nativo
           onContextMenu={(e) => e.preventDefault()} // Bloquea click derecho
+          onLoadedMetadata={(e) => {
+            if (startPosition > 0) e.currentTarget.currentTime = startPosition;
+          }}
+          onTimeUpdate={(e) => sendWatchPosition(e.currentTarget.currentTime)}
+          onPause={(e) => sendWatchPosition(e.currentTarget.currentTime, true)}
           className="w-full h-full max-h-[80vh]"
         >
           Tu navegador no soporta videos.
@@ -322,9 +347,20 @@ export default function PlayerPage() {
 
           {progressPercentage === 100 && (
              <button
-               onClick={() => {
+               onClick={async () => {
+                   // La pestaña se abre antes del await para que el navegador no la bloquee
+                   const tab = window.open("", "_blank");
                    const token = localStorage.getItem("token");
-                   window.open(`http://localhost:8000/certificates/${params.courseId}/download?token=${token}`, "_blank");
+                   try {
+                     const res = await axios.get(
+                       `http://localhost:8000/certificates/${params.courseId}/download-url`,
+                       { headers: { Authorization: `Bearer ${token}` } }
+                     );
+                     if (tab) tab.location.href = res.data.url;
+                   } catch (err) {
+                     tab?.close();
+                     console.error("Error obteniendo el certificado", err);
+                   }
                }}
                className="w-full mb-4 bg-yellow-500 hover:bg-yellow-600 text-black font-bold py-3 rounded-lg flex items-center justify-center gap-2 animate-pulse"
              >